@@ -10,7 +10,9 @@ from app.core.config import get_settings
 from app.db.base import Base
 
 # App Models
+from app.models.alert import *  # noqa: F401, F403
 from app.models.auth import *  # noqa: F401, F403
+from app.models.product import *  # noqa: F401, F403
 
 # Add your app directory to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "app"))
@@ -30,6 +32,22 @@ if config.config_file_name is not None:
 # Set target metadata for 'autogenerate' support
 target_metadata = Base.metadata
 
+# Partitions of partitioned tables are created at runtime, not by models
+PARTITIONED_TABLES = ("price_points",)
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Keep autogenerate from dropping runtime-created partitions."""
+    table = object if type_ == "table" else getattr(object, "table", None)
+    table_name = table.name if table is not None else name
+    return not (
+        reflected
+        and compare_to is None
+        and table_name.startswith(
+            tuple(f"{parent}_" for parent in PARTITIONED_TABLES)
+        )
+    )
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
@@ -39,6 +57,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -55,8 +74,10 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
-        )  # noqa E501
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -1,7 +1,17 @@
-from fastapi import Depends
+from typing import Callable, Coroutine
 
+from fastapi import Depends, HTTPException, status
+
+from app.models.auth import User
 from app.schemas import TokenDataSchema
-from app.services import AuthService, get_auth_service
+from app.services import (
+    AuthService,
+    PermissionResolver,
+    UserService,
+    get_auth_service,
+    get_permission_resolver,
+    get_user_service,
+)
 from app.utils.security import Security
 
 
@@ -13,3 +23,59 @@ async def get_current_user(
     Dependency that returns the current authenticated user.
     """
     return await auth_service.get_current_user(token)
+
+
+async def get_current_active_user(
+    current_user: TokenDataSchema = Depends(get_current_user),
+    user_service: UserService = Depends(get_user_service),
+) -> User:
+    """
+    Dependency that loads the authenticated user's account, for endpoints
+    that act on the user's own rows. Goes through the user cache.
+    """
+    user = (
+        await user_service.get_user_by_email(current_user.email)
+        if current_user.email
+        else None
+    )
+    if user is None or not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
+def require_permission(
+    permission: str,
+) -> Callable[..., Coroutine[None, None, dict]]:
+    """
+    Build a dependency that allows the request only if the current user
+    holds ``permission`` (a ``resource:action`` string) and returns the
+    verified token payload.
+
+    Permissions embedded in the token are used when present; otherwise they
+    come from the in-process permission cache, which only queries the
+    database the first time a user is seen.
+    """
+
+    async def dependency(
+        token: dict = Depends(Security.verify_token),
+        permission_resolver: PermissionResolver = Depends(
+            get_permission_resolver
+        ),
+    ) -> dict:
+        permissions = token.get("perms")
+        if permissions is None:
+            permissions = await permission_resolver.get_permissions(
+                token["sub"]
+            )
+        if permission not in permissions:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions",
+            )
+        return token
+
+    return dependency
@@ -0,0 +1,88 @@
+import random
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.instrumentation import RequestStats, request_stats
+from app.utils.metrics import COUNT_BUCKETS, registry
+
+# Route label of requests no route matched, so stray paths cannot grow
+# the number of series.
+UNMATCHED = "unmatched"
+
+requests_total = registry.counter(
+    "http_requests_total",
+    "HTTP requests by method, route template and status code",
+    ("method", "route", "status"),
+)
+request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the end of its response",
+    ("method", "route"),
+)
+request_statements = registry.histogram(
+    "http_request_sql_statements",
+    "SQL statements executed per sampled request",
+    ("route",),
+    buckets=COUNT_BUCKETS,
+)
+request_db_time = registry.histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL per sampled request",
+    ("route",),
+)
+request_pool_wait = registry.histogram(
+    "http_request_pool_wait_seconds",
+    "Time spent waiting for pooled connections per sampled request",
+    ("route",),
+)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording the count and latency of every request
+    by route template (not raw path, which would create a series per
+    product id). A ``sql_sample_rate`` share of requests also get a
+    ``RequestStats`` in context, which the engine's cursor hooks and the
+    pool fill in with statement count, DB time and checkout wait.
+    """
+
+    def __init__(self, app: ASGIApp, sql_sample_rate: float = 1.0):
+        self.app = app
+        self.sql_sample_rate = sql_sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Unless the app sends a response, the server answers with a 500.
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats, token = None, None
+        if self.sql_sample_rate >= 1 or random.random() < self.sql_sample_rate:
+            stats = RequestStats()
+            token = request_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            if token is not None:
+                request_stats.reset(token)
+            # The router leaves the matched route in the scope.
+            route = scope.get("route")
+            template = getattr(route, "path", UNMATCHED)
+            method = scope["method"]
+            requests_total.inc(method, template, str(status_code))
+            request_duration.observe(elapsed, method, template)
+            if stats is not None:
+                request_statements.observe(stats.statements, template)
+                request_db_time.observe(stats.db_seconds, template)
+                request_pool_wait.observe(stats.pool_wait_seconds, template)
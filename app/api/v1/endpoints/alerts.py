@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+
+from app.api.dependencies.auth import get_current_active_user
+from app.core.exceptions import (
+    PriceAlertNotFoundException,
+    ProductNotFoundException,
+    UnsafeURLException,
+)
+from app.models.auth import User
+from app.schemas import CreatePriceAlertSchema, PriceAlertSchema
+from app.services import PriceAlertService, get_price_alert_service
+
+router = APIRouter(prefix="/alerts", tags=["Alerts"])
+
+
+@router.get("", response_model=list[PriceAlertSchema])
+async def list_alerts(
+    user: User = Depends(get_current_active_user),
+    alert_service: PriceAlertService = Depends(get_price_alert_service),
+) -> list[PriceAlertSchema]:
+    alerts = await alert_service.get_alerts(user.id)
+    return [PriceAlertSchema.model_validate(alert) for alert in alerts]
+
+
+@router.put("", response_model=PriceAlertSchema)
+async def set_alert(
+    alert_data: CreatePriceAlertSchema,
+    user: User = Depends(get_current_active_user),
+    alert_service: PriceAlertService = Depends(get_price_alert_service),
+) -> PriceAlertSchema:
+    """
+    Set the target price for a product. A user has one alert per
+    product: setting it again replaces the target and re-arms the alert.
+    """
+    try:
+        alert = await alert_service.set_alert(user.id, alert_data)
+    except ProductNotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
+        )
+    except UnsafeURLException as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+        )
+    return PriceAlertSchema.model_validate(alert)
+
+
+@router.delete("/{alert_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_alert(
+    alert_id: int,
+    user: User = Depends(get_current_active_user),
+    alert_service: PriceAlertService = Depends(get_price_alert_service),
+) -> Response:
+    try:
+        await alert_service.delete_alert(user.id, alert_id)
+    except PriceAlertNotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
+        )
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
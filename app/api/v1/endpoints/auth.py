@@ -1,24 +1,48 @@
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
+from pydantic import ValidationError
 
 from app.api.dependencies.auth import get_current_user
-from app.core.exceptions import EmailAlreadyExistsException
+from app.core.exceptions import (
+    EmailAlreadyExistsException,
+    InvalidRefreshTokenException,
+    PasswordHasherBusyException,
+    RefreshTokenReuseException,
+)
 from app.schemas import (
     CreateUserSchema,
     LoginSchema,
+    RefreshTokenRequestSchema,
     TokenDataSchema,
     TokenSchema,
     UserSchema,
 )
-from app.services import AuthService, get_auth_service
+from app.services import (
+    AuthService,
+    LoginAttemptRecord,
+    LoginAuditWriter,
+    LoginRateLimiter,
+    get_auth_service,
+    get_login_audit_writer,
+    get_login_rate_limiter,
+)
+from app.services.auth.audit import INVALID_CREDENTIALS, RATE_LIMITED
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
+def _service_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Service busy, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/register", status_code=status.HTTP_201_CREATED)
 async def register(
     user_data: CreateUserSchema,
@@ -34,6 +58,8 @@ async def register(
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT, detail=str(e)
         )
+    except PasswordHasherBusyException:
+        raise _service_busy()
     except Exception as e:
         logger.error(f"Unexpected error during registration: {str(e)}")
         raise HTTPException(
@@ -44,21 +70,97 @@ async def register(
 
 @router.post("/token", response_model=TokenSchema)
 async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     auth_service: AuthService = Depends(get_auth_service),
+    audit_writer: LoginAuditWriter = Depends(get_login_audit_writer),
+    rate_limiter: LoginRateLimiter = Depends(get_login_rate_limiter),
 ) -> TokenSchema:
-    user = await auth_service.authenticate_user(
-        user_data=LoginSchema(
-            email=form_data.username, password=form_data.password
+    ip_address = request.client.host if request.client else "unknown"
+    user_agent = request.headers.get("user-agent")
+
+    # Counted as a failure before any user lookup or bcrypt work is done,
+    # and rejected then if the limits are reached.
+    reservation = await rate_limiter.reserve(form_data.username, ip_address)
+    if reservation.retry_after:
+        audit_writer.record(
+            LoginAttemptRecord(
+                email=form_data.username,
+                ip_address=ip_address,
+                user_agent=user_agent,
+                failure_reason=RATE_LIMITED,
+            )
+        )
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts",
+            headers={"Retry-After": str(reservation.retry_after)},
+        )
+
+    try:
+        user = await auth_service.authenticate_user(
+            user_data=LoginSchema(
+                email=form_data.username, password=form_data.password
+            )
+        )
+    except ValidationError:
+        # Not even an email address, so no account matches it.
+        user = None
+    except PasswordHasherBusyException:
+        await rate_limiter.release(reservation)
+        raise _service_busy()
+    except Exception:
+        await rate_limiter.release(reservation)
+        raise
+    audit_writer.record(
+        LoginAttemptRecord(
+            email=form_data.username,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            success=user is not None,
+            failure_reason=None if user else INVALID_CREDENTIALS,
         )
     )
     if not user:
+        # The reservation stays, as the failure.
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
         )
 
-    return await auth_service.create_token(user=user)
+    await rate_limiter.record_success(form_data.username, reservation)
+    return await auth_service.create_token(
+        user=user, ip_address=ip_address, user_agent=user_agent
+    )
+
+
+@router.post("/refresh", response_model=TokenSchema)
+async def refresh(
+    request: Request,
+    body: RefreshTokenRequestSchema,
+    auth_service: AuthService = Depends(get_auth_service),
+) -> TokenSchema:
+    """
+    Exchange a refresh token for a new access token and refresh token.
+    Each refresh token can be used once.
+    """
+    try:
+        return await auth_service.refresh_token(
+            body.refresh_token,
+            ip_address=request.client.host if request.client else None,
+            user_agent=request.headers.get("user-agent"),
+        )
+    except RefreshTokenReuseException as e:
+        logger.warning(str(e))
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+        )
+    except InvalidRefreshTokenException:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+        )
 
 
 @router.get("/me", response_model=TokenDataSchema)
@@ -0,0 +1,41 @@
+import secrets
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from app.core.config import get_settings
+from app.utils.metrics import registry
+
+# The Prometheus text exposition format.
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+async def require_metrics_token(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+) -> None:
+    """Allow the scrape only with ``metrics_token``, when one is set."""
+    token = get_settings().metrics_token
+    if token is None:
+        return
+    if credentials is None or not secrets.compare_digest(
+        credentials.credentials.encode(), token.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+router = APIRouter(
+    tags=["Monitoring"], dependencies=[Depends(require_metrics_token)]
+)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    """Request, SQL, pool and security timings for Prometheus to scrape."""
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
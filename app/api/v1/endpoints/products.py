@@ -0,0 +1,94 @@
+from decimal import Decimal
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.core.config import get_settings
+from app.core.exceptions import (
+    InvalidCursorException,
+    ProductNotFoundException,
+)
+from app.repositories.product import ProductFilter
+from app.schemas import PriceChartSchema, ProductPageSchema
+from app.services import (
+    PriceChartService,
+    ProductCatalogService,
+    get_price_chart_service,
+    get_product_catalog_service,
+)
+
+router = APIRouter(prefix="/products", tags=["Products"])
+
+settings = get_settings()
+
+
+@router.get("", response_model=ProductPageSchema)
+async def list_products(
+    q: Optional[str] = Query(default=None, max_length=200),
+    min_price: Optional[Decimal] = Query(default=None, ge=0),
+    max_price: Optional[Decimal] = Query(default=None, ge=0),
+    currency: Optional[str] = Query(default=None, pattern="^[A-Z]{3}$"),
+    retailer: Optional[str] = Query(default=None, max_length=255),
+    min_drop: Optional[Decimal] = Query(default=None, ge=0, le=100),
+    in_stock: Optional[bool] = None,
+    sort: Literal["newest", "price", "-price", "drop"] = "newest",
+    cursor: Optional[str] = Query(default=None, max_length=200),
+    limit: int = Query(default=20, ge=1, le=100),
+    catalog_service: ProductCatalogService = Depends(
+        get_product_catalog_service
+    ),
+) -> ProductPageSchema:
+    """
+    List and search products. ``q`` matches words of the name and brand
+    by prefix; ``min_drop`` is the percentage below the product's highest
+    daily price of the last 30 days. Pass ``next_cursor`` back as
+    ``cursor`` (with the same ``sort``) for the next page; it is null on
+    the last page.
+    """
+    filters = ProductFilter(
+        q=q,
+        min_price=min_price,
+        max_price=max_price,
+        currency=currency,
+        retailer=retailer,
+        min_drop_pct=min_drop,
+        in_stock=in_stock,
+    )
+    try:
+        page = await catalog_service.list_products(
+            filters, sort, cursor, limit
+        )
+    except InvalidCursorException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        )
+    return ProductPageSchema.model_validate(page)
+
+
+@router.get("/{product_id}/chart", response_model=PriceChartSchema)
+async def get_price_chart(
+    product_id: int,
+    days: int = Query(default=30, ge=1, le=3650),
+    currency: str = Query(default="USD", pattern="^[A-Z]{3}$"),
+    points: int = Query(
+        default=settings.chart_default_points,
+        ge=3,
+        le=settings.chart_max_points,
+    ),
+    chart_service: PriceChartService = Depends(get_price_chart_service),
+) -> PriceChartSchema:
+    """
+    Price chart of a product over the last ``days`` days, with min, max
+    and average over the range. Long ranges come from daily or weekly
+    rollups (see ``resolution``), and the series is downsampled to at
+    most ``points`` points.
+    """
+    try:
+        chart = await chart_service.get_chart(
+            product_id, days, currency, points
+        )
+    except ProductNotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
+        )
+    return PriceChartSchema.model_validate(chart)
@@ -0,0 +1,43 @@
+import io
+import logging
+
+from fastapi import APIRouter, Depends, File, UploadFile
+
+from app.api.dependencies.auth import require_permission
+from app.schemas import UserImportReportSchema
+from app.services import (
+    UserImportFormat,
+    UserImportService,
+    get_user_import_service,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/users", tags=["Users"])
+
+
+@router.post("/import", response_model=UserImportReportSchema)
+async def import_users(
+    file: UploadFile = File(...),
+    format: UserImportFormat | None = None,
+    token: dict = Depends(require_permission("user:create")),
+    import_service: UserImportService = Depends(get_user_import_service),
+) -> UserImportReportSchema:
+    """
+    Bulk-create users from an uploaded CSV (with header) or NDJSON file.
+
+    Each row needs ``email`` and ``password`` and may carry ``username``
+    and ``full_name``. Invalid and conflicting rows are reported per line
+    instead of failing the whole import.
+    """
+    fmt = format or UserImportFormat.from_filename(file.filename)
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        report = await import_service.import_stream(stream, fmt)
+    finally:
+        stream.detach()
+    logger.info(
+        f"User import by {token['sub']}: {report.created} created, "
+        f"{len(report.conflicts)} conflicts, {len(report.invalid)} invalid"
+    )
+    return report
@@ -0,0 +1,67 @@
+"""
+Bulk-import users from a CSV (with header) or NDJSON file.
+
+Usage:
+    python -m app.cli.import_users users.csv
+    python -m app.cli.import_users - --format ndjson < users.ndjson
+"""
+
+import argparse
+import asyncio
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from app.core.config import get_settings
+from app.db.base import SessionLocal, get_engine
+from app.repositories.auth.repositories import SqlAlchemyAuthRepository
+from app.services.user.importer import UserImportFormat, UserImportService
+
+
+async def run(args: argparse.Namespace) -> int:
+    fmt = (
+        UserImportFormat(args.format)
+        if args.format
+        else UserImportFormat.from_filename(args.path)
+    )
+    stream = (
+        sys.stdin
+        if args.path == "-"
+        else open(args.path, encoding="utf-8-sig", newline="")
+    )
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            async with SessionLocal() as session:
+                service = UserImportService(
+                    auth_repo=SqlAlchemyAuthRepository(session=session),
+                    executor=executor,
+                    workers=args.workers,
+                    chunk_size=args.chunk_size,
+                )
+                report = await service.import_stream(stream, fmt)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        await get_engine().dispose()
+
+    print(report.model_dump_json(indent=2))
+    return 0 if not report.invalid and not report.conflicts else 1
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("path", help="Input file, or '-' for stdin")
+    parser.add_argument(
+        "--format", choices=[fmt.value for fmt in UserImportFormat]
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=settings.user_import_chunk_size
+    )
+    parser.add_argument(
+        "--workers", type=int, default=settings.user_import_workers
+    )
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -28,13 +28,152 @@ class Settings(BaseSettings):
     db_pool_recycle: int
     db_pool_pre_ping: bool
     db_debug: bool
-    # redis_url: str
+    # Connections opened at startup, up to db_pool_size; 0 disables
+    db_pool_warmup_connections: int = 4
+    # Ping idle connections in the background this often instead of on
+    # every checkout (db_pool_pre_ping is then ignored); 0 disables
+    db_pool_liveness_interval_seconds: float = 0
+    # Adaptive pool size: starting from db_pool_size, grow the pool while
+    # checkouts wait past the target, time out or overflow, and shrink it
+    # while connections go unused; db_max_overflow applies on top
+    db_pool_adaptive: bool = False
+    db_pool_min_size: int = 2
+    db_pool_max_size: int = 40
+    db_pool_target_wait_seconds: float = 0.005
+    db_pool_adjust_interval_seconds: float = 10.0
+    redis_url: str | None = None
 
     # JWT Configuration
     jwt_secret_key: str
     jwt_algorithm: str
     jwt_access_token_expire_minutes: int
     jwt_refresh_token_expire_days: int
+    # Embed the user's permissions as a "perms" claim in access tokens
+    jwt_embed_permissions: bool = False
+
+    # Refresh tokens
+    refresh_token_revocation_cache_size: int = 100000
+    refresh_token_purge_interval_seconds: int = 3600
+    refresh_token_purge_batch_size: int = 5000
+
+    # Password hashing
+    password_hash_executor: str = "thread"  # "thread" or "process"
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 64
+
+    # Login attempt auditing
+    login_audit_buffer_size: int = 10000
+    login_audit_batch_size: int = 500
+    login_audit_flush_interval_seconds: float = 1.0
+    login_audit_overflow_policy: str = "drop_oldest"  # or "drop_newest"
+
+    # Login rate limiting (failed attempts per sliding window; 0 disables)
+    login_rate_limit_window_seconds: int = 300
+    login_rate_limit_max_per_email: int = 5
+    login_rate_limit_max_per_ip: int = 50
+    login_rate_limit_max_keys: int = 100000
+
+    # Bulk user import
+    user_import_chunk_size: int = 1000
+    user_import_workers: int = 4
+
+    # Price history: monthly partitions created ahead at startup and then
+    # every price_partition_check_interval_seconds (0 disables the checks)
+    price_partition_months_ahead: int = 3
+    price_partition_check_interval_seconds: float = 3600
+    # Unchanged prices are re-recorded at least this often
+    price_heartbeat_seconds: int = 86400
+    price_cache_max_size: int = 200000
+
+    # Price charts: ranges up to chart_raw_max_days are drawn from raw
+    # points, up to chart_daily_max_days from daily rollups, longer ones
+    # from weekly rollups; then downsampled to at most the requested points
+    chart_raw_max_days: int = 7
+    chart_daily_max_days: int = 180
+    chart_default_points: int = 200
+    chart_max_points: int = 1000
+
+    # Crawl scheduling
+    crawl_default_interval_seconds: int = 21600
+    crawl_min_interval_seconds: int = 900
+    crawl_max_interval_seconds: int = 259200
+    crawl_batch_size: int = 100
+    crawl_lookahead_seconds: int = 30
+    crawl_lease_seconds: int = 600
+    crawl_poll_interval_seconds: float = 5.0
+
+    # Scraper worker processes (python -m app.worker)
+    worker_processes: int = 2
+    worker_concurrency: int = 32
+    worker_parse_workers: int = 1
+    worker_ingest_batch_size: int = 200
+    worker_ingest_interval_seconds: float = 2.0
+    worker_shutdown_timeout_seconds: float = 30.0
+    # Log crawl backlog and lag this often (0 disables)
+    worker_report_interval_seconds: float = 60.0
+
+    # Scraper
+    scraper_user_agent: str = "ultimate-product-tracker/0.1"
+    scraper_max_connections: int = 100
+    scraper_max_keepalive_connections: int = 20
+    scraper_timeout_seconds: float = 10.0
+    scraper_per_domain_concurrency: int = 4
+    scraper_per_domain_delay_seconds: float = 0.5
+    scraper_max_retries: int = 3
+    scraper_backoff_base_seconds: float = 0.5
+    scraper_backoff_max_seconds: float = 30.0
+    scraper_validator_cache_size: int = 100000
+    scraper_validator_ttl_seconds: int = 86400
+
+    # Notification dispatcher (python -m app.dispatcher)
+    notification_batch_size: int = 200
+    notification_poll_interval_seconds: float = 1.0
+    notification_lease_seconds: int = 300
+    notification_max_attempts: int = 6
+    notification_backoff_base_seconds: float = 30.0
+    notification_backoff_max_seconds: float = 3600.0
+    # Fired alerts wait this long before delivery, so a burst of them for
+    # one user goes out as a single digest
+    notification_digest_window_seconds: int = 60
+    # Extra rows a batch may claim to complete the digests of its users
+    notification_digest_limit: int = 1000
+    notification_shutdown_timeout_seconds: float = 30.0
+
+    # Email notifications
+    smtp_host: str = "localhost"
+    smtp_port: int = 25
+    smtp_username: str | None = None
+    smtp_password: str | None = None
+    smtp_starttls: bool = False
+    smtp_from: str = "alerts@localhost"
+    smtp_connections: int = 4
+    smtp_rate_per_second: float = 20.0
+    smtp_timeout_seconds: float = 10.0
+
+    # Webhook notifications (limits apply per destination host)
+    webhook_concurrency: int = 8
+    webhook_rate_per_second: float = 20.0
+    webhook_timeout_seconds: float = 10.0
+
+    # Metrics on /metrics in the Prometheus text format. Off by default,
+    # since the page exposes traffic and internals; when metrics_token is
+    # set, scrapers must send it as a bearer token
+    metrics_enabled: bool = False
+    metrics_token: str | None = None
+    # Share of requests whose SQL statements, DB time and pool wait are
+    # measured; 0 leaves the SQLAlchemy cursor hooks uninstalled
+    metrics_sql_sample_rate: float = 1.0
+
+    # Caches (0 disables)
+    token_cache_max_size: int = 10000
+    user_cache_max_size: int = 10000
+    user_cache_ttl_seconds: int = 300
+    # Cap for the per-process backend, whose entries other workers cannot
+    # invalidate
+    user_cache_local_ttl_seconds: int = 5
+    user_cache_negative_ttl_seconds: int = 30
+    permission_cache_max_size: int = 10000
+    permission_cache_ttl_seconds: int = 300
 
     # Environment
     app_name: str
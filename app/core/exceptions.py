@@ -11,3 +11,63 @@ class EmailAlreadyExistsException(AuthException):
     def __init__(self, email: str):
         self.email = email
         super().__init__(f"Email {email} already registered")
+
+
+class PasswordHasherBusyException(AuthException):
+    """Raised when the password hashing pool has no free queue slots"""
+
+    def __init__(self, pending: int):
+        self.pending = pending
+        super().__init__(
+            f"Password hashing queue is full ({pending} pending jobs)"
+        )
+
+
+class InvalidRefreshTokenException(AuthException):
+    """Raised when a refresh token is unknown, expired or revoked"""
+
+    def __init__(self, message: str = "Invalid refresh token"):
+        super().__init__(message)
+
+
+class RefreshTokenReuseException(InvalidRefreshTokenException):
+    """Raised when an already rotated refresh token is presented again"""
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        super().__init__(
+            f"Refresh token reuse detected for user {user_id}; "
+            "all of the user's refresh tokens were revoked"
+        )
+
+
+class ProductNotFoundException(Exception):
+    """Raised when a product does not exist or is inactive"""
+
+    def __init__(self, product_id: int):
+        self.product_id = product_id
+        super().__init__(f"Product {product_id} not found")
+
+
+class PriceAlertNotFoundException(Exception):
+    """Raised when a user has no active alert with the given id"""
+
+    def __init__(self, alert_id: int):
+        self.alert_id = alert_id
+        super().__init__(f"Price alert {alert_id} not found")
+
+
+class InvalidCursorException(Exception):
+    """Raised when a pagination cursor is malformed or for another order"""
+
+    def __init__(self):
+        super().__init__("Invalid cursor")
+
+
+class UnsafeURLException(ValueError):
+    """Raised when a URL must not be fetched: not https, or not public"""
+
+    def __init__(self, url: str, reason: str):
+        self.url = url
+        self.reason = reason
+        super().__init__(f"Refusing {url}: {reason}")
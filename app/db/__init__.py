@@ -1,3 +1,3 @@
-from .base import Base, SessionLocal, engine, get_db
+from .base import Base, SessionLocal, get_db, get_engine
 
-__all__ = ["Base", "get_db", "SessionLocal", "engine"]
+__all__ = ["Base", "get_db", "SessionLocal", "get_engine"]
@@ -1,43 +1,120 @@
 import logging
-from typing import Generator
+from functools import lru_cache
+from typing import AsyncGenerator
 
-from sqlalchemy import create_engine
+import psycopg
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
+from app.db.instrumentation import instrument_engine
+from app.db.pool import (
+    InstrumentedQueuePool,
+    PoolMaintainer,
+    PoolSizeController,
+    pool_collector,
+)
+from app.utils.metrics import registry
 
 settings = get_settings()
 
-# Create engine with connection pooling
-engine = create_engine(
-    settings.database_url,
-    poolclass=QueuePool,
-    pool_size=settings.db_pool_size,
-    max_overflow=settings.db_max_overflow,
-    pool_timeout=settings.db_pool_timeout,
-    pool_recycle=settings.db_pool_recycle,
-    pool_pre_ping=settings.db_pool_pre_ping,
-    echo=settings.db_debug,
-)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+@lru_cache()
+def get_engine() -> AsyncEngine:
+    """
+    Create the process's engine on first use. Creating it loads the driver
+    and dialect, so this is left to the first session or to startup rather
+    than done when the application is imported.
+    """
+    # Async engine with connection pooling (psycopg3 async driver)
+    engine = create_async_engine(
+        settings.database_url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        # Headroom for the adaptive controller to grow into.
+        max_pool_size=(
+            max(settings.db_pool_max_size, settings.db_pool_size)
+            if settings.db_pool_adaptive
+            else settings.db_pool_size
+        ),
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=(
+            settings.db_pool_pre_ping
+            and settings.db_pool_liveness_interval_seconds <= 0
+        ),
+        echo=settings.db_debug,
+    )
+    if settings.metrics_enabled:
+        registry.register_collector(pool_collector(engine))
+        if settings.metrics_sql_sample_rate > 0:
+            instrument_engine(engine.sync_engine)
+    return engine
+
+
+@lru_cache()
+def get_pool_maintainer() -> PoolMaintainer:
+    """The engine's pool maintainer, started by each process using it."""
+    return PoolMaintainer(
+        get_engine(),
+        liveness_interval=settings.db_pool_liveness_interval_seconds,
+        controller=(
+            PoolSizeController(
+                min_size=settings.db_pool_min_size,
+                max_size=settings.db_pool_max_size,
+                target_wait=settings.db_pool_target_wait_seconds,
+            )
+            if settings.db_pool_adaptive
+            else None
+        ),
+        adjust_interval=settings.db_pool_adjust_interval_seconds,
+    )
+
+
+class LazyEngineSession(Session):
+    """Binds to ``get_engine()``, so the engine is created on first use."""
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        return get_engine().sync_engine
+
+
+SessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=LazyEngineSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
 
 Base = declarative_base()
 
 
-def get_db() -> Generator[Session, None, None]:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
-    Database dependency that provides a database session.
+    Database dependency that provides an async database session.
     Automatically handles session cleanup and error handling.
     """
-    db = SessionLocal()
-    try:
-        yield db
-    except Exception as e:
-        db.rollback()
-        logging.error(f"Database error: {e}")
-        raise
-    finally:
-        db.close()
+    async with SessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            await db.rollback()
+            logging.error(f"Database error: {e}")
+            raise
+
+
+def is_data_error(error: Exception) -> bool:
+    """
+    Whether the database refused the rows themselves (a data or integrity
+    error), so writing fewer of them may succeed, rather than failed.
+    """
+    if isinstance(error, DBAPIError):
+        error = error.orig
+    return isinstance(error, (psycopg.DataError, psycopg.IntegrityError))
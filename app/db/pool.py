@@ -0,0 +1,383 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.db.instrumentation import request_stats
+from app.utils.metrics import Family, registry
+
+logger = logging.getLogger(__name__)
+
+pool_checkout_wait = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection, including connecting",
+)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    ``AsyncAdaptedQueuePool`` that times checkouts and counts checkouts,
+    timeouts, connections opened and connections discarded on return, and
+    whose size can be changed while it is in use with ``resize``.
+
+    The queue is created ``max_pool_size`` deep; the current ``size``
+    bounds how many idle connections are kept, and ``max_overflow``
+    applies on top of it. Shrinking never closes a connection in use:
+    surplus connections are closed as they are returned.
+    """
+
+    def __init__(
+        self,
+        creator,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        max_pool_size: int | None = None,
+        **kw,
+    ):
+        max_pool_size = max(max_pool_size or pool_size, pool_size)
+        super().__init__(
+            creator, pool_size=max_pool_size, max_overflow=max_overflow, **kw
+        )
+        self.max_pool_size = max_pool_size
+        self._size = pool_size
+        # The base class counts connections beyond the size as overflow.
+        self._overflow = 0 - pool_size
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.discards = 0
+        self.wait_seconds = 0.0
+        # Most connections checked out at once since the last reset.
+        self.peak_checked_out = 0
+
+    def size(self) -> int:
+        return self._size
+
+    def checkedout(self) -> int:
+        return self._size - self._pool.qsize() + self._overflow
+
+    def resize(self, size: int) -> int:
+        """Set the pool size, within 1 and ``max_pool_size``."""
+        size = max(1, min(size, self.max_pool_size))
+        with self._overflow_lock:
+            self._overflow += self._size - size
+            self._size = size
+        return size
+
+    def reset_peak(self) -> int:
+        peak, self.peak_checked_out = self.peak_checked_out, 0
+        return peak
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            pool_checkout_wait.observe(waited)
+            self.wait_seconds += waited
+            stats = request_stats.get()
+            if stats is not None:
+                stats.pool_wait_seconds += waited
+        self.checkouts += 1
+        self.peak_checked_out = max(self.peak_checked_out, self.checkedout())
+        return record
+
+    def _do_return_conn(self, record) -> None:
+        if self._pool.qsize() >= self._size:
+            self.discards += 1
+            try:
+                record.close()
+            finally:
+                self._dec_overflow()
+            return
+        super()._do_return_conn(record)
+
+    def _create_connection(self):
+        self.connects += 1
+        return super()._create_connection()
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        self.logger.info("Pool recreating")
+        return self.__class__(
+            self._creator,
+            pool_size=self._size,
+            max_overflow=self._max_overflow,
+            max_pool_size=self.max_pool_size,
+            pre_ping=self._pre_ping,
+            use_lifo=self._pool.use_lifo,
+            timeout=self._timeout,
+            recycle=self._recycle,
+            echo=self.echo,
+            logging_name=self._orig_logging_name,
+            reset_on_return=self._reset_on_return,
+            _dispatch=self.dispatch,
+            dialect=self._dialect,
+        )
+
+
+@dataclass(slots=True)
+class PoolWindow:
+    """Pool activity over one adjustment interval."""
+
+    checkouts: int = 0
+    wait_seconds: float = 0.0
+    timeouts: int = 0
+    peak_checked_out: int = 0
+
+
+class PoolSizeController:
+    """
+    Picks the next pool size from the last interval's activity. The pool
+    grows when checkouts timed out, waited longer than ``target_wait`` on
+    average, or needed overflow connections: by half (at least one),
+    or straight to the peak in use if that is more. It shrinks by one,
+    never below the peak in use plus one, when two or more connections
+    went unused and waits were well under target. Growing fast and
+    shrinking slowly keeps it from oscillating around the load.
+    """
+
+    def __init__(self, min_size: int, max_size: int, target_wait: float):
+        self.min_size = min_size
+        self.max_size = max(max_size, min_size)
+        self.target_wait = target_wait
+
+    def next_size(self, size: int, window: PoolWindow) -> int:
+        mean_wait = (
+            window.wait_seconds / window.checkouts if window.checkouts else 0.0
+        )
+        if (
+            window.timeouts
+            or window.peak_checked_out > size
+            or mean_wait > self.target_wait
+        ):
+            size = max(size + max(1, size // 2), window.peak_checked_out)
+        elif (
+            window.peak_checked_out < size - 1
+            and mean_wait <= self.target_wait / 2
+        ):
+            size = max(window.peak_checked_out + 1, size - 1)
+        return max(self.min_size, min(size, self.max_size))
+
+
+class PoolMaintainer:
+    """
+    Background task looking after an engine's pool.
+
+    Every ``liveness_interval`` seconds it checks out each idle connection
+    in turn and runs ``SELECT 1``, which stands in for per-checkout
+    ``pre_ping``: a dead connection is found by the check rather than by
+    a request, and the disconnect invalidates the rest of the pool so
+    requests reconnect. Every ``adjust_interval`` seconds the controller,
+    if any, resizes the pool from the activity since the last run.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        liveness_interval: float = 0,
+        controller: PoolSizeController | None = None,
+        adjust_interval: float = 10.0,
+    ):
+        self.engine = engine
+        self.liveness_interval = liveness_interval
+        self.controller = controller
+        self.adjust_interval = adjust_interval
+        self._task: asyncio.Task | None = None
+        self._stop = asyncio.Event()
+        self._pool: InstrumentedQueuePool | None = None
+        self._last = PoolWindow()
+        self.checks = 0
+        self.failures = 0
+        self.resizes = 0
+
+    @property
+    def pool(self) -> InstrumentedQueuePool:
+        # A new pool replaces the old one on ``engine.dispose()``.
+        return self.engine.sync_engine.pool  # type: ignore[return-value]
+
+    async def start(self) -> None:
+        if self._task is None and (
+            self.liveness_interval > 0 or self.controller
+        ):
+            self._stop.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._stop.set()
+            await self._task
+            self._task = None
+
+    async def check_idle(self) -> int:
+        """Ping each idle connection once. Returns the number checked."""
+        checked = 0
+        for _ in range(self.pool.checkedin()):
+            # Requests may have taken the rest meanwhile; do not open new
+            # connections just to ping them.
+            if self.pool.checkedin() == 0:
+                break
+            try:
+                async with self.engine.connect() as connection:
+                    await connection.exec_driver_sql("SELECT 1")
+            except exc.DBAPIError as e:
+                self.failures += 1
+                logger.warning(f"Pooled connection failed liveness check: {e}")
+                break
+            checked += 1
+        self.checks += checked
+        return checked
+
+    def adjust(self) -> int:
+        """Resize the pool from the activity since the last call."""
+        pool = self.pool
+        if pool is not self._pool:
+            self._pool, self._last = pool, PoolWindow()
+        window = PoolWindow(
+            checkouts=pool.checkouts - self._last.checkouts,
+            wait_seconds=pool.wait_seconds - self._last.wait_seconds,
+            timeouts=pool.timeouts - self._last.timeouts,
+            peak_checked_out=pool.reset_peak(),
+        )
+        self._last = PoolWindow(
+            pool.checkouts, pool.wait_seconds, pool.timeouts
+        )
+        size = pool.size()
+        if self.controller is not None:
+            wanted = self.controller.next_size(size, window)
+            if wanted != size:
+                size = pool.resize(wanted)
+                self.resizes += 1
+                logger.info(
+                    f"Resized connection pool to {size} "
+                    f"(peak in use {window.peak_checked_out}, "
+                    f"{window.checkouts} checkouts, "
+                    f"{window.timeouts} timeouts)"
+                )
+        return size
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_check = loop.time() + self.liveness_interval
+        next_adjust = loop.time() + self.adjust_interval
+        while not self._stop.is_set():
+            now = loop.time()
+            try:
+                if self.liveness_interval > 0 and now >= next_check:
+                    await self.check_idle()
+                    next_check = now + self.liveness_interval
+                if self.controller is not None and now >= next_adjust:
+                    self.adjust()
+                    next_adjust = now + self.adjust_interval
+            except Exception as e:
+                logger.error(f"Connection pool maintenance failed: {e}")
+            deadlines = []
+            if self.liveness_interval > 0:
+                deadlines.append(next_check)
+            if self.controller is not None:
+                deadlines.append(next_adjust)
+            try:
+                await asyncio.wait_for(
+                    self._stop.wait(),
+                    timeout=max(min(deadlines) - loop.time(), 0),
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "checks": self.checks,
+            "failures": self.failures,
+            "resizes": self.resizes,
+        }
+
+
+async def warm_pool(engine: AsyncEngine, connections: int) -> int:
+    """
+    Open up to ``connections`` pooled connections at once, capped at the
+    pool size, and return them to the pool. Returns the number opened.
+    """
+    connections = min(connections, engine.sync_engine.pool.size())
+    if connections <= 0:
+        return 0
+    opened = await asyncio.gather(
+        *(engine.connect().start() for _ in range(connections)),
+        return_exceptions=True,
+    )
+    failed = None
+    for connection in opened:
+        if isinstance(connection, BaseException):
+            failed = connection
+        else:
+            await connection.close()
+    if failed is not None:
+        raise failed
+    return connections
+
+
+def pool_collector(engine: AsyncEngine):
+    """A metrics collector reporting the engine's current pool."""
+
+    def collect() -> list[Family]:
+        pool = engine.sync_engine.pool
+        if not isinstance(pool, InstrumentedQueuePool):
+            return []
+        return [
+            (
+                "db_pool_size",
+                "gauge",
+                "Connections the pool keeps open when idle",
+                [({}, pool.size())],
+            ),
+            (
+                "db_pool_checked_out",
+                "gauge",
+                "Connections in use",
+                [({}, pool.checkedout())],
+            ),
+            (
+                "db_pool_idle",
+                "gauge",
+                "Idle connections in the pool",
+                [({}, pool.checkedin())],
+            ),
+            (
+                "db_pool_overflow",
+                "gauge",
+                "Open connections beyond the pool size",
+                [({}, max(pool.overflow(), 0))],
+            ),
+            (
+                "db_pool_checkouts_total",
+                "counter",
+                "Connections checked out of the pool",
+                [({}, pool.checkouts)],
+            ),
+            (
+                "db_pool_timeouts_total",
+                "counter",
+                "Checkouts that gave up waiting for a connection",
+                [({}, pool.timeouts)],
+            ),
+            (
+                "db_pool_connects_total",
+                "counter",
+                "Connections opened",
+                [({}, pool.connects)],
+            ),
+            (
+                "db_pool_discards_total",
+                "counter",
+                "Connections closed on return because the pool was full",
+                [({}, pool.discards)],
+            ),
+        ]
+
+    return collect
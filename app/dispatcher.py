@@ -0,0 +1,77 @@
+"""
+Run the notification dispatcher: deliver the outbox by email and webhook.
+
+Usage:
+    python -m app.dispatcher
+    python -m app.dispatcher --batch-size 500
+
+Any number of dispatchers can run at once; each claims its own batches.
+SIGINT/SIGTERM stop claiming new batches; the batch in flight is sent
+and recorded, or, after the shutdown timeout, abandoned to be claimed
+again once its lease expires.
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+
+from app.core.config import get_settings
+
+logger = logging.getLogger("app.dispatcher")
+
+
+async def run(args: argparse.Namespace) -> None:
+    from app.db.base import get_engine, get_pool_maintainer
+    from app.services.notification.dispatcher import (
+        get_notification_dispatcher,
+    )
+
+    settings = get_settings()
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    dispatcher = get_notification_dispatcher()
+    dispatcher.batch_size = args.batch_size
+    logger.info("Dispatcher started")
+    await get_pool_maintainer().start()
+    runner = asyncio.create_task(dispatcher.run(stop))
+    try:
+        await asyncio.wait(
+            {runner, asyncio.create_task(stop.wait())},
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        try:
+            await asyncio.wait_for(
+                runner, settings.notification_shutdown_timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Dispatcher did not stop in time, abandoning")
+    finally:
+        await dispatcher.aclose()
+        await get_pool_maintainer().stop()
+        await get_engine().dispose()
+        logger.info(f"Dispatcher stopped: {dispatcher.stats()}")
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.notification_batch_size,
+        help="Due notifications claimed per round",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s",
+    )
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,124 @@
+import asyncio
 import logging
-from typing import Union
+import sys
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Union
 
-import uvicorn
 from fastapi import FastAPI
 
-from app.api.v1.endpoints import auth
+from app.api.middleware.metrics import MetricsMiddleware
+from app.api.v1.endpoints import alerts, auth, metrics, products, users
 from app.core.config import get_settings
+from app.db.base import SessionLocal, get_engine, get_pool_maintainer
+from app.db.pool import warm_pool
+from app.repositories.auth.repositories import SqlAlchemyAuthRepository
+from app.services.auth.audit import login_audit_writer
+from app.services.auth.rate_limit import (
+    InMemoryRateLimitBackend,
+    get_login_rate_limiter,
+)
+from app.services.auth.refresh import RefreshTokenService, refresh_token_purger
+from app.services.product.ingestion import PriceIngestionService
+from app.services.product.partitions import price_partition_maintainer
+from app.services.user.importer import get_user_import_executor
+from app.utils.security import Security
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+async def _warm(description: str, warmup: Callable[[], Awaitable]) -> None:
+    try:
+        await warmup()
+    except Exception as e:
+        logger.warning(f"Could not {description}: {e}")
+
+
+async def _load_default_role() -> None:
+    async with SessionLocal() as session:
+        await SqlAlchemyAuthRepository.load_default_role_id(session)
+
+
+async def _warm_last_prices() -> None:
+    async with SessionLocal() as session:
+        await PriceIngestionService.warm(
+            session, settings.price_heartbeat_seconds
+        )
+
+
+async def _seed_rate_limiter() -> None:
+    async with SessionLocal() as session:
+        await get_login_rate_limiter().seed(session)
+
+
+async def _load_revoked_tokens() -> None:
+    async with SessionLocal() as session:
+        await RefreshTokenService.warm(session)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The engine is created here rather than on import, and its pool
+    # filled before the warmups below run on it concurrently.
+    engine = get_engine()
+    await _warm(
+        "open pool connections",
+        lambda: warm_pool(engine, settings.db_pool_warmup_connections),
+    )
+    warmups = [
+        # Registration resolves the role lazily if the warmup fails.
+        _warm("preload the default role", _load_default_role),
+        _warm(
+            "create price history partitions",
+            price_partition_maintainer.check,
+        ),
+        _warm("warm the last-price cache", _warm_last_prices),
+        _warm("load revoked refresh tokens", _load_revoked_tokens),
+        _warm("load the bcrypt backend", Security.password_hasher.warm),
+    ]
+    if isinstance(get_login_rate_limiter().backend, InMemoryRateLimitBackend):
+        warmups.append(
+            _warm("seed the login rate limiter", _seed_rate_limiter)
+        )
+    await asyncio.gather(*warmups)
+    await login_audit_writer.start()
+    await refresh_token_purger.start()
+    await get_pool_maintainer().start()
+    await price_partition_maintainer.start()
+    yield
+    await price_partition_maintainer.stop()
+    await get_pool_maintainer().stop()
+    await refresh_token_purger.stop()
+    await login_audit_writer.stop()
+    # Only the crawl worker uses the scraper by default; do not import it
+    # just to close it.
+    scraper = sys.modules.get("app.services.scraper.service")
+    if (
+        scraper is not None
+        and scraper.get_scraper_service.cache_info().currsize
+    ):
+        await scraper.get_scraper_service().aclose()
+    Security.password_hasher.shutdown()
+    if get_user_import_executor.cache_info().currsize:
+        get_user_import_executor().shutdown(wait=True)
+        get_user_import_executor.cache_clear()
+    await engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Register routers
 app.include_router(auth.router)
+app.include_router(users.router)
+app.include_router(alerts.router)
+app.include_router(products.router)
 
-settings = get_settings()
+if settings.metrics_enabled:
+    app.add_middleware(
+        MetricsMiddleware, sql_sample_rate=settings.metrics_sql_sample_rate
+    )
+    app.include_router(metrics.router)
 
 
 logging.getLogger("passlib").setLevel(logging.ERROR)
@@ -28,6 +134,8 @@ async def health_check():
 
 
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run(
         "app.main:app",
         host=settings.host,
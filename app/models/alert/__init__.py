@@ -0,0 +1,15 @@
+from .models import (
+    NOTIFICATION_FAILED,
+    NOTIFICATION_PENDING,
+    NOTIFICATION_SENT,
+    Notification,
+    PriceAlert,
+)
+
+__all__ = [
+    "PriceAlert",
+    "Notification",
+    "NOTIFICATION_PENDING",
+    "NOTIFICATION_SENT",
+    "NOTIFICATION_FAILED",
+]
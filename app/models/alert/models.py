@@ -0,0 +1,120 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    Text,
+    UniqueConstraint,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import func
+
+from app.models.base import BaseModel, TimestampMixin
+
+# Notification.status values
+NOTIFICATION_PENDING = "pending"
+NOTIFICATION_SENT = "sent"
+NOTIFICATION_FAILED = "failed"
+
+
+class PriceAlert(BaseModel, TimestampMixin):
+    """
+    A user's target price for a product. ``notified_price`` is the price
+    the user was last told about: the alert fires again only for a lower
+    price, and is re-armed (reset to NULL) once the price goes back above
+    the target.
+    """
+
+    __tablename__ = "price_alerts"
+    __table_args__ = (
+        UniqueConstraint("user_id", "product_id", name="uq_price_alert"),
+        # Matching probes this with each changed product and its new price;
+        # not partial, so it also serves the product foreign key.
+        Index(
+            "ix_price_alerts_product_id_target_price",
+            "product_id",
+            "target_price",
+        ),
+    )
+
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id"), nullable=False, index=True
+    )
+    product_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("products.id"), nullable=False
+    )
+    target_price: Mapped[Decimal] = mapped_column(
+        Numeric(12, 2), nullable=False
+    )
+    currency: Mapped[str] = mapped_column(String(3), nullable=False)
+    channel: Mapped[str] = mapped_column(String(20), default="email")
+    webhook_url: Mapped[Optional[str]] = mapped_column(
+        String(2048), nullable=True
+    )
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    notified_price: Mapped[Optional[Decimal]] = mapped_column(
+        Numeric(12, 2), nullable=True
+    )
+    last_triggered_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    user = relationship("User")
+    product = relationship("Product")
+
+
+class Notification(BaseModel, TimestampMixin):
+    """
+    Transactional outbox: a message is written in the same transaction
+    as the change that caused it and delivered later by a dispatcher.
+    ``recipient`` is resolved when the row is written (an email address
+    or a webhook URL), so delivery needs no further lookups.
+    """
+
+    __tablename__ = "notifications"
+    __table_args__ = (
+        Index(
+            "ix_notifications_pending_available_at",
+            "available_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
+
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id"), nullable=False, index=True
+    )
+    alert_id: Mapped[Optional[int]] = mapped_column(
+        Integer,
+        ForeignKey("price_alerts.id", ondelete="SET NULL"),
+        index=True,
+    )
+    channel: Mapped[str] = mapped_column(String(20), nullable=False)
+    recipient: Mapped[str] = mapped_column(String(2048), nullable=False)
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    # At most one pending message per key: producers upsert on it to fold
+    # a newer event into a message that has not gone out yet, and the
+    # dispatcher clears it when it claims the message for delivery.
+    dedupe_key: Mapped[Optional[str]] = mapped_column(
+        String(255), unique=True, nullable=True
+    )
+    status: Mapped[str] = mapped_column(
+        String(20), default=NOTIFICATION_PENDING, nullable=False
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    sent_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
@@ -88,13 +88,14 @@ class RefreshToken(BaseModel, TimestampMixin):
     __tablename__ = "refresh_tokens"
 
     user_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("users.id"), nullable=False
+        Integer, ForeignKey("users.id"), nullable=False, index=True
     )
+    # SHA-256 hex digest of the token; the token itself is never stored.
     token: Mapped[str] = mapped_column(
         String(255), unique=True, index=True, nullable=False
     )
     expires_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False
+        DateTime(timezone=True), nullable=False, index=True
     )
     is_revoked: Mapped[bool] = mapped_column(Boolean, default=False)
 
@@ -187,5 +188,5 @@ class LoginAttempt(BaseModel, TimestampMixin):
         String(100), nullable=True
     )
     attempted_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now()
+        DateTime(timezone=True), server_default=func.now(), index=True
     )
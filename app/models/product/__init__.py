@@ -0,0 +1,21 @@
+from .models import (
+    CrawlSchedule,
+    DailyPrice,
+    PricePoint,
+    PriceRollupMixin,
+    Product,
+    ProductSource,
+    WeeklyPrice,
+    price_partition_name,
+)
+
+__all__ = [
+    "Product",
+    "ProductSource",
+    "PricePoint",
+    "PriceRollupMixin",
+    "DailyPrice",
+    "WeeklyPrice",
+    "CrawlSchedule",
+    "price_partition_name",
+]
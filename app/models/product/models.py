@@ -0,0 +1,240 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Computed,
+    Date,
+    DateTime,
+    ForeignKey,
+    Identity,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    Text,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import func
+
+from app.db import Base
+from app.models.base import BaseModel, TimestampMixin
+
+
+class Product(BaseModel, TimestampMixin):
+    """
+    A tracked product. The ``lowest_price`` block is denormalised from the
+    sources' current prices whenever prices are recorded, so listings can
+    filter and sort on it through indexes.
+    """
+
+    __tablename__ = "products"
+    __table_args__ = (
+        # Keyset pagination: (sort key, id) for every listing order.
+        Index(
+            "ix_products_active_lowest_price_id",
+            "lowest_price",
+            "id",
+            postgresql_where=text("is_active"),
+        ),
+        Index(
+            "ix_products_active_drop_pct_id",
+            "drop_pct",
+            "id",
+            postgresql_where=text("is_active"),
+        ),
+        Index(
+            "ix_products_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+    )
+
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    brand: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    image_url: Mapped[Optional[str]] = mapped_column(
+        String(500), nullable=True
+    )
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    # The 'simple' configuration: names are brands and model numbers,
+    # which stemming would only mangle.
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('simple', coalesce(name, '') || ' ' || "
+            "coalesce(brand, ''))",
+            persisted=True,
+        ),
+    )
+    # Cheapest current price over the active sources, preferring in-stock
+    # ones, and how far it is below the highest daily price of the last
+    # 30 days.
+    lowest_price: Mapped[Optional[Decimal]] = mapped_column(
+        Numeric(12, 2), nullable=True
+    )
+    currency: Mapped[Optional[str]] = mapped_column(String(3), nullable=True)
+    in_stock: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
+    reference_price: Mapped[Optional[Decimal]] = mapped_column(
+        Numeric(12, 2), nullable=True
+    )
+    drop_pct: Mapped[Optional[Decimal]] = mapped_column(
+        Numeric(5, 2), nullable=True
+    )
+    price_updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    sources = relationship("ProductSource", back_populates="product")
+
+
+class ProductSource(BaseModel, TimestampMixin):
+    """A page on a retailer's site where a product's price is observed."""
+
+    __tablename__ = "product_sources"
+    __table_args__ = (
+        # Retailer filter of product listings: a semi-join on both columns.
+        Index("ix_product_sources_domain_product_id", "domain", "product_id"),
+    )
+
+    product_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("products.id"), nullable=False, index=True
+    )
+    url: Mapped[str] = mapped_column(
+        String(2048), unique=True, index=True, nullable=False
+    )
+    domain: Mapped[str] = mapped_column(String(255), nullable=False)
+    external_id: Mapped[Optional[str]] = mapped_column(
+        String(255), nullable=True
+    )
+    currency: Mapped[str] = mapped_column(String(3), default="USD")
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    # Last time a price was scraped from this page, changed or not.
+    last_seen_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # The latest recorded price; ``currency`` is the one it was in.
+    last_price: Mapped[Optional[Decimal]] = mapped_column(
+        Numeric(12, 2), nullable=True
+    )
+    in_stock: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
+    last_price_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    product = relationship("Product", back_populates="sources")
+
+
+class PricePoint(BaseModel):
+    """
+    One observed price. Append-only and range-partitioned by month on
+    ``observed_at`` (see ``price_partition_name``); the partition key must
+    be part of the primary key. No timestamp mixin: ``observed_at`` is the
+    only time that matters and rows are never updated.
+    """
+
+    __tablename__ = "price_points"
+    __table_args__ = (
+        Index(
+            "ix_price_points_product_id_observed_at",
+            "product_id",
+            "observed_at",
+        ),
+        Index(
+            "ix_price_points_observed_at_brin",
+            "observed_at",
+            postgresql_using="brin",
+        ),
+        {"postgresql_partition_by": "RANGE (observed_at)"},
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    observed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now()
+    )
+    product_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("products.id"), nullable=False
+    )
+    source_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("product_sources.id"), nullable=False
+    )
+    price: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
+    currency: Mapped[str] = mapped_column(String(3), nullable=False)
+    in_stock: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
+
+
+class PriceRollupMixin:
+    """
+    Price statistics of one product in one currency over one bucket of
+    time, across all its sources. Kept as sums and counts so a batch of
+    new points can be merged in without rereading the bucket; ``last_*``
+    is the latest point, the price the bucket closed at.
+    """
+
+    # Derived data: goes with the product.
+    product_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("products.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    currency: Mapped[str] = mapped_column(String(3), primary_key=True)
+    # UTC day, or the Monday of the UTC week.
+    bucket: Mapped[date] = mapped_column(Date, primary_key=True)
+    min_price: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
+    max_price: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
+    price_sum: Mapped[Decimal] = mapped_column(Numeric(18, 2), nullable=False)
+    price_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_price: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
+    last_observed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+
+
+class DailyPrice(PriceRollupMixin, Base):
+    __tablename__ = "price_daily"
+
+
+class WeeklyPrice(PriceRollupMixin, Base):
+    __tablename__ = "price_weekly"
+
+
+class CrawlSchedule(BaseModel, TimestampMixin):
+    """
+    When a source is next due for scraping. Rows are leased by moving
+    ``next_run_at`` past the lease expiry, so a crashed worker's jobs
+    become due again on their own.
+    """
+
+    __tablename__ = "crawl_schedules"
+
+    source_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("product_sources.id"), unique=True, nullable=False
+    )
+    next_run_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), index=True, nullable=False
+    )
+    # Volatility-adjusted revisit interval, before the watcher boost.
+    interval_seconds: Mapped[int] = mapped_column(Integer, nullable=False)
+    watchers: Mapped[int] = mapped_column(Integer, default=0)
+    consecutive_unchanged: Mapped[int] = mapped_column(Integer, default=0)
+    failures: Mapped[int] = mapped_column(Integer, default=0)
+    last_run_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    last_changed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    lease_owner: Mapped[Optional[str]] = mapped_column(
+        String(100), nullable=True
+    )
+    leased_until: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+
+def price_partition_name(month: date) -> str:
+    return f"{PricePoint.__tablename__}_{month:%Y%m}"
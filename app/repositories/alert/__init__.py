@@ -0,0 +1,21 @@
+from app.repositories.alert.protocols import (
+    AlertProtocol,
+    ClaimedNotification,
+    NotificationProtocol,
+    NotificationResult,
+    TriggeredAlert,
+)
+from app.repositories.alert.repositories import (
+    get_alert_repository,
+    get_notification_repository,
+)
+
+__all__ = [
+    "AlertProtocol",
+    "ClaimedNotification",
+    "NotificationProtocol",
+    "NotificationResult",
+    "TriggeredAlert",
+    "get_alert_repository",
+    "get_notification_repository",
+]
@@ -0,0 +1,98 @@
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Protocol
+
+from app.models.alert import PriceAlert
+
+
+@dataclass(slots=True)
+class TriggeredAlert:
+    alert_id: int
+    user_id: int
+    notification_id: int
+
+
+@dataclass(slots=True)
+class ClaimedNotification:
+    id: int
+    user_id: int
+    channel: str
+    recipient: str
+    kind: str
+    payload: dict[str, Any]
+    # Including the claim; also fences completions of an expired claim.
+    attempts: int
+
+
+@dataclass(slots=True)
+class NotificationResult:
+    notification_id: int
+    attempts: int
+    status: str
+    # Next attempt for a message left pending, None otherwise.
+    available_at: datetime | None = None
+    sent_at: datetime | None = None
+    error: str | None = None
+
+
+class AlertProtocol(Protocol):
+    async def get_for_user(self, user_id: int) -> list[PriceAlert]:
+        """Retrieve a user's active alerts, newest first."""
+        raise NotImplementedError
+
+    async def upsert(self, alert: PriceAlert) -> PriceAlert:
+        """
+        Create the user's alert for a product, or replace the target of
+        the existing one (which re-arms it).
+        """
+        raise NotImplementedError
+
+    async def delete(self, user_id: int, alert_id: int) -> PriceAlert | None:
+        """Deactivate one of a user's alerts; returns it, or None."""
+        raise NotImplementedError
+
+    async def match_prices(
+        self,
+        prices: dict[tuple[int, str], Decimal],
+        delay_seconds: int = 0,
+    ) -> list[TriggeredAlert]:
+        """
+        Given the new lowest price per ``(product_id, currency)``, re-arm
+        alerts whose target is now below the price, fire alerts whose
+        target is at or above it, and write one outbox notification per
+        fired alert, due ``delay_seconds`` from now, all in one
+        transaction, which also commits writes the caller left in it.
+        """
+        raise NotImplementedError
+
+    async def refresh_watchers(self, product_ids: list[int]) -> int:
+        """
+        Recount active alerts into ``CrawlSchedule.watchers`` for every
+        source of the given products. Returns the schedules updated.
+        """
+        raise NotImplementedError
+
+
+class NotificationProtocol(Protocol):
+    async def claim(
+        self,
+        limit: int,
+        lease_seconds: int,
+        digest_window: int,
+        digest_limit: int,
+    ) -> list[ClaimedNotification]:
+        """
+        Claim up to ``limit`` due pending notifications, plus up to
+        ``digest_limit`` other pending notifications of the same users due
+        within ``digest_window`` seconds, for ``lease_seconds``. Claimed rows
+        are skipped by concurrent dispatchers until completed or expired.
+        """
+        raise NotImplementedError
+
+    async def complete(self, results: list[NotificationResult]) -> int:
+        """
+        Record delivery results of claimed notifications. Returns the
+        notifications updated.
+        """
+        raise NotImplementedError
@@ -0,0 +1,522 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from fastapi import Depends
+from sqlalchemy import (
+    DateTime,
+    String,
+    bindparam,
+    case,
+    cast,
+    func,
+    literal,
+    or_,
+    select,
+    union,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, NUMERIC
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.base import get_db
+from app.models.alert import PriceAlert
+from app.models.alert.models import NOTIFICATION_PENDING, Notification
+from app.models.auth import User
+from app.models.product import CrawlSchedule, Product, ProductSource
+from app.repositories.alert.protocols import (
+    AlertProtocol,
+    ClaimedNotification,
+    NotificationProtocol,
+    NotificationResult,
+    TriggeredAlert,
+)
+
+# Notification.kind of fired price alerts
+PRICE_DROP = "price_drop"
+PRICE_ALERT_DEDUPE_PREFIX = "price_alert:"
+
+
+class SqlAlchemyAlertRepository(AlertProtocol):
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_for_user(self, user_id: int) -> list[PriceAlert]:
+        """
+        Retrieves a user's active alerts.
+
+        Args:
+            user_id (int): The owner of the alerts.
+
+        Returns:
+            list[PriceAlert]: The active alerts, newest first.
+        """
+        result = await self.session.execute(
+            select(PriceAlert)
+            .where(
+                PriceAlert.user_id == user_id,
+                PriceAlert.is_active == True,  # noqa: E712
+            )
+            .order_by(PriceAlert.id.desc())
+        )
+        return list(result.scalars().all())
+
+    async def upsert(self, alert: PriceAlert) -> PriceAlert:
+        """
+        Creates or replaces the user's alert for a product with one
+        ``INSERT ... ON CONFLICT DO UPDATE``. A replaced alert is re-armed
+        and reactivated.
+
+        Args:
+            alert (PriceAlert): The alert to store.
+
+        Returns:
+            PriceAlert: The stored alert.
+        """
+        values = {
+            "user_id": alert.user_id,
+            "product_id": alert.product_id,
+            "target_price": alert.target_price,
+            "currency": alert.currency,
+            "channel": alert.channel or "email",
+            "webhook_url": alert.webhook_url,
+            "is_active": True,
+        }
+        statement = pg_insert(PriceAlert).values(**values)
+        result = await self.session.scalars(
+            statement.on_conflict_do_update(
+                constraint="uq_price_alert",
+                set_={
+                    **{
+                        key: statement.excluded[key]
+                        for key in (
+                            "target_price",
+                            "currency",
+                            "channel",
+                            "webhook_url",
+                            "is_active",
+                        )
+                    },
+                    "notified_price": None,
+                    "updated_at": func.now(),
+                },
+            )
+            .returning(PriceAlert)
+            .execution_options(populate_existing=True)
+        )
+        stored = result.one()
+        await self.session.commit()
+        return stored
+
+    async def delete(self, user_id: int, alert_id: int) -> PriceAlert | None:
+        """
+        Deactivates one of a user's alerts.
+
+        Args:
+            user_id (int): The owner of the alert.
+            alert_id (int): The alert to deactivate.
+
+        Returns:
+            PriceAlert | None: The deactivated alert, or None if the user
+            has no such active alert.
+        """
+        result = await self.session.scalars(
+            update(PriceAlert)
+            .where(
+                PriceAlert.id == alert_id,
+                PriceAlert.user_id == user_id,
+                PriceAlert.is_active == True,  # noqa: E712
+            )
+            .values(is_active=False, updated_at=func.now())
+            .returning(PriceAlert)
+            .execution_options(
+                synchronize_session=False, populate_existing=True
+            )
+        )
+        alert = result.one_or_none()
+        await self.session.commit()
+        return alert
+
+    async def match_prices(
+        self,
+        prices: dict[tuple[int, str], Decimal],
+        delay_seconds: int = 0,
+    ) -> list[TriggeredAlert]:
+        """
+        Matches a batch of new prices against alerts through the
+        ``(product_id, target_price)`` index, so the cost follows the
+        number of changed products rather than the number of alerts.
+
+        Firing is a conditional ``UPDATE ... RETURNING`` that only takes
+        alerts not yet told about this price or a lower one; its rows
+        feed an ``INSERT`` into the outbox in the same statement. The row
+        lock makes concurrent matchers fire each alert once, and the
+        dedupe key folds a further drop into a notification that is still
+        pending instead of queueing a second one.
+
+        Commits the session's transaction, along with any writes the
+        caller left in it, such as the prices being matched.
+
+        Args:
+            prices (dict[tuple[int, str], Decimal]): Lowest new price per
+                product and currency.
+            delay_seconds (int): Hold new notifications back this long, so
+                the dispatcher can fold a burst of them into one digest.
+
+        Returns:
+            list[TriggeredAlert]: The alerts fired and their notifications.
+        """
+        if not prices:
+            await self.session.commit()
+            return []
+        keys = list(prices)
+        changes = (
+            func.unnest(
+                bindparam(
+                    "product_ids",
+                    [product_id for product_id, _ in keys],
+                    type_=ARRAY(PriceAlert.product_id.type),
+                ),
+                bindparam(
+                    "currencies",
+                    [currency for _, currency in keys],
+                    type_=ARRAY(String),
+                ),
+                bindparam(
+                    "prices",
+                    list(prices.values()),
+                    type_=ARRAY(NUMERIC(12, 2)),
+                ),
+            )
+            .table_valued("product_id", "currency", "price")
+            .render_derived(name="changes")
+        )
+        matches = [
+            PriceAlert.product_id == changes.c.product_id,
+            PriceAlert.currency == changes.c.currency,
+            PriceAlert.is_active == True,  # noqa: E712
+        ]
+
+        # Back above target: the next drop below it is news again. Judged
+        # on the product's lowest price, written in this transaction, not
+        # the batch's: a pricier source going up must not re-arm an alert
+        # a cheaper one still satisfies.
+        await self.session.execute(
+            update(PriceAlert)
+            .where(
+                *matches,
+                Product.id == PriceAlert.product_id,
+                Product.currency == PriceAlert.currency,
+                PriceAlert.target_price < Product.lowest_price,
+                PriceAlert.notified_price.is_not(None),
+            )
+            .values(notified_price=None)
+            .execution_options(synchronize_session=False)
+        )
+
+        fired = (
+            update(PriceAlert)
+            .where(
+                *matches,
+                PriceAlert.target_price >= changes.c.price,
+                or_(
+                    PriceAlert.notified_price.is_(None),
+                    PriceAlert.notified_price > changes.c.price,
+                ),
+                # Left armed for when a deactivated user comes back.
+                PriceAlert.user_id == User.id,
+                User.is_active == True,  # noqa: E712
+            )
+            .values(
+                notified_price=changes.c.price, last_triggered_at=func.now()
+            )
+            .returning(
+                PriceAlert.id,
+                PriceAlert.user_id,
+                PriceAlert.product_id,
+                PriceAlert.target_price,
+                PriceAlert.currency,
+                PriceAlert.channel,
+                PriceAlert.webhook_url,
+                changes.c.price,
+            )
+            .cte("fired")
+        )
+        rows = (
+            select(
+                fired.c.user_id,
+                fired.c.id,
+                fired.c.channel,
+                case(
+                    (fired.c.channel == "webhook", fired.c.webhook_url),
+                    else_=User.email,
+                ),
+                literal(PRICE_DROP),
+                func.jsonb_build_object(
+                    "alert_id",
+                    fired.c.id,
+                    "product_id",
+                    fired.c.product_id,
+                    "product_name",
+                    Product.name,
+                    # Amounts as strings: JSON numbers would become floats.
+                    "price",
+                    cast(fired.c.price, String),
+                    "target_price",
+                    cast(fired.c.target_price, String),
+                    "currency",
+                    fired.c.currency,
+                ),
+                func.concat(PRICE_ALERT_DEDUPE_PREFIX, fired.c.id),
+                literal(NOTIFICATION_PENDING),
+                literal(0),
+                func.now() + timedelta(seconds=delay_seconds),
+            )
+            .join(User, User.id == fired.c.user_id)
+            .join(Product, Product.id == fired.c.product_id)
+        )
+        statement = pg_insert(Notification).from_select(
+            [
+                "user_id",
+                "alert_id",
+                "channel",
+                "recipient",
+                "kind",
+                "payload",
+                "dedupe_key",
+                "status",
+                "attempts",
+                "available_at",
+            ],
+            rows,
+        )
+        result = await self.session.execute(
+            statement.on_conflict_do_update(
+                index_elements=["dedupe_key"],
+                set_={
+                    "payload": statement.excluded.payload,
+                    "updated_at": func.now(),
+                },
+            ).returning(
+                Notification.id, Notification.alert_id, Notification.user_id
+            )
+        )
+        triggered = [
+            TriggeredAlert(
+                alert_id=alert_id,
+                user_id=user_id,
+                notification_id=notification_id,
+            )
+            for notification_id, alert_id, user_id in result.all()
+        ]
+        await self.session.commit()
+        return triggered
+
+    async def refresh_watchers(self, product_ids: list[int]) -> int:
+        """
+        Recounts active alerts per product into the crawl schedules of
+        the products' sources, so watched products are crawled sooner.
+
+        Args:
+            product_ids (list[int]): Products whose alerts changed.
+
+        Returns:
+            int: The number of schedules updated.
+        """
+        if not product_ids:
+            return 0
+        counts = (
+            select(
+                ProductSource.id.label("source_id"),
+                func.count(PriceAlert.id).label("watchers"),
+            )
+            .outerjoin(
+                PriceAlert,
+                (PriceAlert.product_id == ProductSource.product_id)
+                & (PriceAlert.is_active == True),  # noqa: E712
+            )
+            .where(ProductSource.product_id.in_(product_ids))
+            .group_by(ProductSource.id)
+            .subquery()
+        )
+        result = await self.session.execute(
+            update(CrawlSchedule)
+            .where(
+                CrawlSchedule.source_id == counts.c.source_id,
+                CrawlSchedule.watchers != counts.c.watchers,
+            )
+            .values(watchers=counts.c.watchers)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+        return result.rowcount
+
+
+class SqlAlchemyNotificationRepository(NotificationProtocol):
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def claim(
+        self,
+        limit: int,
+        lease_seconds: int,
+        digest_window: int,
+        digest_limit: int,
+    ) -> list[ClaimedNotification]:
+        """
+        Claims due notifications in one statement. A ``FOR UPDATE SKIP
+        LOCKED`` CTE picks the earliest due rows and a second one adds the
+        same users' other pending rows due within the digest window; the
+        UPDATE pushes their ``available_at`` past the lease, so concurrent
+        dispatchers skip them until they are completed or the lease runs
+        out. Claiming counts as an attempt and releases the dedupe key: a
+        message being sent can no longer absorb newer events.
+
+        Args:
+            limit (int): Maximum number of due notifications to claim.
+            lease_seconds (int): How long the claim lasts.
+            digest_window (int): Also claim the same users' notifications
+                due up to this many seconds from now.
+            digest_limit (int): Maximum number of those to claim.
+
+        Returns:
+            list[ClaimedNotification]: The claimed notifications.
+        """
+        pending = Notification.status == NOTIFICATION_PENDING
+        due = (
+            select(Notification.id, Notification.user_id)
+            .where(pending, Notification.available_at <= func.now())
+            .order_by(Notification.available_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .cte("due")
+        )
+        digest = (
+            select(Notification.id)
+            .where(
+                pending,
+                Notification.user_id.in_(select(due.c.user_id)),
+                Notification.available_at
+                <= func.now() + timedelta(seconds=digest_window),
+            )
+            .order_by(Notification.available_at)
+            .limit(digest_limit)
+            .with_for_update(skip_locked=True)
+            .cte("digest")
+        )
+        result = await self.session.execute(
+            update(Notification)
+            .where(
+                Notification.id.in_(
+                    union(select(due.c.id), select(digest.c.id))
+                )
+            )
+            .values(
+                available_at=func.now() + timedelta(seconds=lease_seconds),
+                attempts=Notification.attempts + 1,
+                dedupe_key=None,
+                updated_at=func.now(),
+            )
+            .returning(
+                Notification.id,
+                Notification.user_id,
+                Notification.channel,
+                Notification.recipient,
+                Notification.kind,
+                Notification.payload,
+                Notification.attempts,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        claimed = [ClaimedNotification(*row) for row in result.all()]
+        await self.session.commit()
+        return claimed
+
+    async def complete(self, results: list[NotificationResult]) -> int:
+        """
+        Records delivery results with one ``UPDATE ... FROM unnest(...)``,
+        one round trip for the whole batch. Results of a claim that
+        expired and was taken over by another dispatcher (the attempt
+        count moved on) are ignored.
+
+        Args:
+            results (list[NotificationResult]): Results to record.
+
+        Returns:
+            int: The number of notifications updated.
+        """
+        if not results:
+            return 0
+        timestamp = DateTime(timezone=True)
+        outcomes = (
+            func.unnest(
+                bindparam(
+                    "ids",
+                    [outcome.notification_id for outcome in results],
+                    type_=ARRAY(Notification.id.type),
+                ),
+                bindparam(
+                    "attempts",
+                    [outcome.attempts for outcome in results],
+                    type_=ARRAY(Notification.attempts.type),
+                ),
+                bindparam(
+                    "statuses",
+                    [outcome.status for outcome in results],
+                    type_=ARRAY(String),
+                ),
+                bindparam(
+                    "available_ats",
+                    [outcome.available_at for outcome in results],
+                    type_=ARRAY(timestamp),
+                ),
+                bindparam(
+                    "sent_ats",
+                    [outcome.sent_at for outcome in results],
+                    type_=ARRAY(timestamp),
+                ),
+                bindparam(
+                    "errors",
+                    [outcome.error for outcome in results],
+                    type_=ARRAY(String),
+                ),
+            )
+            .table_valued(
+                "id", "attempts", "status", "available_at", "sent_at", "error"
+            )
+            .render_derived(name="outcomes")
+        )
+        result = await self.session.execute(
+            update(Notification)
+            .where(
+                Notification.id == outcomes.c.id,
+                Notification.attempts == outcomes.c.attempts,
+                Notification.status == NOTIFICATION_PENDING,
+            )
+            .values(
+                status=outcomes.c.status,
+                available_at=func.coalesce(
+                    outcomes.c.available_at, Notification.available_at
+                ),
+                sent_at=outcomes.c.sent_at,
+                last_error=outcomes.c.error,
+                updated_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+        return result.rowcount
+
+
+async def get_alert_repository(
+    db: AsyncSession = Depends(get_db),
+) -> AlertProtocol:
+    return SqlAlchemyAlertRepository(session=db)
+
+
+async def get_notification_repository(
+    db: AsyncSession = Depends(get_db),
+) -> NotificationProtocol:
+    return SqlAlchemyNotificationRepository(session=db)
@@ -1,4 +1,29 @@
-from app.repositories.auth.protocols import AuthProtocol
-from app.repositories.auth.repositories import get_auth_repository
+from app.repositories.auth.cache import (
+    CacheBackend,
+    CachedAuthRepository,
+    InMemoryCacheBackend,
+    RedisCacheBackend,
+)
+from app.repositories.auth.protocols import (
+    AuthProtocol,
+    PermissionProtocol,
+    RefreshTokenProtocol,
+)
+from app.repositories.auth.repositories import (
+    get_auth_repository,
+    get_permission_repository,
+    get_refresh_token_repository,
+)
 
-__all__ = ["get_auth_repository", "AuthProtocol"]
+__all__ = [
+    "get_auth_repository",
+    "AuthProtocol",
+    "PermissionProtocol",
+    "get_permission_repository",
+    "RefreshTokenProtocol",
+    "get_refresh_token_repository",
+    "CacheBackend",
+    "CachedAuthRepository",
+    "InMemoryCacheBackend",
+    "RedisCacheBackend",
+]
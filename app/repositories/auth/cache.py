@@ -0,0 +1,232 @@
+import json
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Protocol
+
+from sqlalchemy import DateTime
+
+from app.core.config import get_settings
+from app.models.auth import User
+from app.repositories.auth.protocols import AuthProtocol
+from app.utils.cache import TTLCache
+
+# Stored for emails that have no active user, so repeated lookups for
+# unknown accounts (e.g. credential stuffing) never reach the database.
+_NEGATIVE = "null"
+# Never written to a cache, least of all a shared one.
+_UNCACHED_COLUMNS = frozenset({"hashed_password"})
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> str | None:
+        """Return the cached value for ``key``, or None on a miss."""
+        raise NotImplementedError
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        """Store ``value`` under ``key`` for ``ttl`` seconds."""
+        raise NotImplementedError
+
+    async def delete(self, *keys: str) -> None:
+        """Remove ``keys`` from the cache."""
+        raise NotImplementedError
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Per-process LRU backend; entries are not shared between workers."""
+
+    def __init__(self, max_size: int):
+        self.cache: TTLCache[str, str] = TTLCache(max_size=max_size)
+
+    async def get(self, key: str) -> str | None:
+        return self.cache.get(key)
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        self.cache.set(key, value, expires_at=time.time() + ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.cache.delete(key)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Backend for any client exposing the ``redis.asyncio`` ``get``/``set``/
+    ``delete`` coroutines, so a local fake can stand in during development.
+    """
+
+    def __init__(self, client: Any, prefix: str = "upt:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisCacheBackend":
+        try:
+            from redis.asyncio import Redis
+        except ImportError as e:  # pragma: no cover - optional dependency
+            raise RuntimeError(
+                "redis_url is set but the 'redis' package is not installed"
+            ) from e
+        return cls(Redis.from_url(url, decode_responses=True))
+
+    async def get(self, key: str) -> str | None:
+        value = await self.client.get(self.prefix + key)
+        if isinstance(value, bytes):
+            return value.decode()
+        return value
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        await self.client.set(self.prefix + key, value, ex=ttl)
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*(self.prefix + key for key in keys))
+
+
+def _serialize_user(user: User) -> str:
+    data = {}
+    for column in User.__table__.columns:
+        if column.key in _UNCACHED_COLUMNS:
+            continue
+        value = getattr(user, column.key)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        data[column.key] = value
+    return json.dumps(data)
+
+
+def _deserialize_user(raw: str) -> User:
+    # Uncached columns stay unset rather than None, so merging the user
+    # back in an update leaves them alone.
+    data = json.loads(raw)
+    for column in User.__table__.columns:
+        value = data.get(column.key)
+        if value is not None and isinstance(column.type, DateTime):
+            data[column.key] = datetime.fromisoformat(value)
+    return User(**data)
+
+
+class CachedAuthRepository(AuthProtocol):
+    """
+    Read-through cache around another ``AuthProtocol`` implementation.
+
+    Users are cached by email and by id as column snapshots, without the
+    password hash, and returned as detached ``User`` instances; logins read
+    the hash from the wrapped repository through ``get_for_login``. Writes
+    go to the wrapped repository first and then refresh or invalidate the
+    affected keys.
+    """
+
+    def __init__(
+        self,
+        repository: AuthProtocol,
+        backend: CacheBackend,
+        ttl: int,
+        negative_ttl: int,
+    ):
+        self.repository = repository
+        self.backend = backend
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+    @staticmethod
+    def _email_key(email: str) -> str:
+        # Exact, like the lookup in SQL: keys that fold case would let a
+        # miss for "VICTIM@..." shadow the real "victim@..." account.
+        return f"user:email:{email}"
+
+    @staticmethod
+    def _id_key(user_id: int) -> str:
+        return f"user:id:{user_id}"
+
+    async def _store(self, user: User) -> None:
+        raw = _serialize_user(user)
+        await self.backend.set(self._email_key(user.email), raw, self.ttl)
+        await self.backend.set(self._id_key(user.id), raw, self.ttl)
+
+    async def _forget(self, user_id: int) -> None:
+        keys = [self._id_key(user_id)]
+        cached = await self.backend.get(self._id_key(user_id))
+        if cached is not None and cached != _NEGATIVE:
+            keys.append(self._email_key(json.loads(cached)["email"]))
+        await self.backend.delete(*keys)
+
+    async def get_by_id(self, user_id: int) -> User | None:
+        cached = await self.backend.get(self._id_key(user_id))
+        if cached is not None:
+            return None if cached == _NEGATIVE else _deserialize_user(cached)
+
+        user = await self.repository.get_by_id(user_id)
+        if user is None:
+            await self.backend.set(
+                self._id_key(user_id), _NEGATIVE, self.negative_ttl
+            )
+        else:
+            await self._store(user)
+        return user
+
+    async def get_by_email(self, email: str) -> User | None:
+        cached = await self.backend.get(self._email_key(email))
+        if cached is not None:
+            return None if cached == _NEGATIVE else _deserialize_user(cached)
+
+        user = await self.repository.get_by_email(email)
+        if user is None:
+            await self.backend.set(
+                self._email_key(email), _NEGATIVE, self.negative_ttl
+            )
+        else:
+            await self._store(user)
+        return user
+
+    async def get_for_login(self, email: str) -> User | None:
+        # Unknown emails are still answered from the cache.
+        if await self.backend.get(self._email_key(email)) == _NEGATIVE:
+            return None
+        user = await self.repository.get_for_login(email)
+        if user is None:
+            await self.backend.set(
+                self._email_key(email), _NEGATIVE, self.negative_ttl
+            )
+        else:
+            await self._store(user)
+        return user
+
+    async def create(self, user: User) -> User:
+        try:
+            user = await self.repository.create(user)
+        finally:
+            await self.backend.delete(self._email_key(user.email))
+        await self._store(user)
+        return user
+
+    async def create_many(self, users: list[User]) -> list[User]:
+        created = await self.repository.create_many(users)
+        await self.backend.delete(
+            *(self._email_key(user.email) for user in created)
+        )
+        return created
+
+    async def update(self, user: User) -> User:
+        await self._forget(user.id)
+        user = await self.repository.update(user)
+        if user.is_active:
+            await self._store(user)
+        else:
+            await self.backend.delete(self._email_key(user.email))
+        return user
+
+    async def delete(self, user_id: int) -> None:
+        user = await self.get_by_id(user_id)
+        await self.repository.delete(user_id)
+        await self.backend.delete(self._id_key(user_id))
+        if user is not None:
+            await self.backend.delete(self._email_key(user.email))
+
+
+@lru_cache()
+def get_cache_backend() -> CacheBackend:
+    settings = get_settings()
+    if settings.redis_url:
+        return RedisCacheBackend.from_url(settings.redis_url)
+    return InMemoryCacheBackend(max_size=settings.user_cache_max_size)
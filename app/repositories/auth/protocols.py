@@ -1,6 +1,7 @@
+from datetime import datetime
 from typing import Protocol
 
-from app.models.auth import User
+from app.models.auth import RefreshToken, User
 
 
 class AuthProtocol(Protocol):
@@ -12,10 +13,24 @@ class AuthProtocol(Protocol):
         """Retrieve a user by their email from the database."""
         raise NotImplementedError
 
+    async def get_for_login(self, email: str) -> User | None:
+        """
+        Retrieve a user by their email together with their password hash,
+        which caches never hold.
+        """
+        raise NotImplementedError
+
     async def create(self, user: User) -> User:
         """Create a new user in the database."""
         raise NotImplementedError
 
+    async def create_many(self, users: list[User]) -> list[User]:
+        """
+        Create many users in the database, skipping any that conflict with
+        an existing email or username. Returns only the created users.
+        """
+        raise NotImplementedError
+
     async def update(self, user: User) -> User:
         """Update an existing user in the database."""
         raise NotImplementedError
@@ -23,3 +38,55 @@ class AuthProtocol(Protocol):
     async def delete(self, user_id: int) -> None:
         """Delete a user from the database."""
         raise NotImplementedError
+
+
+class PermissionProtocol(Protocol):
+    async def get_permissions_for_email(self, email: str) -> frozenset[str]:
+        """
+        Retrieve the effective ``resource:action`` permissions granted to an
+        active user through their active roles.
+        """
+        raise NotImplementedError
+
+
+class RefreshTokenProtocol(Protocol):
+    async def create(self, token: RefreshToken) -> RefreshToken:
+        """Store a new refresh token."""
+        raise NotImplementedError
+
+    async def rotate(
+        self, token_hash: str, replacement: RefreshToken
+    ) -> tuple[int, datetime] | None:
+        """
+        Atomically revoke the live token with ``token_hash`` and store
+        ``replacement`` for the same user. Returns the user id and the
+        revoked token's expiry, or None if no live token matched.
+        """
+        raise NotImplementedError
+
+    async def get_by_hash(self, token_hash: str) -> RefreshToken | None:
+        """Retrieve a refresh token, revoked or not, by its hash."""
+        raise NotImplementedError
+
+    async def revoke_all_for_user(
+        self, user_id: int
+    ) -> list[tuple[str, datetime]]:
+        """
+        Revoke every live refresh token of a user. Returns the hashes and
+        expiries of the tokens that were revoked.
+        """
+        raise NotImplementedError
+
+    async def get_revoked(self, limit: int) -> list[tuple[str, int, datetime]]:
+        """
+        Retrieve ``(hash, user_id, expires_at)`` for revoked tokens that
+        have not expired yet, most recent first.
+        """
+        raise NotImplementedError
+
+    async def purge_expired(self, batch_size: int) -> int:
+        """
+        Delete expired refresh tokens in batches of ``batch_size`` rows.
+        Returns the number of rows deleted.
+        """
+        raise NotImplementedError
@@ -1,16 +1,67 @@
+from datetime import datetime
+
 from fastapi import Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
+from app.core.config import get_settings
+from app.core.exceptions import EmailAlreadyExistsException
 from app.db.base import get_db
-from app.models.auth import Role, User, UserRole
-from app.repositories.auth.protocols import AuthProtocol
+from app.models.auth import (
+    Permission,
+    RefreshToken,
+    Role,
+    RolePermission,
+    User,
+    UserRole,
+)
+from app.repositories.auth.cache import (
+    CachedAuthRepository,
+    InMemoryCacheBackend,
+    get_cache_backend,
+)
+from app.repositories.auth.protocols import (
+    AuthProtocol,
+    PermissionProtocol,
+    RefreshTokenProtocol,
+)
+from app.utils.security import Security
+
+DEFAULT_ROLE_NAME = "user"
+USERS_EMAIL_INDEX = "ix_users_email"
 
 
 class SqlAlchemyAuthRepository(AuthProtocol):
+    # Role ids never change at runtime, so the default role is looked up
+    # once per process (normally at startup) instead of on every signup.
+    _default_role_id: int | None = None
 
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession):
         self.session = session
 
+    @classmethod
+    async def load_default_role_id(cls, session: AsyncSession) -> int:
+        """
+        Resolve and cache the id of the default role given to new users.
+
+        Raises:
+            ValueError: If the default role is missing from the database.
+        """
+        if cls._default_role_id is None:
+            result = await session.execute(
+                select(Role.id).where(Role.name == DEFAULT_ROLE_NAME)
+            )
+            role_id = result.scalar_one_or_none()
+            if role_id is None:
+                raise ValueError(
+                    f"Default '{DEFAULT_ROLE_NAME}' role not found in database"
+                )
+            cls._default_role_id = role_id
+        return cls._default_role_id
+
     async def get_by_id(self, user_id: int) -> User | None:
         """
         Retrieve an active user by their ID.
@@ -21,11 +72,12 @@ class SqlAlchemyAuthRepository(AuthProtocol):
         Returns:
             User | None: The User object if found and active, otherwise None.
         """
-        return (
-            self.session.query(User)
-            .filter(User.id == user_id, User.is_active == True)  # noqa: E712
-            .first()
+        result = await self.session.execute(
+            select(User)
+            .where(User.id == user_id, User.is_active == True)  # noqa: E712
+            .limit(1)
         )
+        return result.scalars().first()
 
     async def get_by_email(self, email: str) -> User | None:
         """
@@ -37,51 +89,138 @@ class SqlAlchemyAuthRepository(AuthProtocol):
         Returns:
             User | None: The User object if found and active, otherwise None.
         """
-        return (
-            self.session.query(User)
-            .filter(User.email == email, User.is_active == True)  # noqa: E712
-            .first()
+        result = await self.session.execute(
+            select(User)
+            .where(User.email == email, User.is_active == True)  # noqa: E712
+            .limit(1)
         )
+        return result.scalars().first()
+
+    async def get_for_login(self, email: str) -> User | None:
+        """
+        Retrieve an active user by their email address, with the password
+        hash; the same query as ``get_by_email``.
+
+        Args:
+            email (str): The email address of the user to retrieve.
+
+        Returns:
+            User | None: The User object if found and active, otherwise None.
+        """
+        return await self.get_by_email(email)
 
     async def create(self, user: User) -> User:
         """
-        Create a new user in the database.
+        Create a new user and assign the default role in one statement.
+
+        The user INSERT and the ``user_roles`` INSERT run as data-modifying
+        CTEs of a single query that returns the new row, and duplicates are
+        detected by the unique index on ``users.email`` rather than a
+        separate lookup.
 
         Args:
-            user (User): The user instance to be added to the database.
+            user (User): The transient user instance holding the new values.
 
         Returns:
             User: The newly created user instance with
             updated fields (e.g., id).
 
         Raises:
+            EmailAlreadyExistsException: If the email is already registered.
             sqlalchemy.exc.SQLAlchemyError: If there is an error during the
             database operation.
         """
+        role_id = await self.load_default_role_id(self.session)
+        values = {
+            column.key: getattr(user, column.key)
+            for column in User.__table__.columns
+            if getattr(user, column.key) is not None
+        }
+        new_user = (
+            insert(User)
+            .values(**values)
+            .returning(*User.__table__.columns)
+            .cte("new_user")
+        )
+        assign_role = (
+            insert(UserRole)
+            .from_select(
+                ["user_id", "role_id"],
+                select(new_user.c.id, literal(role_id)),
+            )
+            .cte("assign_role")
+        )
         try:
-            user_role = (
-                self.session.query(Role).filter(Role.name == "user").first()
+            result = await self.session.execute(
+                select(aliased(User, new_user)).add_cte(assign_role)
+            )
+            created = result.scalar_one()
+            await self.session.commit()
+            return created
+        except IntegrityError as e:
+            await self.session.rollback()
+            constraint = getattr(
+                getattr(e.orig, "diag", None), "constraint_name", None
             )
-            if not user_role:
-                raise ValueError("Default 'user' role not found in database")
+            if constraint == USERS_EMAIL_INDEX:
+                raise EmailAlreadyExistsException(email=user.email) from e
+            raise
+        except Exception:
+            await self.session.rollback()
+            raise
+
+    async def create_many(self, users: list[User]) -> list[User]:
+        """
+        Create many users and assign them the default role in one
+        transaction.
+
+        Rows are sent as batched multi-row INSERTs with
+        ``ON CONFLICT DO NOTHING``, so rows clashing with an existing email
+        or username (or with an earlier row of the same batch) are skipped
+        instead of aborting the whole batch.
 
-            self.session.add(user)
-            self.session.flush()
+        Args:
+            users (list[User]): Transient user instances to insert.
 
-            user_role_association = UserRole(
-                user_id=user.id, role_id=user_role.id
+        Returns:
+            list[User]: The users that were actually created.
+        """
+        if not users:
+            return []
+        role_id = await self.load_default_role_id(self.session)
+        rows = [
+            {
+                "email": user.email,
+                "username": user.username,
+                "full_name": user.full_name,
+                "hashed_password": user.hashed_password,
+            }
+            for user in users
+        ]
+        try:
+            result = await self.session.scalars(
+                pg_insert(User).on_conflict_do_nothing().returning(User),
+                rows,
             )
-            self.session.add(user_role_association)
-            self.session.commit()
-            self.session.refresh(user)
-            return user
-        except Exception as e:
-            self.session.rollback()
-            raise e
+            created = list(result.all())
+            if created:
+                await self.session.execute(
+                    insert(UserRole),
+                    [
+                        {"user_id": user.id, "role_id": role_id}
+                        for user in created
+                    ],
+                )
+            await self.session.commit()
+            return created
+        except Exception:
+            await self.session.rollback()
+            raise
 
     async def update(self, user: User) -> User:
         """
-        Update an existing user in the database.
+        Update an existing user in the database. Deactivating a user
+        also ends the access tokens issued to it (``invalidate_subject``).
 
         Args:
             user (User): The user instance to update in the database.
@@ -89,14 +228,17 @@ class SqlAlchemyAuthRepository(AuthProtocol):
         Returns:
             User: The updated user instance.
         """
-        self.session.merge(user)
-        self.session.commit()
-        self.session.refresh(user)
+        user = await self.session.merge(user)
+        await self.session.commit()
+        await self.session.refresh(user)
+        if not user.is_active:
+            Security.invalidate_subject(user.email)
         return user
 
     async def delete(self, user_id: int) -> None:
         """
-        Deactivates a user by setting their 'is_active' attribute to False.
+        Deactivates a user by setting their 'is_active' attribute to False,
+        and ends the access tokens issued to it (``invalidate_subject``).
 
         Args:
             user_id (int): The unique identifier of the user to deactivate.
@@ -104,12 +246,239 @@ class SqlAlchemyAuthRepository(AuthProtocol):
         Returns:
             None
         """
-        user = self.session.get(User, user_id)
+        user = await self.session.get(User, user_id)
         if user:
             user.is_active = False
-            self.session.commit()
-            self.session.refresh(user)
+            await self.session.commit()
+            await self.session.refresh(user)
+            Security.invalidate_subject(user.email)
+
+
+class SqlAlchemyPermissionRepository(PermissionProtocol):
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_permissions_for_email(self, email: str) -> frozenset[str]:
+        """
+        Resolve a user's effective permissions with a single join over
+        ``user_roles``, ``roles``, ``role_permissions`` and ``permissions``.
+
+        Args:
+            email (str): The email address of the user.
+
+        Returns:
+            frozenset[str]: Permissions as ``resource:action`` strings
+            (falling back to the permission name when either is unset).
+        """
+        result = await self.session.execute(
+            select(Permission.resource, Permission.action, Permission.name)
+            .join(
+                RolePermission, RolePermission.permission_id == Permission.id
+            )
+            .join(Role, Role.id == RolePermission.role_id)
+            .join(UserRole, UserRole.role_id == Role.id)
+            .join(User, User.id == UserRole.user_id)
+            .where(
+                User.email == email,
+                User.is_active == True,  # noqa: E712
+                Role.is_active == True,  # noqa: E712
+            )
+            .distinct()
+        )
+        return frozenset(
+            f"{resource}:{action}" if resource and action else name
+            for resource, action, name in result.all()
+        )
+
+
+class SqlAlchemyRefreshTokenRepository(RefreshTokenProtocol):
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(self, token: RefreshToken) -> RefreshToken:
+        """
+        Stores a new refresh token.
+
+        Args:
+            token (RefreshToken): The token row, holding only the token hash.
+
+        Returns:
+            RefreshToken: The stored token.
+        """
+        self.session.add(token)
+        await self.session.commit()
+        return token
+
+    async def rotate(
+        self, token_hash: str, replacement: RefreshToken
+    ) -> tuple[int, datetime] | None:
+        """
+        Revokes a live refresh token and stores its replacement in one
+        transaction. The conditional UPDATE on the unique ``token`` index
+        lets exactly one of several concurrent rotations of the same token
+        succeed.
+
+        Args:
+            token_hash (str): Hash of the presented refresh token.
+            replacement (RefreshToken): The new token; its ``user_id`` is
+                filled in from the revoked one.
+
+        Returns:
+            tuple[int, datetime] | None: The owner's id and the revoked
+            token's expiry, or None if the token is unknown, revoked or
+            expired.
+        """
+        result = await self.session.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.token == token_hash,
+                RefreshToken.is_revoked == False,  # noqa: E712
+                RefreshToken.expires_at > func.now(),
+            )
+            .values(is_revoked=True, updated_at=func.now())
+            .returning(RefreshToken.user_id, RefreshToken.expires_at)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.first()
+        if row is None:
+            await self.session.rollback()
+            return None
+        replacement.user_id = row.user_id
+        self.session.add(replacement)
+        await self.session.commit()
+        return row.user_id, row.expires_at
+
+    async def get_by_hash(self, token_hash: str) -> RefreshToken | None:
+        """
+        Retrieves a refresh token by its hash, whether revoked or not.
+
+        Args:
+            token_hash (str): Hash of the refresh token.
+
+        Returns:
+            RefreshToken | None: The token if found, otherwise None.
+        """
+        result = await self.session.execute(
+            select(RefreshToken).where(RefreshToken.token == token_hash)
+        )
+        return result.scalars().first()
+
+    async def revoke_all_for_user(
+        self, user_id: int
+    ) -> list[tuple[str, datetime]]:
+        """
+        Revokes every live refresh token of a user with a single UPDATE.
+
+        Args:
+            user_id (int): The owner of the tokens.
+
+        Returns:
+            list[tuple[str, datetime]]: Hash and expiry of each token that
+            was revoked.
+        """
+        result = await self.session.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.user_id == user_id,
+                RefreshToken.is_revoked == False,  # noqa: E712
+                RefreshToken.expires_at > func.now(),
+            )
+            .values(is_revoked=True, updated_at=func.now())
+            .returning(RefreshToken.token, RefreshToken.expires_at)
+            .execution_options(synchronize_session=False)
+        )
+        revoked = [(token, expires_at) for token, expires_at in result.all()]
+        await self.session.commit()
+        return revoked
+
+    async def get_revoked(self, limit: int) -> list[tuple[str, int, datetime]]:
+        """
+        Retrieves revoked tokens that have not expired yet, most recently
+        revoked first.
+
+        Args:
+            limit (int): Maximum number of rows to return.
+
+        Returns:
+            list[tuple[str, int, datetime]]: ``(hash, user_id, expires_at)``
+            for each token.
+        """
+        result = await self.session.execute(
+            select(
+                RefreshToken.token,
+                RefreshToken.user_id,
+                RefreshToken.expires_at,
+            )
+            .where(
+                RefreshToken.is_revoked == True,  # noqa: E712
+                RefreshToken.expires_at > func.now(),
+            )
+            .order_by(RefreshToken.updated_at.desc())
+            .limit(limit)
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def purge_expired(self, batch_size: int) -> int:
+        """
+        Deletes expired refresh tokens, committing after each batch so row
+        locks are held briefly.
+
+        Args:
+            batch_size (int): Maximum number of rows deleted per statement.
+
+        Returns:
+            int: The number of rows deleted.
+        """
+        purged = 0
+        while True:
+            expired = (
+                select(RefreshToken.id)
+                .where(RefreshToken.expires_at <= func.now())
+                .limit(batch_size)
+            )
+            result = await self.session.execute(
+                delete(RefreshToken)
+                .where(RefreshToken.id.in_(expired))
+                .execution_options(synchronize_session=False)
+            )
+            await self.session.commit()
+            purged += result.rowcount
+            if result.rowcount < batch_size:
+                return purged
+
+
+async def get_auth_repository(
+    db: AsyncSession = Depends(get_db),
+) -> AuthProtocol:
+    repository = SqlAlchemyAuthRepository(session=db)
+    settings = get_settings()
+    if settings.user_cache_ttl_seconds <= 0:
+        return repository
+    backend = get_cache_backend()
+    ttl = settings.user_cache_ttl_seconds
+    if isinstance(backend, InMemoryCacheBackend):
+        # Writes only invalidate this process's copy; other workers keep
+        # serving theirs until it expires.
+        ttl = min(ttl, settings.user_cache_local_ttl_seconds)
+        if ttl <= 0:
+            return repository
+    return CachedAuthRepository(
+        repository=repository,
+        backend=backend,
+        ttl=ttl,
+        negative_ttl=min(settings.user_cache_negative_ttl_seconds, ttl),
+    )
+
+
+async def get_permission_repository(
+    db: AsyncSession = Depends(get_db),
+) -> PermissionProtocol:
+    return SqlAlchemyPermissionRepository(session=db)
 
 
-async def get_auth_repository(db: Session = Depends(get_db)) -> AuthProtocol:
-    return SqlAlchemyAuthRepository(session=db)
+async def get_refresh_token_repository(
+    db: AsyncSession = Depends(get_db),
+) -> RefreshTokenProtocol:
+    return SqlAlchemyRefreshTokenRepository(session=db)
@@ -0,0 +1,21 @@
+from app.repositories.product.protocols import (
+    CrawlCompletion,
+    CrawlLease,
+    CrawlScheduleProtocol,
+    PriceObservation,
+    ProductFilter,
+    ProductListing,
+    ProductProtocol,
+)
+from app.repositories.product.repositories import get_product_repository
+
+__all__ = [
+    "CrawlCompletion",
+    "CrawlLease",
+    "CrawlScheduleProtocol",
+    "PriceObservation",
+    "ProductFilter",
+    "ProductListing",
+    "ProductProtocol",
+    "get_product_repository",
+]
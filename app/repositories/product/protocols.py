@@ -0,0 +1,216 @@
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Protocol
+
+from app.models.product import (
+    PricePoint,
+    PriceRollupMixin,
+    Product,
+    ProductSource,
+)
+
+
+@dataclass(slots=True)
+class PriceObservation:
+    product_id: int
+    source_id: int
+    price: Decimal
+    currency: str
+    in_stock: bool | None = None
+    observed_at: datetime = field(
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+
+
+@dataclass(slots=True)
+class CrawlLease:
+    schedule_id: int
+    source_id: int
+    product_id: int
+    url: str
+    domain: str
+    due_at: datetime
+    interval_seconds: int
+    watchers: int
+    failures: int
+
+
+@dataclass(slots=True)
+class CrawlCompletion:
+    schedule_id: int
+    next_run_at: datetime
+    interval_seconds: int
+    success: bool
+    changed: bool
+    failures: int
+    finished_at: datetime
+
+
+@dataclass(slots=True)
+class ProductFilter:
+    # Words to match, each as a prefix, against name and brand.
+    q: str | None = None
+    min_price: Decimal | None = None
+    max_price: Decimal | None = None
+    currency: str | None = None
+    # Only products with an active source on this domain.
+    retailer: str | None = None
+    min_drop_pct: Decimal | None = None
+    in_stock: bool | None = None
+
+
+@dataclass(slots=True)
+class ProductListing:
+    id: int
+    name: str
+    brand: str | None
+    image_url: str | None
+    lowest_price: Decimal | None
+    currency: str | None
+    in_stock: bool | None
+    reference_price: Decimal | None
+    drop_pct: Decimal | None
+
+
+class ProductProtocol(Protocol):
+    async def get_by_id(self, product_id: int) -> Product | None:
+        """Retrieve a product by its ID from the database."""
+        raise NotImplementedError
+
+    async def create(self, product: Product) -> Product:
+        """Create a new product in the database."""
+        raise NotImplementedError
+
+    async def list_products(
+        self,
+        filters: ProductFilter,
+        sort: str,
+        after: tuple[Any, int] | None,
+        limit: int,
+    ) -> list[ProductListing]:
+        """
+        List active products matching ``filters`` in ``sort`` order,
+        starting after the ``(sort value, id)`` of the last product of the
+        previous page.
+        """
+        raise NotImplementedError
+
+    async def add_source(self, source: ProductSource) -> ProductSource:
+        """Attach a new source page to a product."""
+        raise NotImplementedError
+
+    async def get_sources(self, product_id: int) -> list[ProductSource]:
+        """Retrieve the active sources of a product."""
+        raise NotImplementedError
+
+    async def record_prices(
+        self, observations: list[PriceObservation], commit: bool = True
+    ) -> int:
+        """
+        Append many price observations in one round trip, merge them into
+        the daily and weekly rollups and refresh the current prices of
+        their sources and products. Returns the number of rows written.
+        With ``commit=False`` the writes stay in the session's transaction
+        for the caller to commit along with its own.
+        """
+        raise NotImplementedError
+
+    async def get_latest_prices(
+        self, since: datetime
+    ) -> list[PriceObservation]:
+        """
+        Retrieve the most recent price point of every source that has one
+        observed at or after ``since``.
+        """
+        raise NotImplementedError
+
+    async def touch_sources(self, seen: dict[int, datetime]) -> int:
+        """
+        Set ``last_seen_at`` for many sources, given as a mapping of source
+        id to time seen. Returns the number of sources updated.
+        """
+        raise NotImplementedError
+
+    async def get_price_history(
+        self,
+        product_id: int,
+        since: datetime,
+        until: datetime | None = None,
+    ) -> list[PricePoint]:
+        """Retrieve a product's price points in a time range, oldest first."""
+        raise NotImplementedError
+
+    async def get_price_rollups(
+        self,
+        product_id: int,
+        currency: str,
+        resolution: str,
+        since: date,
+        until: date | None = None,
+    ) -> list[PriceRollupMixin]:
+        """
+        Retrieve a product's ``"day"`` or ``"week"`` price rollups in one
+        currency for buckets in a date range, oldest first.
+        """
+        raise NotImplementedError
+
+    async def ensure_partitions(self, start: date, months: int) -> list[str]:
+        """
+        Create the monthly ``price_points`` partitions for ``months``
+        months from ``start`` if they do not exist yet. Returns the names
+        of the partitions created.
+        """
+        raise NotImplementedError
+
+    async def count_default_partition_rows(self) -> int:
+        """
+        Count the rows in the default ``price_points`` partition, which
+        should stay empty: rows there block creating their month.
+        """
+        raise NotImplementedError
+
+
+class CrawlScheduleProtocol(Protocol):
+    async def ensure_schedules(self, interval_seconds: int) -> int:
+        """
+        Create a schedule, due now, for every active source that has none.
+        Returns the number of schedules created.
+        """
+        raise NotImplementedError
+
+    async def lease_due(
+        self,
+        owner: str,
+        horizon: datetime,
+        limit: int,
+        lease_seconds: int,
+    ) -> list[CrawlLease]:
+        """
+        Lease up to ``limit`` schedules due by ``horizon``, earliest first,
+        skipping rows other workers hold locked.
+        """
+        raise NotImplementedError
+
+    async def complete(
+        self, owner: str, completions: list[CrawlCompletion]
+    ) -> int:
+        """
+        Record crawl results and reschedule, for leases still held by
+        ``owner``. Returns the number of schedules updated.
+        """
+        raise NotImplementedError
+
+    async def release(self, owner: str, leases: list[CrawlLease]) -> int:
+        """
+        Give back leases that were never run so they are due again at
+        their original time. Returns the number of schedules released.
+        """
+        raise NotImplementedError
+
+    async def get_backlog(self) -> tuple[int, datetime | None]:
+        """
+        Return the number of schedules that are due and not leased, and
+        the oldest due time among them.
+        """
+        raise NotImplementedError
@@ -0,0 +1,1000 @@
+import re
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any
+
+from fastapi import Depends
+from sqlalchemy import (
+    Boolean,
+    Date,
+    String,
+    bindparam,
+    case,
+    exists,
+    func,
+    literal,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, NUMERIC, TIMESTAMP
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.base import get_db
+from app.models.product import (
+    CrawlSchedule,
+    DailyPrice,
+    PricePoint,
+    PriceRollupMixin,
+    Product,
+    ProductSource,
+    WeeklyPrice,
+    price_partition_name,
+)
+from app.repositories.product.protocols import (
+    CrawlCompletion,
+    CrawlLease,
+    CrawlScheduleProtocol,
+    PriceObservation,
+    ProductFilter,
+    ProductListing,
+    ProductProtocol,
+)
+
+PRICE_POINT_COPY_COLUMNS = (
+    "product_id",
+    "source_id",
+    "price",
+    "currency",
+    "in_stock",
+    "observed_at",
+)
+
+# Rollup tables by resolution name.
+PRICE_ROLLUPS: dict[str, type[PriceRollupMixin]] = {
+    "day": DailyPrice,
+    "week": WeeklyPrice,
+}
+ROLLUP_COLUMNS = (
+    "product_id",
+    "currency",
+    "bucket",
+    "min_price",
+    "max_price",
+    "price_sum",
+    "price_count",
+    "last_price",
+    "last_observed_at",
+)
+
+# A product's drop percentage is measured against its highest daily price
+# over this many days.
+REFERENCE_DAYS = 30
+
+# Listing orders: the sort column and whether it descends. Ties, and the
+# "newest" order itself, are broken by id in the same direction.
+PRODUCT_SORTS: dict[str, tuple[Any, bool]] = {
+    "newest": (Product.id, True),
+    "price": (Product.lowest_price, False),
+    "-price": (Product.lowest_price, True),
+    "drop": (Product.drop_pct, True),
+}
+LISTING_COLUMNS = (
+    Product.id,
+    Product.name,
+    Product.brand,
+    Product.image_url,
+    Product.lowest_price,
+    Product.currency,
+    Product.in_stock,
+    Product.reference_price,
+    Product.drop_pct,
+)
+SEARCH_TERMS = 8
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _utc_day(moment: datetime) -> date:
+    return moment.astimezone(timezone.utc).date()
+
+
+def _week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def _prefix_query(q: str) -> str | None:
+    # Words only, so user input cannot inject tsquery operators.
+    words = re.findall(r"\w+", q.lower())[:SEARCH_TERMS]
+    return " & ".join(f"{word}:*" for word in words) or None
+
+
+@dataclass(slots=True)
+class _Bucket:
+    min_price: Decimal
+    max_price: Decimal
+    price_sum: Decimal
+    price_count: int
+    last_price: Decimal
+    last_observed_at: datetime
+
+    @classmethod
+    def of(cls, price: Decimal, observed_at: datetime) -> "_Bucket":
+        return cls(price, price, price, 1, price, observed_at)
+
+    def merge(self, other: "_Bucket") -> None:
+        self.min_price = min(self.min_price, other.min_price)
+        self.max_price = max(self.max_price, other.max_price)
+        self.price_sum += other.price_sum
+        self.price_count += other.price_count
+        if other.last_observed_at >= self.last_observed_at:
+            self.last_price = other.last_price
+            self.last_observed_at = other.last_observed_at
+
+
+class SqlAlchemyProductRepository(ProductProtocol):
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_by_id(self, product_id: int) -> Product | None:
+        """
+        Retrieve an active product by its ID.
+
+        Args:
+            product_id (int): The unique identifier of the product.
+
+        Returns:
+            Product | None: The Product if found and active, otherwise None.
+        """
+        result = await self.session.execute(
+            select(Product)
+            .where(
+                Product.id == product_id,
+                Product.is_active == True,  # noqa: E712
+            )
+            .limit(1)
+        )
+        return result.scalars().first()
+
+    async def create(self, product: Product) -> Product:
+        """
+        Creates a new product.
+
+        Args:
+            product (Product): The product instance to persist.
+
+        Returns:
+            Product: The created product with its generated ID.
+        """
+        self.session.add(product)
+        await self.session.commit()
+        return product
+
+    async def list_products(
+        self,
+        filters: ProductFilter,
+        sort: str,
+        after: tuple[Any, int] | None,
+        limit: int,
+    ) -> list[ProductListing]:
+        """
+        Lists products with keyset pagination: the page starts after the
+        ``(sort value, id)`` of the previous one, so each page costs an
+        index range scan of ``limit`` rows however deep it is, unlike
+        ``OFFSET``. Only the listing columns are selected.
+
+        The price and drop orders leave out products without a price or
+        drop. ``q`` is matched word by word, as prefixes, against the
+        GIN-indexed ``search_vector``.
+
+        Args:
+            filters (ProductFilter): Conditions the products must meet.
+            sort (str): A key of ``PRODUCT_SORTS``.
+            after (tuple[Any, int] | None): Sort value and id of the last
+                product of the previous page; None for the first page.
+            limit (int): Maximum number of products to return.
+
+        Returns:
+            list[ProductListing]: The page of products, in order.
+        """
+        column, descending = PRODUCT_SORTS[sort]
+        query = select(*LISTING_COLUMNS).where(
+            Product.is_active == True  # noqa: E712
+        )
+        if column is not Product.id:
+            query = query.where(column.isnot(None))
+        if filters.q:
+            terms = _prefix_query(filters.q)
+            if terms is not None:
+                query = query.where(
+                    Product.search_vector.bool_op("@@")(
+                        func.to_tsquery("simple", terms)
+                    )
+                )
+        if filters.min_price is not None:
+            query = query.where(Product.lowest_price >= filters.min_price)
+        if filters.max_price is not None:
+            query = query.where(Product.lowest_price <= filters.max_price)
+        if filters.currency is not None:
+            query = query.where(Product.currency == filters.currency)
+        if filters.min_drop_pct is not None:
+            query = query.where(Product.drop_pct >= filters.min_drop_pct)
+        if filters.in_stock is not None:
+            query = query.where(Product.in_stock == filters.in_stock)
+        if filters.retailer:
+            domain = filters.retailer.lower().removeprefix("www.")
+            query = query.where(
+                exists().where(
+                    ProductSource.domain.in_([domain, f"www.{domain}"]),
+                    ProductSource.product_id == Product.id,
+                    ProductSource.is_active == True,  # noqa: E712
+                )
+            )
+
+        if column is Product.id:
+            order = [Product.id.desc() if descending else Product.id]
+            if after is not None:
+                last_id = after[1]
+                query = query.where(
+                    Product.id < last_id
+                    if descending
+                    else Product.id > last_id
+                )
+        else:
+            order = (
+                [column.desc(), Product.id.desc()]
+                if descending
+                else [column, Product.id]
+            )
+            if after is not None:
+                key, last = tuple_(column, Product.id), tuple_(*after)
+                query = query.where(key < last if descending else key > last)
+        result = await self.session.execute(
+            query.order_by(*order).limit(limit)
+        )
+        return [ProductListing(*row) for row in result.all()]
+
+    async def add_source(self, source: ProductSource) -> ProductSource:
+        """
+        Attaches a source page to a product.
+
+        Args:
+            source (ProductSource): The source to persist.
+
+        Returns:
+            ProductSource: The created source with its generated ID.
+        """
+        self.session.add(source)
+        await self.session.commit()
+        return source
+
+    async def get_sources(self, product_id: int) -> list[ProductSource]:
+        """
+        Retrieves the active sources of a product.
+
+        Args:
+            product_id (int): The product whose sources to load.
+
+        Returns:
+            list[ProductSource]: The product's active sources.
+        """
+        result = await self.session.execute(
+            select(ProductSource).where(
+                ProductSource.product_id == product_id,
+                ProductSource.is_active == True,  # noqa: E712
+            )
+        )
+        return list(result.scalars().all())
+
+    async def record_prices(
+        self, observations: list[PriceObservation], commit: bool = True
+    ) -> int:
+        """
+        Appends price observations with a single ``COPY ... FROM STDIN``
+        on the session's connection, inside the session's transaction.
+        Postgres routes each row to its monthly partition. The daily and
+        weekly rollups, and the current prices the product listing sorts
+        and filters on, are updated in the same transaction, so they never
+        miss or double-count a point.
+
+        Args:
+            observations (list[PriceObservation]): The prices to store.
+            commit (bool): Commit the transaction; pass False to leave the
+                writes for the caller to commit with its own.
+
+        Returns:
+            int: The number of rows written.
+        """
+        if not observations:
+            return 0
+        connection = await self.session.connection()
+        raw = await connection.get_raw_connection()
+        columns = ", ".join(PRICE_POINT_COPY_COLUMNS)
+        async with raw.driver_connection.cursor() as cursor:
+            async with cursor.copy(
+                f"COPY {PricePoint.__tablename__} ({columns}) FROM STDIN"
+            ) as copy:
+                for observation in observations:
+                    await copy.write_row(
+                        (
+                            observation.product_id,
+                            observation.source_id,
+                            observation.price,
+                            observation.currency,
+                            observation.in_stock,
+                            observation.observed_at,
+                        )
+                    )
+        await self._roll_up(observations)
+        await self._refresh_current_prices(observations)
+        if commit:
+            await self.session.commit()
+        return len(observations)
+
+    async def _refresh_current_prices(
+        self, observations: list[PriceObservation]
+    ) -> None:
+        latest: dict[int, PriceObservation] = {}
+        for observation in observations:
+            current = latest.get(observation.source_id)
+            if (
+                current is None
+                or observation.observed_at >= current.observed_at
+            ):
+                latest[observation.source_id] = observation
+        source_ids = sorted(latest)
+        rows = [latest[source_id] for source_id in source_ids]
+        batch = (
+            func.unnest(
+                bindparam(
+                    "source_ids",
+                    source_ids,
+                    type_=ARRAY(ProductSource.id.type),
+                ),
+                bindparam(
+                    "prices",
+                    [row.price for row in rows],
+                    type_=ARRAY(NUMERIC(12, 2)),
+                ),
+                bindparam(
+                    "currencies",
+                    [row.currency for row in rows],
+                    type_=ARRAY(String),
+                ),
+                bindparam(
+                    "in_stock",
+                    [row.in_stock for row in rows],
+                    type_=ARRAY(Boolean),
+                ),
+                bindparam(
+                    "observed_ats",
+                    [row.observed_at for row in rows],
+                    type_=ARRAY(TIMESTAMP(timezone=True)),
+                ),
+            )
+            .table_valued("id", "price", "currency", "in_stock", "observed_at")
+            .render_derived(name="latest")
+        )
+        # Batches may arrive out of order; an older price never wins.
+        await self.session.execute(
+            update(ProductSource)
+            .where(
+                ProductSource.id == batch.c.id,
+                func.coalesce(ProductSource.last_price_at, batch.c.observed_at)
+                <= batch.c.observed_at,
+            )
+            .values(
+                last_price=batch.c.price,
+                currency=batch.c.currency,
+                in_stock=batch.c.in_stock,
+                last_price_at=batch.c.observed_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        product_ids = sorted({row.product_id for row in rows})
+        # Locked in id order, so concurrent writers cannot deadlock.
+        locked = (
+            select(Product.id)
+            .where(Product.id.in_(product_ids))
+            .order_by(Product.id)
+            .with_for_update()
+            .cte("locked")
+        )
+        since = _utc_day(datetime.now(timezone.utc)) - timedelta(
+            days=REFERENCE_DAYS
+        )
+        reference = (
+            select(func.max(DailyPrice.max_price))
+            .where(
+                DailyPrice.product_id == ProductSource.product_id,
+                DailyPrice.currency == ProductSource.currency,
+                DailyPrice.bucket >= since,
+            )
+            .scalar_subquery()
+        )
+        # Per product: the cheapest in-stock source, else the cheapest.
+        best = (
+            select(
+                ProductSource.product_id,
+                ProductSource.last_price,
+                ProductSource.currency,
+                ProductSource.in_stock,
+                reference.label("reference_price"),
+            )
+            .where(
+                ProductSource.product_id.in_(product_ids),
+                ProductSource.is_active == True,  # noqa: E712
+                ProductSource.last_price.isnot(None),
+            )
+            .distinct(ProductSource.product_id)
+            .order_by(
+                ProductSource.product_id,
+                ProductSource.in_stock.isnot(True),
+                ProductSource.last_price,
+            )
+            .subquery("best")
+        )
+        drop = func.round(
+            (best.c.reference_price - best.c.last_price)
+            * 100
+            / func.nullif(best.c.reference_price, 0),
+            2,
+        )
+        await self.session.execute(
+            update(Product)
+            .where(
+                Product.id == locked.c.id,
+                Product.id == best.c.product_id,
+            )
+            .values(
+                lowest_price=best.c.last_price,
+                currency=best.c.currency,
+                in_stock=best.c.in_stock,
+                reference_price=best.c.reference_price,
+                drop_pct=func.greatest(drop, 0),
+                price_updated_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    async def _roll_up(self, observations: list[PriceObservation]) -> None:
+        daily: dict[tuple[int, str, date], _Bucket] = {}
+        for observation in observations:
+            key = (
+                observation.product_id,
+                observation.currency,
+                _utc_day(observation.observed_at),
+            )
+            bucket = _Bucket.of(observation.price, observation.observed_at)
+            if key in daily:
+                daily[key].merge(bucket)
+            else:
+                daily[key] = bucket
+        weekly: dict[tuple[int, str, date], _Bucket] = {}
+        for (product_id, currency, day), bucket in daily.items():
+            key = (product_id, currency, _week_start(day))
+            if key in weekly:
+                weekly[key].merge(bucket)
+            else:
+                weekly[key] = replace(bucket)
+        await self._merge_rollup(DailyPrice, daily)
+        await self._merge_rollup(WeeklyPrice, weekly)
+
+    async def _merge_rollup(
+        self,
+        model: type[PriceRollupMixin],
+        buckets: dict[tuple[int, str, date], _Bucket],
+    ) -> None:
+        # Key order is lock order: concurrent writers cannot deadlock.
+        keys = sorted(buckets)
+        values = [buckets[key] for key in keys]
+        price = ARRAY(NUMERIC(12, 2))
+        rows = (
+            func.unnest(
+                bindparam(
+                    "product_ids",
+                    [key[0] for key in keys],
+                    type_=ARRAY(model.product_id.type),
+                ),
+                bindparam(
+                    "currencies", [key[1] for key in keys], type_=ARRAY(String)
+                ),
+                bindparam(
+                    "buckets", [key[2] for key in keys], type_=ARRAY(Date)
+                ),
+                bindparam(
+                    "min_prices", [v.min_price for v in values], type_=price
+                ),
+                bindparam(
+                    "max_prices", [v.max_price for v in values], type_=price
+                ),
+                bindparam(
+                    "price_sums",
+                    [v.price_sum for v in values],
+                    type_=ARRAY(NUMERIC(18, 2)),
+                ),
+                bindparam(
+                    "price_counts",
+                    [v.price_count for v in values],
+                    type_=ARRAY(model.price_count.type),
+                ),
+                bindparam(
+                    "last_prices", [v.last_price for v in values], type_=price
+                ),
+                bindparam(
+                    "last_observed_ats",
+                    [v.last_observed_at for v in values],
+                    type_=ARRAY(TIMESTAMP(timezone=True)),
+                ),
+            )
+            .table_valued(*ROLLUP_COLUMNS)
+            .render_derived(name="rollup")
+        )
+        statement = pg_insert(model).from_select(
+            list(ROLLUP_COLUMNS), select(*rows.c)
+        )
+        table, new = model.__table__.c, statement.excluded
+        await self.session.execute(
+            statement.on_conflict_do_update(
+                index_elements=["product_id", "currency", "bucket"],
+                set_={
+                    "min_price": func.least(table.min_price, new.min_price),
+                    "max_price": func.greatest(table.max_price, new.max_price),
+                    "price_sum": table.price_sum + new.price_sum,
+                    "price_count": table.price_count + new.price_count,
+                    "last_price": case(
+                        (
+                            new.last_observed_at >= table.last_observed_at,
+                            new.last_price,
+                        ),
+                        else_=table.last_price,
+                    ),
+                    "last_observed_at": func.greatest(
+                        table.last_observed_at, new.last_observed_at
+                    ),
+                },
+            )
+        )
+
+    async def get_price_rollups(
+        self,
+        product_id: int,
+        currency: str,
+        resolution: str,
+        since: date,
+        until: date | None = None,
+    ) -> list[PriceRollupMixin]:
+        """
+        Retrieves a product's daily or weekly price rollups in a range,
+        straight from the rollup table's primary key.
+
+        Args:
+            product_id (int): The product whose prices to load.
+            currency (str): Only rollups in this currency.
+            resolution (str): ``"day"`` or ``"week"``.
+            since (date): Inclusive lower bound on the bucket.
+            until (date | None): Exclusive upper bound, if any.
+
+        Returns:
+            list[PriceRollupMixin]: The rollups, oldest first.
+        """
+        model = PRICE_ROLLUPS[resolution]
+        query = select(model).where(
+            model.product_id == product_id,
+            model.currency == currency,
+            model.bucket >= since,
+        )
+        if until is not None:
+            query = query.where(model.bucket < until)
+        result = await self.session.execute(query.order_by(model.bucket))
+        return list(result.scalars().all())
+
+    async def get_latest_prices(
+        self, since: datetime
+    ) -> list[PriceObservation]:
+        """
+        Retrieves the latest price point per source with ``DISTINCT ON``.
+        Only partitions overlapping ``since`` onwards are scanned.
+
+        Args:
+            since (datetime): Ignore sources not observed since then.
+
+        Returns:
+            list[PriceObservation]: One observation per source.
+        """
+        result = await self.session.execute(
+            select(
+                PricePoint.product_id,
+                PricePoint.source_id,
+                PricePoint.price,
+                PricePoint.currency,
+                PricePoint.in_stock,
+                PricePoint.observed_at,
+            )
+            .where(PricePoint.observed_at >= since)
+            .distinct(PricePoint.source_id)
+            .order_by(PricePoint.source_id, PricePoint.observed_at.desc())
+        )
+        return [PriceObservation(*row) for row in result.all()]
+
+    async def touch_sources(self, seen: dict[int, datetime]) -> int:
+        """
+        Updates ``last_seen_at`` of many sources with one ``UPDATE ...
+        FROM unnest(...)`` statement. A source's ``last_seen_at`` never
+        moves backwards.
+
+        Args:
+            seen (dict[int, datetime]): Time each source was seen, by id.
+
+        Returns:
+            int: The number of sources updated.
+        """
+        if not seen:
+            return 0
+        batch = (
+            func.unnest(
+                bindparam(
+                    "ids",
+                    list(seen.keys()),
+                    type_=ARRAY(ProductSource.id.type),
+                ),
+                bindparam(
+                    "seen_at",
+                    list(seen.values()),
+                    type_=ARRAY(TIMESTAMP(timezone=True)),
+                ),
+            )
+            .table_valued("id", "seen_at")
+            .render_derived(name="seen")
+        )
+        result = await self.session.execute(
+            update(ProductSource)
+            .where(
+                ProductSource.id == batch.c.id,
+                func.coalesce(ProductSource.last_seen_at, batch.c.seen_at)
+                <= batch.c.seen_at,
+            )
+            .values(last_seen_at=batch.c.seen_at)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+        return result.rowcount
+
+    async def get_price_history(
+        self,
+        product_id: int,
+        since: datetime,
+        until: datetime | None = None,
+    ) -> list[PricePoint]:
+        """
+        Retrieves a product's price points in a time range. Served by the
+        ``(product_id, observed_at)`` index, and only the partitions
+        overlapping the range are scanned.
+
+        Args:
+            product_id (int): The product whose prices to load.
+            since (datetime): Inclusive lower bound on ``observed_at``.
+            until (datetime | None): Exclusive upper bound, if any.
+
+        Returns:
+            list[PricePoint]: The matching price points, oldest first.
+        """
+        query = select(PricePoint).where(
+            PricePoint.product_id == product_id,
+            PricePoint.observed_at >= since,
+        )
+        if until is not None:
+            query = query.where(PricePoint.observed_at < until)
+        result = await self.session.execute(
+            query.order_by(PricePoint.observed_at)
+        )
+        return list(result.scalars().all())
+
+    async def ensure_partitions(self, start: date, months: int) -> list[str]:
+        """
+        Creates missing monthly ``price_points`` partitions.
+
+        Partitions should be created ahead of the data: attaching a range
+        fails if the default partition already holds rows for it.
+
+        Args:
+            start (date): Any day in the first month to cover.
+            months (int): How many consecutive months to cover.
+
+        Returns:
+            list[str]: The names of the partitions that were created.
+        """
+        # Serialise creators (API and worker processes) on one lock, so
+        # none fails creating a partition another is creating.
+        await self.session.execute(
+            text("SELECT pg_advisory_xact_lock(hashtext(:name))"),
+            {"name": PricePoint.__tablename__},
+        )
+        first = start.replace(day=1)
+        wanted = {
+            price_partition_name(_add_months(first, offset)): _add_months(
+                first, offset
+            )
+            for offset in range(months)
+        }
+        result = await self.session.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "JOIN pg_class p ON p.oid = i.inhparent "
+                "WHERE p.relname = :parent"
+            ),
+            {"parent": PricePoint.__tablename__},
+        )
+        existing = set(result.scalars().all())
+
+        created = []
+        for name, month in wanted.items():
+            if name in existing:
+                continue
+            await self.session.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {name} "
+                    f"PARTITION OF {PricePoint.__tablename__} "
+                    f"FOR VALUES FROM ('{month.isoformat()} 00:00+00') "
+                    f"TO ('{_add_months(month, 1).isoformat()} 00:00+00')"
+                )
+            )
+            created.append(name)
+        await self.session.commit()
+        return created
+
+    async def count_default_partition_rows(self) -> int:
+        """
+        Counts the rows in ``price_points_default``.
+
+        Returns:
+            int: The row count; anything but 0 needs the rows moved out
+                before their month's partition can be created.
+        """
+        result = await self.session.execute(
+            text(f"SELECT count(*) FROM {PricePoint.__tablename__}_default")
+        )
+        return result.scalar_one()
+
+
+class SqlAlchemyCrawlScheduleRepository(CrawlScheduleProtocol):
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def ensure_schedules(self, interval_seconds: int) -> int:
+        """
+        Creates missing schedules with one ``INSERT ... SELECT``.
+
+        Args:
+            interval_seconds (int): Initial revisit interval.
+
+        Returns:
+            int: The number of schedules created.
+        """
+        result = await self.session.execute(
+            pg_insert(CrawlSchedule)
+            .from_select(
+                [
+                    "source_id",
+                    "next_run_at",
+                    "interval_seconds",
+                    "watchers",
+                    "consecutive_unchanged",
+                    "failures",
+                ],
+                select(
+                    ProductSource.id,
+                    func.now(),
+                    literal(interval_seconds),
+                    literal(0),
+                    literal(0),
+                    literal(0),
+                ).where(
+                    ProductSource.is_active == True  # noqa: E712
+                ),
+            )
+            .on_conflict_do_nothing(index_elements=["source_id"])
+            .returning(CrawlSchedule.id)
+        )
+        created = len(result.all())
+        await self.session.commit()
+        return created
+
+    async def lease_due(
+        self,
+        owner: str,
+        horizon: datetime,
+        limit: int,
+        lease_seconds: int,
+    ) -> list[CrawlLease]:
+        """
+        Leases due schedules in one statement: a ``FOR UPDATE SKIP LOCKED``
+        CTE picks the rows, and the UPDATE pushes their ``next_run_at``
+        past the lease so they are invisible to other workers until the
+        lease is completed, released or expires.
+
+        Args:
+            owner (str): Identifier of the leasing worker.
+            horizon (datetime): Lease schedules due up to this time.
+            limit (int): Maximum number of schedules to lease.
+            lease_seconds (int): How long the lease lasts past the due time.
+
+        Returns:
+            list[CrawlLease]: The leased jobs, earliest due first.
+        """
+        due = (
+            select(CrawlSchedule.id, CrawlSchedule.next_run_at)
+            .join(ProductSource, ProductSource.id == CrawlSchedule.source_id)
+            .where(
+                CrawlSchedule.next_run_at <= horizon,
+                ProductSource.is_active == True,  # noqa: E712
+            )
+            .order_by(CrawlSchedule.next_run_at)
+            .limit(limit)
+            .with_for_update(of=CrawlSchedule, skip_locked=True)
+            .cte("due")
+        )
+        lease_until = func.greatest(due.c.next_run_at, func.now()) + timedelta(
+            seconds=lease_seconds
+        )
+        result = await self.session.execute(
+            update(CrawlSchedule)
+            .where(
+                CrawlSchedule.id == due.c.id,
+                ProductSource.id == CrawlSchedule.source_id,
+            )
+            .values(
+                next_run_at=lease_until,
+                leased_until=lease_until,
+                lease_owner=owner,
+            )
+            .returning(
+                CrawlSchedule.id,
+                CrawlSchedule.source_id,
+                ProductSource.product_id,
+                ProductSource.url,
+                ProductSource.domain,
+                due.c.next_run_at,
+                CrawlSchedule.interval_seconds,
+                CrawlSchedule.watchers,
+                CrawlSchedule.failures,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        leases = [CrawlLease(*row) for row in result.all()]
+        await self.session.commit()
+        return sorted(leases, key=lambda lease: lease.due_at)
+
+    async def complete(
+        self, owner: str, completions: list[CrawlCompletion]
+    ) -> int:
+        """
+        Reschedules completed crawls with a single executemany UPDATE.
+        Completions for leases that expired and were taken over by another
+        worker are ignored.
+
+        Args:
+            owner (str): Identifier of the worker that held the leases.
+            completions (list[CrawlCompletion]): Results to record.
+
+        Returns:
+            int: The number of schedules updated.
+        """
+        if not completions:
+            return 0
+        table = CrawlSchedule.__table__
+        changed = bindparam("b_changed")
+        finished_at = bindparam("b_finished_at")
+        result = await self.session.execute(
+            update(table)
+            .where(
+                table.c.id == bindparam("b_id"),
+                table.c.lease_owner == bindparam("b_owner"),
+            )
+            .values(
+                next_run_at=bindparam("b_next_run_at"),
+                interval_seconds=bindparam("b_interval_seconds"),
+                failures=bindparam("b_failures"),
+                last_run_at=finished_at,
+                last_changed_at=case(
+                    (changed, finished_at), else_=table.c.last_changed_at
+                ),
+                consecutive_unchanged=case(
+                    (changed, 0),
+                    (
+                        bindparam("b_success"),
+                        table.c.consecutive_unchanged + 1,
+                    ),
+                    else_=table.c.consecutive_unchanged,
+                ),
+                lease_owner=None,
+                leased_until=None,
+            ),
+            [
+                {
+                    "b_id": completion.schedule_id,
+                    "b_owner": owner,
+                    "b_next_run_at": completion.next_run_at,
+                    "b_interval_seconds": completion.interval_seconds,
+                    "b_failures": completion.failures,
+                    "b_finished_at": completion.finished_at,
+                    "b_changed": completion.changed,
+                    "b_success": completion.success,
+                }
+                for completion in completions
+            ],
+        )
+        await self.session.commit()
+        return result.rowcount
+
+    async def release(self, owner: str, leases: list[CrawlLease]) -> int:
+        """
+        Returns unrun leases, restoring their original due time.
+
+        Args:
+            owner (str): Identifier of the worker that held the leases.
+            leases (list[CrawlLease]): The leases to give back.
+
+        Returns:
+            int: The number of schedules released.
+        """
+        if not leases:
+            return 0
+        table = CrawlSchedule.__table__
+        result = await self.session.execute(
+            update(table)
+            .where(
+                table.c.id == bindparam("b_id"),
+                table.c.lease_owner == bindparam("b_owner"),
+            )
+            .values(
+                next_run_at=bindparam("b_due_at"),
+                lease_owner=None,
+                leased_until=None,
+            ),
+            [
+                {
+                    "b_id": lease.schedule_id,
+                    "b_owner": owner,
+                    "b_due_at": lease.due_at,
+                }
+                for lease in leases
+            ],
+        )
+        await self.session.commit()
+        return result.rowcount
+
+    async def get_backlog(self) -> tuple[int, datetime | None]:
+        """
+        Counts due, unleased schedules of active sources.
+
+        Returns:
+            tuple[int, datetime | None]: The backlog size and the oldest
+            due time in it.
+        """
+        result = await self.session.execute(
+            select(func.count(), func.min(CrawlSchedule.next_run_at))
+            .join(ProductSource, ProductSource.id == CrawlSchedule.source_id)
+            .where(
+                CrawlSchedule.next_run_at <= func.now(),
+                ProductSource.is_active == True,  # noqa: E712
+            )
+        )
+        count, oldest = result.one()
+        return count, oldest
+
+
+async def get_product_repository(
+    db: AsyncSession = Depends(get_db),
+) -> ProductProtocol:
+    return SqlAlchemyProductRepository(session=db)
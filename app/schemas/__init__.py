@@ -1,15 +1,37 @@
+from app.schemas.alert.schemas import (
+    CreatePriceAlertSchema,
+    PriceAlertSchema,
+)
 from app.schemas.auth.schemas import (
     CreateUserSchema,
     LoginSchema,
+    RefreshTokenRequestSchema,
     TokenDataSchema,
     TokenSchema,
+    UserImportReportSchema,
+    UserImportRowErrorSchema,
     UserSchema,
 )
+from app.schemas.product.schemas import (
+    ChartPointSchema,
+    PriceChartSchema,
+    ProductListItemSchema,
+    ProductPageSchema,
+)
 
 __all__ = [
     "CreateUserSchema",
     "LoginSchema",
     "UserSchema",
     "TokenSchema",
+    "RefreshTokenRequestSchema",
     "TokenDataSchema",
+    "UserImportReportSchema",
+    "UserImportRowErrorSchema",
+    "CreatePriceAlertSchema",
+    "PriceAlertSchema",
+    "ChartPointSchema",
+    "PriceChartSchema",
+    "ProductListItemSchema",
+    "ProductPageSchema",
 ]
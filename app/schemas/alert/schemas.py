@@ -0,0 +1,56 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Literal, Optional
+
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    HttpUrl,
+    field_validator,
+    model_validator,
+)
+
+from app.utils.network import check_public_url
+
+
+class CreatePriceAlertSchema(BaseModel):
+    """Schema for setting a target price on a product"""
+
+    product_id: int
+    target_price: Decimal = Field(gt=0, max_digits=12, decimal_places=2)
+    currency: str = Field(default="USD", pattern="^[A-Z]{3}$")
+    channel: Literal["email", "webhook"] = "email"
+    webhook_url: Optional[HttpUrl] = None
+
+    @field_validator("webhook_url")
+    @classmethod
+    def check_webhook_destination(
+        cls, webhook_url: Optional[HttpUrl]
+    ) -> Optional[HttpUrl]:
+        # Names are resolved and checked when the alert is saved.
+        if webhook_url is not None:
+            check_public_url(str(webhook_url))
+        return webhook_url
+
+    @model_validator(mode="after")
+    def check_webhook_url(self) -> "CreatePriceAlertSchema":
+        if self.channel == "webhook" and self.webhook_url is None:
+            raise ValueError("webhook_url is required for webhook alerts")
+        return self
+
+
+class PriceAlertSchema(BaseModel):
+    """Schema for price alert responses"""
+
+    id: int
+    product_id: int
+    target_price: Decimal
+    currency: str
+    channel: str
+    webhook_url: Optional[str] = None
+    notified_price: Optional[Decimal] = None
+    last_triggered_at: Optional[datetime] = None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
@@ -41,9 +41,33 @@ class TokenSchema(BaseModel):
 
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+
+
+class RefreshTokenRequestSchema(BaseModel):
+    """Schema for exchanging a refresh token"""
+
+    refresh_token: str
 
 
 class TokenDataSchema(BaseModel):
     """Schema for token data"""
 
     email: Optional[str] = None
+
+
+class UserImportRowErrorSchema(BaseModel):
+    """Schema for a row rejected by a bulk user import"""
+
+    line: int
+    email: Optional[str] = None
+    reason: str
+
+
+class UserImportReportSchema(BaseModel):
+    """Schema for the outcome of a bulk user import"""
+
+    total: int = 0
+    created: int = 0
+    conflicts: list[UserImportRowErrorSchema] = Field(default_factory=list)
+    invalid: list[UserImportRowErrorSchema] = Field(default_factory=list)
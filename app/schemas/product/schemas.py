@@ -0,0 +1,57 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Literal, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ChartPointSchema(BaseModel):
+    """One point of a price chart"""
+
+    at: datetime
+    price: Decimal
+    min_price: Decimal
+    max_price: Decimal
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PriceChartSchema(BaseModel):
+    """Schema for price chart responses"""
+
+    product_id: int
+    currency: str
+    resolution: Literal["raw", "day", "week"]
+    since: datetime
+    min_price: Optional[Decimal] = None
+    max_price: Optional[Decimal] = None
+    avg_price: Optional[Decimal] = None
+    last_price: Optional[Decimal] = None
+    points: list[ChartPointSchema]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProductListItemSchema(BaseModel):
+    """One product of a listing page"""
+
+    id: int
+    name: str
+    brand: Optional[str] = None
+    image_url: Optional[str] = None
+    lowest_price: Optional[Decimal] = None
+    currency: Optional[str] = None
+    in_stock: Optional[bool] = None
+    reference_price: Optional[Decimal] = None
+    drop_pct: Optional[Decimal] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProductPageSchema(BaseModel):
+    """Schema for product listing responses"""
+
+    items: list[ProductListItemSchema]
+    next_cursor: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,9 +1,141 @@
-from app.services.auth.service import AuthService, get_auth_service
-from app.services.user.service import UserService, get_user_service
+import importlib
+
+# Exported names by defining module. They are imported on first access, so
+# a process only loads the services it uses: the API, for one, never needs
+# the scraper's or the notification senders' HTTP clients.
+_EXPORTS: dict[str, tuple[str, ...]] = {
+    "app.services.alert.matcher": ("PriceAlertMatcher",),
+    "app.services.alert.service": (
+        "PriceAlertService",
+        "get_price_alert_service",
+    ),
+    "app.services.auth.audit": (
+        "LoginAttemptRecord",
+        "LoginAuditWriter",
+        "get_login_audit_writer",
+    ),
+    "app.services.auth.permissions": (
+        "PermissionResolver",
+        "get_permission_resolver",
+    ),
+    "app.services.auth.rate_limit": (
+        "InMemoryRateLimitBackend",
+        "LoginRateLimiter",
+        "RateLimitBackend",
+        "RedisRateLimitBackend",
+        "get_login_rate_limiter",
+    ),
+    "app.services.auth.refresh": (
+        "RefreshTokenPurger",
+        "RefreshTokenService",
+        "get_refresh_token_service",
+    ),
+    "app.services.auth.service": (
+        "AuthService",
+        "get_auth_service",
+    ),
+    "app.services.notification.dispatcher": (
+        "NotificationDispatcher",
+        "get_notification_dispatcher",
+    ),
+    "app.services.notification.senders": (
+        "DeliveryError",
+        "EmailSender",
+        "WebhookSender",
+    ),
+    "app.services.product.catalog": (
+        "ProductCatalogService",
+        "get_product_catalog_service",
+    ),
+    "app.services.product.charts": (
+        "PriceChartService",
+        "get_price_chart_service",
+    ),
+    "app.services.product.ingestion": (
+        "PriceIngestionReport",
+        "PriceIngestionService",
+        "get_price_ingestion_service",
+    ),
+    "app.services.product.scheduler": (
+        "CrawlScheduler",
+        "get_crawl_scheduler",
+    ),
+    "app.services.scraper": (
+        "AdapterRegistry",
+        "DomainThrottle",
+        "FetchResult",
+        "ScraperService",
+        "SiteAdapter",
+        "get_adapter_registry",
+        "get_scraper_service",
+    ),
+    "app.services.user.importer": (
+        "UserImportFormat",
+        "UserImportService",
+        "get_user_import_service",
+    ),
+    "app.services.user.service": (
+        "UserService",
+        "get_user_service",
+    ),
+}
+_MODULES = {
+    name: module for module, names in _EXPORTS.items() for name in names
+}
+
+
+def __getattr__(name: str):
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "AuthService",
     "UserService",
     "get_user_service",
     "get_auth_service",
+    "PermissionResolver",
+    "LoginAttemptRecord",
+    "LoginAuditWriter",
+    "get_login_audit_writer",
+    "RateLimitBackend",
+    "InMemoryRateLimitBackend",
+    "RedisRateLimitBackend",
+    "LoginRateLimiter",
+    "get_login_rate_limiter",
+    "get_permission_resolver",
+    "RefreshTokenService",
+    "RefreshTokenPurger",
+    "get_refresh_token_service",
+    "UserImportFormat",
+    "UserImportService",
+    "get_user_import_service",
+    "DomainThrottle",
+    "FetchResult",
+    "ScraperService",
+    "get_scraper_service",
+    "AdapterRegistry",
+    "SiteAdapter",
+    "get_adapter_registry",
+    "PriceIngestionReport",
+    "PriceIngestionService",
+    "get_price_ingestion_service",
+    "CrawlScheduler",
+    "get_crawl_scheduler",
+    "ProductCatalogService",
+    "get_product_catalog_service",
+    "PriceChartService",
+    "get_price_chart_service",
+    "PriceAlertMatcher",
+    "PriceAlertService",
+    "get_price_alert_service",
+    "NotificationDispatcher",
+    "get_notification_dispatcher",
+    "DeliveryError",
+    "EmailSender",
+    "WebhookSender",
 ]
@@ -0,0 +1,41 @@
+from decimal import Decimal
+
+from app.repositories.alert import AlertProtocol, TriggeredAlert
+from app.repositories.product import PriceObservation
+
+
+class PriceAlertMatcher:
+    """
+    Fires price alerts for a batch of newly written prices.
+
+    The batch is reduced to the lowest in-stock price per product and
+    currency, so a product seen on several sources costs one index probe,
+    and the repository matches that against the alerts' target prices.
+    Out-of-stock observations neither fire nor re-arm alerts.
+    Notifications of fired alerts become due after ``delay_seconds``, the
+    dispatcher's digest window.
+    """
+
+    def __init__(self, alert_repo: AlertProtocol, delay_seconds: int = 0):
+        self.alert_repo = alert_repo
+        self.delay_seconds = delay_seconds
+
+    @staticmethod
+    def lowest_prices(
+        observations: list[PriceObservation],
+    ) -> dict[tuple[int, str], Decimal]:
+        lowest: dict[tuple[int, str], Decimal] = {}
+        for observation in observations:
+            if observation.in_stock is False:
+                continue
+            key = (observation.product_id, observation.currency)
+            if key not in lowest or observation.price < lowest[key]:
+                lowest[key] = observation.price
+        return lowest
+
+    async def match(
+        self, observations: list[PriceObservation]
+    ) -> list[TriggeredAlert]:
+        return await self.alert_repo.match_prices(
+            self.lowest_prices(observations), self.delay_seconds
+        )
@@ -0,0 +1,67 @@
+from fastapi import Depends
+
+from app.core.exceptions import (
+    PriceAlertNotFoundException,
+    ProductNotFoundException,
+    UnsafeURLException,
+)
+from app.models.alert import PriceAlert
+from app.repositories.alert import AlertProtocol, get_alert_repository
+from app.repositories.product import ProductProtocol, get_product_repository
+from app.schemas import CreatePriceAlertSchema
+from app.utils.network import resolve_public_url
+
+
+class PriceAlertService:
+    """
+    Manages users' price alerts. Every change recounts the product's
+    watchers so the crawl scheduler revisits watched products sooner.
+    """
+
+    def __init__(
+        self, alert_repo: AlertProtocol, product_repo: ProductProtocol
+    ):
+        self.alert_repo = alert_repo
+        self.product_repo = product_repo
+
+    async def get_alerts(self, user_id: int) -> list[PriceAlert]:
+        return await self.alert_repo.get_for_user(user_id)
+
+    async def set_alert(
+        self, user_id: int, alert_data: CreatePriceAlertSchema
+    ) -> PriceAlert:
+        if await self.product_repo.get_by_id(alert_data.product_id) is None:
+            raise ProductNotFoundException(alert_data.product_id)
+        webhook_url = (
+            str(alert_data.webhook_url) if alert_data.webhook_url else None
+        )
+        if webhook_url is not None:
+            try:
+                await resolve_public_url(webhook_url)
+            except OSError as e:
+                raise UnsafeURLException(webhook_url, str(e)) from e
+        alert = await self.alert_repo.upsert(
+            PriceAlert(
+                user_id=user_id,
+                product_id=alert_data.product_id,
+                target_price=alert_data.target_price,
+                currency=alert_data.currency,
+                channel=alert_data.channel,
+                webhook_url=webhook_url,
+            )
+        )
+        await self.alert_repo.refresh_watchers([alert.product_id])
+        return alert
+
+    async def delete_alert(self, user_id: int, alert_id: int) -> None:
+        alert = await self.alert_repo.delete(user_id, alert_id)
+        if alert is None:
+            raise PriceAlertNotFoundException(alert_id)
+        await self.alert_repo.refresh_watchers([alert.product_id])
+
+
+async def get_price_alert_service(
+    alert_repo: AlertProtocol = Depends(get_alert_repository),
+    product_repo: ProductProtocol = Depends(get_product_repository),
+) -> PriceAlertService:
+    return PriceAlertService(alert_repo=alert_repo, product_repo=product_repo)
@@ -0,0 +1,193 @@
+import asyncio
+import logging
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.db.base import SessionLocal, is_data_error
+from app.models.auth import LoginAttempt
+
+logger = logging.getLogger(__name__)
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+
+# LoginAttempt.failure_reason values
+INVALID_CREDENTIALS = "invalid_credentials"
+RATE_LIMITED = "rate_limited"
+
+_EMAIL_LENGTH = LoginAttempt.__table__.c.email.type.length
+_IP_ADDRESS_LENGTH = LoginAttempt.__table__.c.ip_address.type.length
+
+
+@dataclass
+class LoginAttemptRecord:
+    email: str
+    ip_address: str
+    user_agent: str | None = None
+    success: bool = False
+    failure_reason: str | None = None
+    attempted_at: datetime = field(
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+
+    def __post_init__(self) -> None:
+        # The email is whatever the client sent; cut it to fit the column.
+        self.email = self.email[:_EMAIL_LENGTH]
+        self.ip_address = self.ip_address[:_IP_ADDRESS_LENGTH]
+
+
+class LoginAuditWriter:
+    """
+    In-memory buffered sink for ``LoginAttempt`` rows.
+
+    ``record`` never blocks or touches the database: it appends to a bounded
+    buffer. A background task drains the buffer with one multi-row INSERT
+    whenever ``batch_size`` records are waiting or ``flush_interval``
+    seconds have passed, and ``stop`` performs a final flush on shutdown.
+    When the buffer is full, ``overflow_policy`` decides whether the oldest
+    buffered record or the new one is dropped.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        max_buffer: int,
+        batch_size: int,
+        flush_interval: float,
+        overflow_policy: str = DROP_OLDEST,
+    ):
+        if overflow_policy not in (DROP_OLDEST, DROP_NEWEST):
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        self.session_factory = session_factory
+        self.max_buffer = max_buffer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self._buffer: deque[LoginAttemptRecord] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+        self._flush_lock = asyncio.Lock()
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def record(self, attempt: LoginAttemptRecord) -> bool:
+        """Buffer an attempt; returns False if it was dropped."""
+        if len(self._buffer) >= self.max_buffer:
+            self.dropped += 1
+            if self.overflow_policy == DROP_NEWEST:
+                return False
+            self._buffer.popleft()
+        self._buffer.append(attempt)
+        self.recorded += 1
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            # Let the loop finish its current flush instead of cancelling
+            # it, so no popped batch is lost.
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+            self._stopping = False
+        await self._drain()
+
+    async def flush(self) -> int:
+        """
+        Write up to ``batch_size`` buffered attempts in one INSERT. If the
+        database refuses a row, the batch is retried row by row so only
+        the bad rows are lost.
+        """
+        async with self._flush_lock:
+            batch = [
+                self._buffer.popleft()
+                for _ in range(min(self.batch_size, len(self._buffer)))
+            ]
+            if not batch:
+                return 0
+            try:
+                await self._insert(batch)
+            except Exception as e:
+                if len(batch) > 1 and is_data_error(e):
+                    return await self._insert_each(batch)
+                self.failed += len(batch)
+                logger.error(
+                    f"Failed to write {len(batch)} login attempts: {e}"
+                )
+                return 0
+            self.written += len(batch)
+            return len(batch)
+
+    async def _insert(self, batch: list[LoginAttemptRecord]) -> None:
+        async with self.session_factory() as session:
+            await session.execute(
+                insert(LoginAttempt), [asdict(attempt) for attempt in batch]
+            )
+            await session.commit()
+
+    async def _insert_each(self, batch: list[LoginAttemptRecord]) -> int:
+        written = 0
+        for attempt in batch:
+            try:
+                await self._insert([attempt])
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Failed to write a login attempt: {e}")
+            else:
+                written += 1
+        self.written += written
+        return written
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=self.flush_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self._drain()
+
+    async def _drain(self) -> None:
+        while self._buffer:
+            if not await self.flush():
+                break
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "buffered": len(self._buffer),
+            "recorded": self.recorded,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+settings = get_settings()
+
+login_audit_writer = LoginAuditWriter(
+    session_factory=SessionLocal,
+    max_buffer=settings.login_audit_buffer_size,
+    batch_size=settings.login_audit_batch_size,
+    flush_interval=settings.login_audit_flush_interval_seconds,
+    overflow_policy=settings.login_audit_overflow_policy,
+)
+
+
+def get_login_audit_writer() -> LoginAuditWriter:
+    return login_audit_writer
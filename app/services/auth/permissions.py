@@ -0,0 +1,58 @@
+import time
+
+from fastapi import Depends
+
+from app.core.config import get_settings
+from app.repositories.auth import (
+    PermissionProtocol,
+    get_permission_repository,
+)
+from app.utils.cache import TTLCache
+
+settings = get_settings()
+
+
+class PermissionResolver:
+    """
+    Resolves a user's effective permission set, memoised per email.
+
+    The cache is shared by every resolver in the process, so after the
+    first lookup a permission check is a frozenset membership test that
+    never touches the database.
+    """
+
+    cache: TTLCache[str, frozenset[str]] = TTLCache(
+        max_size=settings.permission_cache_max_size
+    )
+
+    def __init__(self, permission_repo: PermissionProtocol):
+        self.permission_repo = permission_repo
+
+    async def get_permissions(self, email: str) -> frozenset[str]:
+        permissions = self.cache.get(email)
+        if permissions is None:
+            permissions = await self.permission_repo.get_permissions_for_email(
+                email
+            )
+            self.cache.set(
+                email,
+                permissions,
+                expires_at=time.time() + settings.permission_cache_ttl_seconds,
+            )
+        return permissions
+
+    @classmethod
+    def invalidate(cls, email: str) -> None:
+        """Forget a user's permissions, e.g. after their roles change."""
+        cls.cache.delete(email)
+
+    @classmethod
+    def invalidate_all(cls) -> None:
+        """Forget every cached permission set, e.g. after a role change."""
+        cls.cache.clear()
+
+
+async def get_permission_resolver(
+    permission_repo: PermissionProtocol = Depends(get_permission_repository),
+) -> PermissionResolver:
+    return PermissionResolver(permission_repo=permission_repo)
@@ -0,0 +1,290 @@
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Protocol
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.auth import LoginAttempt
+from app.services.auth.audit import INVALID_CREDENTIALS
+
+
+class RateLimitBackend(Protocol):
+    async def add(self, key: str, timestamp: float, window: int) -> None:
+        """Record an event for ``key`` at ``timestamp``."""
+        raise NotImplementedError
+
+    async def reserve(
+        self, key: str, member: str, timestamp: float, window: int, limit: int
+    ) -> float | None:
+        """
+        Atomically record an event ``member`` for ``key`` at ``timestamp``
+        if fewer than ``limit`` events fall within the last ``window``
+        seconds. Returns None if it was recorded, or else the timestamp of
+        the oldest event in the window.
+        """
+        raise NotImplementedError
+
+    async def release(self, key: str, member: str, timestamp: float) -> None:
+        """Remove an event recorded by ``reserve``."""
+        raise NotImplementedError
+
+    async def reset(self, key: str) -> None:
+        """Forget every event recorded for ``key``."""
+        raise NotImplementedError
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Per-process sliding-window log. The number of tracked keys is bounded
+    (least recently touched keys are dropped first) so address spraying
+    cannot grow memory without limit.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._events: OrderedDict[str, deque[float]] = OrderedDict()
+
+    async def add(self, key: str, timestamp: float, window: int) -> None:
+        events = self._events.get(key)
+        if events is None:
+            events = self._events[key] = deque()
+            while len(self._events) > self.max_keys:
+                self._events.popitem(last=False)
+        self._events.move_to_end(key)
+        events.append(timestamp)
+        self._prune(events, timestamp - window)
+
+    async def reserve(
+        self, key: str, member: str, timestamp: float, window: int, limit: int
+    ) -> float | None:
+        # Nothing in here suspends, so concurrent requests cannot
+        # interleave between the check and the insert.
+        events = self._events.get(key)
+        if events:
+            self._prune(events, timestamp - window)
+            if len(events) >= limit:
+                return events[0]
+        await self.add(key, timestamp, window)
+        return None
+
+    async def release(self, key: str, member: str, timestamp: float) -> None:
+        events = self._events.get(key)
+        if events is not None and timestamp in events:
+            events.remove(timestamp)
+
+    async def reset(self, key: str) -> None:
+        self._events.pop(key, None)
+
+    @staticmethod
+    def _prune(events: deque[float], since: float) -> None:
+        while events and events[0] <= since:
+            events.popleft()
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Shared sliding-window log kept in Redis sorted sets, for any client
+    exposing the ``redis.asyncio`` pipeline and ``eval`` API. Reservations
+    run as one Lua script, so the check and the insert are atomic across
+    processes.
+    """
+
+    RESERVE = """
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[2] - ARGV[3])
+    if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[4]) then
+        return redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')[2]
+    end
+    redis.call('ZADD', KEYS[1], ARGV[2], ARGV[1])
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+    return false
+    """
+
+    def __init__(self, client: Any, prefix: str = "upt:ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisRateLimitBackend":
+        try:
+            from redis.asyncio import Redis
+        except ImportError as e:  # pragma: no cover - optional dependency
+            raise RuntimeError(
+                "redis_url is set but the 'redis' package is not installed"
+            ) from e
+        return cls(Redis.from_url(url, decode_responses=True))
+
+    async def add(self, key: str, timestamp: float, window: int) -> None:
+        name = self.prefix + key
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.zadd(name, {f"{timestamp:.6f}:{uuid.uuid4().hex}": timestamp})
+            pipe.zremrangebyscore(name, "-inf", timestamp - window)
+            pipe.expire(name, window)
+            await pipe.execute()
+
+    async def reserve(
+        self, key: str, member: str, timestamp: float, window: int, limit: int
+    ) -> float | None:
+        oldest = await self.client.eval(
+            self.RESERVE,
+            1,
+            self.prefix + key,
+            member,
+            f"{timestamp:.6f}",
+            window,
+            limit,
+        )
+        return None if oldest is None else float(oldest)
+
+    async def release(self, key: str, member: str, timestamp: float) -> None:
+        await self.client.zrem(self.prefix + key, member)
+
+    async def reset(self, key: str) -> None:
+        await self.client.delete(self.prefix + key)
+
+
+@dataclass(slots=True)
+class LoginReservation:
+    """An attempt counted against the limits while it is verified."""
+
+    # Seconds until another attempt is allowed; 0 if this one was.
+    retry_after: int
+    timestamp: float = 0.0
+    member: str = ""
+    keys: list[str] = field(default_factory=list)
+
+
+class LoginRateLimiter:
+    """
+    Sliding-window limiter for failed logins, keyed by email and by client
+    IP. ``reserve`` runs before any user lookup or bcrypt work and counts
+    the attempt as a failure up front, so a burst of concurrent attempts
+    cannot all pass the check while their passwords are being verified.
+    The reservation is released if the attempt turns out not to fail; a
+    successful login also clears the email's window.
+    """
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        window_seconds: int,
+        max_per_email: int,
+        max_per_ip: int,
+    ):
+        self.backend = backend
+        self.window_seconds = window_seconds
+        self.max_per_email = max_per_email
+        self.max_per_ip = max_per_ip
+        self.rejected = 0
+
+    @staticmethod
+    def _email_key(email: str) -> str:
+        return f"email:{email.lower()}"
+
+    @staticmethod
+    def _ip_key(ip_address: str) -> str:
+        return f"ip:{ip_address}"
+
+    def _limits(self, email: str, ip_address: str) -> list[tuple[str, int]]:
+        limits = []
+        if self.max_per_email > 0:
+            limits.append((self._email_key(email), self.max_per_email))
+        if self.max_per_ip > 0:
+            limits.append((self._ip_key(ip_address), self.max_per_ip))
+        return limits
+
+    async def reserve(self, email: str, ip_address: str) -> LoginReservation:
+        """
+        Count an attempt against every limit, or none of them if any limit
+        is already reached, in which case ``retry_after`` says for how long.
+        """
+        now = time.time()
+        reservation = LoginReservation(
+            retry_after=0,
+            timestamp=now,
+            member=f"{now:.6f}:{uuid.uuid4().hex}",
+        )
+        for key, limit in self._limits(email, ip_address):
+            oldest = await self.backend.reserve(
+                key, reservation.member, now, self.window_seconds, limit
+            )
+            if oldest is not None:
+                await self.release(reservation)
+                self.rejected += 1
+                wait = max(oldest + self.window_seconds - now, 0)
+                return LoginReservation(retry_after=int(wait) + 1)
+            reservation.keys.append(key)
+        return reservation
+
+    async def release(self, reservation: LoginReservation) -> None:
+        """Take back an attempt that did not fail after all."""
+        for key in reservation.keys:
+            await self.backend.release(
+                key, reservation.member, reservation.timestamp
+            )
+        reservation.keys.clear()
+
+    async def record_failure(
+        self, email: str, ip_address: str, at: float | None = None
+    ) -> None:
+        at = time.time() if at is None else at
+        for key, _ in self._limits(email, ip_address):
+            await self.backend.add(key, at, self.window_seconds)
+
+    async def record_success(
+        self, email: str, reservation: LoginReservation
+    ) -> None:
+        await self.release(reservation)
+        await self.backend.reset(self._email_key(email))
+
+    async def seed(self, session: AsyncSession) -> int:
+        """
+        Replay recent failed ``LoginAttempt`` rows so limits survive a
+        restart of an in-process backend.
+        """
+        since = datetime.now(timezone.utc) - timedelta(
+            seconds=self.window_seconds
+        )
+        result = await session.execute(
+            select(
+                LoginAttempt.email,
+                LoginAttempt.ip_address,
+                LoginAttempt.attempted_at,
+            )
+            .where(
+                LoginAttempt.attempted_at >= since,
+                LoginAttempt.success == False,  # noqa: E712
+                LoginAttempt.failure_reason == INVALID_CREDENTIALS,
+            )
+            .order_by(LoginAttempt.attempted_at)
+        )
+        seeded = 0
+        for email, ip_address, attempted_at in result.all():
+            await self.record_failure(
+                email, ip_address, at=attempted_at.timestamp()
+            )
+            seeded += 1
+        return seeded
+
+
+@lru_cache()
+def get_login_rate_limiter() -> LoginRateLimiter:
+    settings = get_settings()
+    backend: RateLimitBackend
+    if settings.redis_url:
+        backend = RedisRateLimitBackend.from_url(settings.redis_url)
+    else:
+        backend = InMemoryRateLimitBackend(
+            max_keys=settings.login_rate_limit_max_keys
+        )
+    return LoginRateLimiter(
+        backend=backend,
+        window_seconds=settings.login_rate_limit_window_seconds,
+        max_per_email=settings.login_rate_limit_max_per_email,
+        max_per_ip=settings.login_rate_limit_max_per_ip,
+    )
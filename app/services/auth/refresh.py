@@ -0,0 +1,215 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.core.exceptions import (
+    InvalidRefreshTokenException,
+    RefreshTokenReuseException,
+)
+from app.db.base import SessionLocal
+from app.models.auth import RefreshToken
+from app.repositories.auth import (
+    RefreshTokenProtocol,
+    get_refresh_token_repository,
+)
+from app.repositories.auth.repositories import (
+    SqlAlchemyRefreshTokenRepository,
+)
+from app.utils.cache import TTLCache
+from app.utils.security import Security
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+class RefreshTokenService:
+    """
+    Issues and rotates opaque refresh tokens.
+
+    Only a SHA-256 digest of each token is stored. Every refresh revokes
+    the presented token and issues a new one; presenting a revoked token
+    again is treated as theft and revokes all of the user's tokens.
+
+    Digests of revoked tokens are kept in a process-wide set (bounded, and
+    each entry dropped once the token would have expired anyway) so reuse
+    is detected without a database round trip. The database remains the
+    source of truth for tokens revoked by other processes.
+    """
+
+    revoked: TTLCache[str, int] = TTLCache(
+        max_size=settings.refresh_token_revocation_cache_size
+    )
+
+    def __init__(self, refresh_repo: RefreshTokenProtocol):
+        self.refresh_repo = refresh_repo
+
+    async def issue(
+        self,
+        user_id: int,
+        ip_address: str | None = None,
+        user_agent: str | None = None,
+    ) -> str:
+        token, digest, expires_at = Security.create_refresh_token()
+        await self.refresh_repo.create(
+            RefreshToken(
+                user_id=user_id,
+                token=digest,
+                expires_at=expires_at,
+                ip_address=ip_address,
+                user_agent=user_agent,
+            )
+        )
+        return token
+
+    async def rotate(
+        self,
+        token: str,
+        ip_address: str | None = None,
+        user_agent: str | None = None,
+    ) -> tuple[int, str]:
+        """
+        Exchange a refresh token for a new one.
+
+        Returns:
+            tuple[int, str]: The owner's id and the new refresh token.
+
+        Raises:
+            RefreshTokenReuseException: If the token was already rotated.
+            InvalidRefreshTokenException: If the token is unknown or expired.
+        """
+        digest = Security.refresh_token_digest(token)
+        user_id = self.revoked.get(digest)
+        if user_id is not None:
+            await self._revoke_user(user_id)
+            raise RefreshTokenReuseException(user_id)
+
+        new_token, new_digest, expires_at = Security.create_refresh_token()
+        rotated = await self.refresh_repo.rotate(
+            digest,
+            RefreshToken(
+                token=new_digest,
+                expires_at=expires_at,
+                ip_address=ip_address,
+                user_agent=user_agent,
+            ),
+        )
+        if rotated is None:
+            existing = await self.refresh_repo.get_by_hash(digest)
+            if (
+                existing is not None
+                and existing.is_revoked
+                and existing.expires_at > datetime.now(timezone.utc)
+            ):
+                await self._revoke_user(existing.user_id)
+                raise RefreshTokenReuseException(existing.user_id)
+            raise InvalidRefreshTokenException()
+
+        user_id, old_expires_at = rotated
+        self.revoked.set(
+            digest, user_id, expires_at=old_expires_at.timestamp()
+        )
+        return user_id, new_token
+
+    async def revoke_all(self, user_id: int) -> int:
+        return await self._revoke_user(user_id)
+
+    async def _revoke_user(self, user_id: int) -> int:
+        revoked = await self.refresh_repo.revoke_all_for_user(user_id)
+        for digest, expires_at in revoked:
+            self.revoked.set(
+                digest, user_id, expires_at=expires_at.timestamp()
+            )
+        return len(revoked)
+
+    @classmethod
+    async def warm(cls, session: AsyncSession) -> int:
+        """
+        Load recently revoked, unexpired tokens into the revocation set so
+        reuse detection stays on the fast path after a restart.
+        """
+        rows = await SqlAlchemyRefreshTokenRepository(session).get_revoked(
+            limit=cls.revoked.max_size
+        )
+        for digest, user_id, expires_at in rows:
+            cls.revoked.set(digest, user_id, expires_at=expires_at.timestamp())
+        return len(rows)
+
+
+class RefreshTokenPurger:
+    """
+    Background task deleting expired refresh tokens every ``interval``
+    seconds, in batches of ``batch_size`` rows.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        interval: float,
+        batch_size: int,
+    ):
+        self.session_factory = session_factory
+        self.interval = interval
+        self.batch_size = batch_size
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+        self.purged = 0
+        self.failed_runs = 0
+
+    async def start(self) -> None:
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            # Let a running purge commit its current batch.
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+            self._stopping = False
+
+    async def purge(self) -> int:
+        try:
+            async with self.session_factory() as session:
+                purged = await SqlAlchemyRefreshTokenRepository(
+                    session
+                ).purge_expired(self.batch_size)
+        except Exception as e:
+            self.failed_runs += 1
+            logger.error(f"Failed to purge expired refresh tokens: {e}")
+            return 0
+        self.purged += purged
+        return purged
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            await self.purge()
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=self.interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"purged": self.purged, "failed_runs": self.failed_runs}
+
+
+refresh_token_purger = RefreshTokenPurger(
+    session_factory=SessionLocal,
+    interval=settings.refresh_token_purge_interval_seconds,
+    batch_size=settings.refresh_token_purge_batch_size,
+)
+
+
+def get_refresh_token_service(
+    refresh_repo: RefreshTokenProtocol = Depends(get_refresh_token_repository),
+) -> RefreshTokenService:
+    return RefreshTokenService(refresh_repo=refresh_repo)
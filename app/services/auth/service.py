@@ -1,6 +1,10 @@
 from fastapi import Depends
 
-from app.core.exceptions import EmailAlreadyExistsException
+from app.core.config import get_settings
+from app.core.exceptions import (
+    InvalidRefreshTokenException,
+    RefreshTokenReuseException,
+)
 from app.models.auth import User
 from app.schemas.auth.schemas import (
     CreateUserSchema,
@@ -8,38 +12,107 @@ from app.schemas.auth.schemas import (
     TokenDataSchema,
     TokenSchema,
 )
+from app.services.auth.permissions import (
+    PermissionResolver,
+    get_permission_resolver,
+)
+from app.services.auth.refresh import (
+    RefreshTokenService,
+    get_refresh_token_service,
+)
 from app.services.user.service import UserService, get_user_service
 from app.utils.security import Security
 
+settings = get_settings()
+
 
 class AuthService:
-    def __init__(self, user_service: UserService):
+    def __init__(
+        self,
+        user_service: UserService,
+        permission_resolver: PermissionResolver,
+        refresh_service: RefreshTokenService,
+    ):
         self.user_service = user_service
+        self.permission_resolver = permission_resolver
+        self.refresh_service = refresh_service
 
     async def register_user(self, user_data: CreateUserSchema) -> User:
-        existing_user = await self.user_service.get_user_by_email(
-            email=user_data.email
-        )
-        if existing_user:
-            raise EmailAlreadyExistsException(email=user_data.email)
+        # Duplicates are rejected by the users.email unique index, which
+        # the repository maps to EmailAlreadyExistsException.
         return await self.user_service.create_user(user=user_data)
 
     async def authenticate_user(self, user_data: LoginSchema) -> User | None:
-        user = await self.user_service.get_user_by_email(email=user_data.email)
+        user = await self.user_service.get_user_for_login(
+            email=user_data.email
+        )
         if (
             user
             and user.hashed_password is not None
-            and Security.verify_password(
+            and await Security.verify_password_async(
                 user_data.password, user.hashed_password
             )
         ):
             return user
         return None
 
-    async def create_token(self, user: User) -> TokenSchema:
-        token_data = {"sub": user.email}
-        access_token = Security.create_access_token(data=token_data)
-        return TokenSchema(access_token=access_token, token_type="bearer")
+    async def create_token(
+        self,
+        user: User,
+        ip_address: str | None = None,
+        user_agent: str | None = None,
+    ) -> TokenSchema:
+        refresh_token = await self.refresh_service.issue(
+            user.id, ip_address=ip_address, user_agent=user_agent
+        )
+        return TokenSchema(
+            access_token=await self._create_access_token(user),
+            token_type="bearer",
+            refresh_token=refresh_token,
+        )
+
+    async def refresh_token(
+        self,
+        refresh_token: str,
+        ip_address: str | None = None,
+        user_agent: str | None = None,
+    ) -> TokenSchema:
+        """
+        Rotate a refresh token and issue a new access token, without
+        re-checking the password.
+
+        Raises:
+            InvalidRefreshTokenException: If the token is invalid or was
+                already used, or its owner is no longer active.
+        """
+        try:
+            user_id, new_refresh_token = await self.refresh_service.rotate(
+                refresh_token, ip_address=ip_address, user_agent=user_agent
+            )
+        except RefreshTokenReuseException as e:
+            # The refresh tokens are revoked; end the access tokens too.
+            owner = await self.user_service.get_user_by_id(e.user_id)
+            if owner is not None:
+                Security.invalidate_subject(owner.email)
+            raise
+        user = await self.user_service.get_user_by_id(user_id)
+        if user is None:
+            await self.refresh_service.revoke_all(user_id)
+            raise InvalidRefreshTokenException()
+        return TokenSchema(
+            access_token=await self._create_access_token(user),
+            token_type="bearer",
+            refresh_token=new_refresh_token,
+        )
+
+    async def _create_access_token(self, user: User) -> str:
+        token_data: dict = {"sub": user.email}
+        if settings.jwt_embed_permissions:
+            permissions = await self.permission_resolver.get_permissions(
+                user.email
+            )
+            token_data["perms"] = sorted(permissions)
+        return Security.create_access_token(data=token_data)
 
     async def get_current_user(
         self, token: dict = Depends(Security.verify_token)
@@ -51,5 +124,11 @@ class AuthService:
 
 def get_auth_service(
     user_service: UserService = Depends(get_user_service),
+    permission_resolver: PermissionResolver = Depends(get_permission_resolver),
+    refresh_service: RefreshTokenService = Depends(get_refresh_token_service),
 ) -> AuthService:
-    return AuthService(user_service=user_service)
+    return AuthService(
+        user_service=user_service,
+        permission_resolver=permission_resolver,
+        refresh_service=refresh_service,
+    )
@@ -0,0 +1,264 @@
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.db.base import SessionLocal
+from app.models.alert.models import (
+    NOTIFICATION_FAILED,
+    NOTIFICATION_PENDING,
+    NOTIFICATION_SENT,
+)
+from app.repositories.alert import ClaimedNotification, NotificationResult
+from app.repositories.alert.repositories import (
+    SqlAlchemyNotificationRepository,
+)
+from app.services.notification.senders import (
+    DeliveryError,
+    Digest,
+    EmailSender,
+    Sender,
+    WebhookSender,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationDispatcher:
+    """
+    Delivers the notification outbox.
+
+    Each round claims a batch of due notifications (``FOR UPDATE SKIP
+    LOCKED``, so any number of dispatchers can run side by side), folds
+    the ones for the same recipient into a single digest and sends the
+    digests concurrently through the sender for their channel, which owns
+    the connection reuse and rate limits. Results are written back in one
+    statement: sent, retried after full-jitter exponential backoff (or the
+    receiver's ``Retry-After``), or failed once ``max_attempts`` is used
+    up or the receiver rejects the message outright.
+
+    Delivery is at least once: a dispatcher that dies mid-batch leaves its
+    claim to expire after ``lease_seconds``, and the batch is sent again.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        senders: dict[str, Sender],
+        batch_size: int,
+        poll_interval: float,
+        lease_seconds: int,
+        max_attempts: int,
+        backoff_base: float,
+        backoff_max: float,
+        digest_window: int,
+        digest_limit: int,
+    ):
+        self.session_factory = session_factory
+        self.senders = senders
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.digest_window = digest_window
+        self.digest_limit = digest_limit
+        self.claimed = 0
+        self.messages = 0
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Dispatch until ``stop`` is set; the current batch is finished."""
+        while not stop.is_set():
+            try:
+                claimed = await self.dispatch_once()
+            except Exception as e:
+                logger.error(f"Notification dispatch failed: {e}")
+                claimed = 0
+            if claimed >= self.batch_size:
+                continue
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def dispatch_once(self) -> int:
+        """
+        Claim, send and complete one batch. Returns the number of
+        notifications claimed.
+        """
+        async with self.session_factory() as session:
+            claimed = await SqlAlchemyNotificationRepository(session).claim(
+                self.batch_size,
+                self.lease_seconds,
+                self.digest_window,
+                self.digest_limit,
+            )
+        if not claimed:
+            return 0
+        self.claimed += len(claimed)
+        digests = self.digests(claimed)
+        self.messages += len(digests)
+        outcomes = await asyncio.gather(
+            *(self._deliver(digest) for digest in digests),
+            return_exceptions=True,
+        )
+        results = []
+        for digest, outcome in zip(digests, outcomes):
+            if isinstance(outcome, Exception):
+                # One bad digest must not lose the whole batch's results,
+                # or digests already delivered would be sent again.
+                logger.error(
+                    f"Completing notifications {digest.ids} failed: {outcome}"
+                )
+                outcome = self._failed(digest, DeliveryError(str(outcome)))
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            results.extend(outcome)
+        async with self.session_factory() as session:
+            await SqlAlchemyNotificationRepository(session).complete(results)
+        return len(claimed)
+
+    @staticmethod
+    def digests(claimed: list[ClaimedNotification]) -> list[Digest]:
+        grouped: dict[tuple[int, str, str], Digest] = {}
+        for notification in claimed:
+            key = (
+                notification.user_id,
+                notification.channel,
+                notification.recipient,
+            )
+            digest = grouped.get(key)
+            if digest is None:
+                digest = grouped[key] = Digest(*key)
+            digest.notifications.append(notification)
+        return list(grouped.values())
+
+    async def _deliver(self, digest: Digest) -> list[NotificationResult]:
+        sender = self.senders.get(digest.channel)
+        try:
+            if sender is None:
+                raise DeliveryError(
+                    f"No sender for channel {digest.channel!r}",
+                    retryable=False,
+                )
+            await sender.send(digest)
+        except DeliveryError as e:
+            return self._failed(digest, e)
+        except Exception as e:
+            logger.exception(f"Sending notifications {digest.ids} failed")
+            return self._failed(digest, DeliveryError(str(e)))
+        self.sent += 1
+        now = datetime.now(timezone.utc)
+        return [
+            NotificationResult(
+                notification_id=notification.id,
+                attempts=notification.attempts,
+                status=NOTIFICATION_SENT,
+                sent_at=now,
+            )
+            for notification in digest.notifications
+        ]
+
+    def _failed(
+        self, digest: Digest, error: DeliveryError
+    ) -> list[NotificationResult]:
+        now = datetime.now(timezone.utc)
+        results = []
+        for notification in digest.notifications:
+            if error.retryable and notification.attempts < self.max_attempts:
+                status = NOTIFICATION_PENDING
+                delay = min(
+                    max(
+                        self._backoff(notification.attempts),
+                        error.retry_after or 0.0,
+                    ),
+                    self.backoff_max,
+                )
+                available_at = now + timedelta(seconds=delay)
+            else:
+                status, available_at = NOTIFICATION_FAILED, None
+            results.append(
+                NotificationResult(
+                    notification_id=notification.id,
+                    attempts=notification.attempts,
+                    status=status,
+                    available_at=available_at,
+                    error=str(error),
+                )
+            )
+        if results[0].status == NOTIFICATION_PENDING:
+            self.retried += 1
+        else:
+            self.failed += 1
+            logger.warning(
+                f"Giving up on notifications {digest.ids} to "
+                f"{digest.recipient}: {error}"
+            )
+        return results
+
+    def _backoff(self, attempts: int) -> float:
+        # Full jitter, as for page fetches: a receiver that comes back is
+        # not hit by the whole backlog at once.
+        return random.uniform(
+            0, min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+        )
+
+    async def aclose(self) -> None:
+        for sender in self.senders.values():
+            await sender.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "claimed": self.claimed,
+            "messages": self.messages,
+            "sent": self.sent,
+            "retried": self.retried,
+            "failed": self.failed,
+            **{
+                channel: sender.stats()
+                for channel, sender in self.senders.items()
+            },
+        }
+
+
+@lru_cache()
+def get_notification_dispatcher() -> NotificationDispatcher:
+    settings = get_settings()
+    return NotificationDispatcher(
+        session_factory=SessionLocal,
+        senders={
+            "email": EmailSender(
+                host=settings.smtp_host,
+                port=settings.smtp_port,
+                sender=settings.smtp_from,
+                connections=settings.smtp_connections,
+                rate_per_second=settings.smtp_rate_per_second,
+                timeout=settings.smtp_timeout_seconds,
+                username=settings.smtp_username,
+                password=settings.smtp_password,
+                starttls=settings.smtp_starttls,
+            ),
+            "webhook": WebhookSender(
+                concurrency=settings.webhook_concurrency,
+                rate_per_second=settings.webhook_rate_per_second,
+                timeout=settings.webhook_timeout_seconds,
+                max_retry_after=settings.notification_backoff_max_seconds,
+            ),
+        },
+        batch_size=settings.notification_batch_size,
+        poll_interval=settings.notification_poll_interval_seconds,
+        lease_seconds=settings.notification_lease_seconds,
+        max_attempts=settings.notification_max_attempts,
+        backoff_base=settings.notification_backoff_base_seconds,
+        backoff_max=settings.notification_backoff_max_seconds,
+        digest_window=settings.notification_digest_window_seconds,
+        digest_limit=settings.notification_digest_limit,
+    )
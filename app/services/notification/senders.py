@@ -0,0 +1,417 @@
+import asyncio
+import math
+import smtplib
+import threading
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from typing import Any, Protocol
+
+import httpcore
+import httpx
+
+from app.core.exceptions import UnsafeURLException
+from app.repositories.alert import ClaimedNotification
+from app.repositories.alert.repositories import PRICE_DROP
+from app.services.scraper.service import RETRY_STATUSES
+from app.services.scraper.throttle import DomainThrottle
+from app.utils.network import check_public_url, resolve_public_host
+
+
+class DeliveryError(Exception):
+    """
+    A message could not be delivered. ``retryable`` tells the dispatcher
+    whether a later attempt may succeed; ``retry_after`` is the delay the
+    receiver asked for, if any.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        retryable: bool = True,
+        retry_after: float | None = None,
+    ):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+@dataclass(slots=True)
+class Digest:
+    """One outgoing message: every claimed notification for a recipient."""
+
+    user_id: int
+    channel: str
+    recipient: str
+    notifications: list[ClaimedNotification] = field(default_factory=list)
+
+    @property
+    def ids(self) -> list[int]:
+        return [notification.id for notification in self.notifications]
+
+
+class Sender(Protocol):
+    async def send(self, digest: Digest) -> None:
+        """Deliver the digest, or raise ``DeliveryError``."""
+        raise NotImplementedError
+
+    async def aclose(self) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        raise NotImplementedError
+
+
+def _spacing(rate_per_second: float) -> float:
+    return 1 / rate_per_second if rate_per_second > 0 else 0.0
+
+
+def _describe(notification: ClaimedNotification) -> str:
+    payload = notification.payload
+    if notification.kind == PRICE_DROP:
+        return (
+            f"{payload.get('product_name')} is now {payload.get('price')} "
+            f"{payload.get('currency')} (your target: "
+            f"{payload.get('target_price')})"
+        )
+    return f"{notification.kind}: {payload}"
+
+
+def render_email(digest: Digest, sender: str) -> EmailMessage:
+    notifications = digest.notifications
+    message = EmailMessage()
+    message["From"] = sender
+    message["To"] = digest.recipient
+    if len(notifications) == 1:
+        subject = _describe(notifications[0]).partition(" (")[0]
+    else:
+        subject = f"{len(notifications)} price alerts"
+    message["Subject"] = subject
+    # Lets receivers (and our tests) recognise redeliveries.
+    message["X-Notification-Ids"] = ", ".join(map(str, digest.ids))
+    message.set_content(
+        "\n".join(f"- {_describe(n)}" for n in notifications) + "\n"
+    )
+    return message
+
+
+def render_webhook(digest: Digest) -> dict[str, Any]:
+    return {
+        "user_id": digest.user_id,
+        "notifications": [
+            {"id": n.id, "kind": n.kind, **n.payload}
+            for n in digest.notifications
+        ],
+    }
+
+
+class EmailSender:
+    """
+    Sends digests over a small pool of persistent SMTP connections to one
+    relay, so a burst costs one handshake (and TLS/AUTH) per connection
+    rather than per message. ``smtplib`` blocks, so each send runs in a
+    thread; the relay's ``DomainThrottle`` slot caps sends in flight at
+    the pool size and spaces them to ``rate_per_second``.
+
+    4xx replies and connection failures are retryable; 5xx replies are
+    permanent.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        sender: str,
+        connections: int,
+        rate_per_second: float,
+        timeout: float,
+        username: str | None = None,
+        password: str | None = None,
+        starttls: bool = False,
+    ):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.timeout = timeout
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.throttle = DomainThrottle(
+            concurrency=connections, delay=_spacing(rate_per_second)
+        )
+        self._idle: list[smtplib.SMTP] = []
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.connections_opened = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            connection.ehlo()
+            if self.starttls:
+                connection.starttls()
+                connection.ehlo()
+            if self.username:
+                connection.login(self.username, self.password or "")
+        except BaseException:
+            connection.close()
+            raise
+        with self._lock:
+            self.connections_opened += 1
+        return connection
+
+    def _checkout(self) -> tuple[smtplib.SMTP, bool]:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self._connect(), False
+
+    def _checkin(self, connection: smtplib.SMTP) -> None:
+        with self._lock:
+            self._idle.append(connection)
+
+    def _send(self, message: EmailMessage) -> None:
+        try:
+            connection, reused = self._checkout()
+        except (OSError, smtplib.SMTPException) as e:
+            raise DeliveryError(f"SMTP connect failed: {e}") from e
+        while True:
+            try:
+                connection.send_message(message)
+            except smtplib.SMTPRecipientsRefused as e:
+                self._checkin(connection)
+                code = min(code for code, _ in e.recipients.values())
+                raise DeliveryError(
+                    f"SMTP {code}: recipient refused", retryable=code < 500
+                ) from e
+            except smtplib.SMTPResponseException as e:
+                if e.smtp_code == 421:
+                    connection.close()
+                else:
+                    self._checkin(connection)
+                raise DeliveryError(
+                    f"SMTP {e.smtp_code}: {e.smtp_error!r}",
+                    retryable=e.smtp_code < 500,
+                ) from e
+            except (OSError, smtplib.SMTPException) as e:
+                connection.close()
+                if reused:
+                    # Idle connections get dropped by the relay; one retry
+                    # on a fresh connection tells that apart from an outage.
+                    try:
+                        connection, reused = self._connect(), False
+                    except (OSError, smtplib.SMTPException) as e:
+                        raise DeliveryError(f"SMTP connect failed: {e}") from e
+                    continue
+                raise DeliveryError(f"SMTP failed: {e}") from e
+            self._checkin(connection)
+            return
+
+    async def send(self, digest: Digest) -> None:
+        message = render_email(digest, self.sender)
+        async with self.throttle.slot(self.host):
+            await asyncio.to_thread(self._send, message)
+        self.sent += 1
+
+    def _close_idle(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            try:
+                connection.quit()
+            except (OSError, smtplib.SMTPException):
+                connection.close()
+
+    async def aclose(self) -> None:
+        await asyncio.to_thread(self._close_idle)
+
+    def stats(self) -> dict:
+        return {
+            "sent": self.sent,
+            "connections_opened": self.connections_opened,
+            "idle": len(self._idle),
+        }
+
+
+class _PublicOnlyBackend(httpcore.AsyncNetworkBackend):
+    """
+    Network backend that only dials public addresses: every new
+    connection resolves its host, is refused if any address is not
+    public, and connects to an address it checked. The URL keeps the
+    name, so the pool is keyed by host and TLS verifies each host's own
+    certificate.
+    """
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend | None = None):
+        self._backend = backend or httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options: Any = None,
+    ) -> httpcore.AsyncNetworkStream:
+        try:
+            address = await resolve_public_host(host, port)
+        except OSError as e:
+            raise httpcore.ConnectError(f"{type(e).__name__}: {e}") from e
+        return await self._backend.connect_tcp(
+            address,
+            port,
+            timeout=timeout,
+            local_address=local_address,
+            socket_options=socket_options,
+        )
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: float | None = None,
+        socket_options: Any = None,
+    ) -> httpcore.AsyncNetworkStream:
+        raise UnsafeURLException(path, "unix sockets are not allowed")
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+def _public_only_transport(limits: httpx.Limits) -> httpx.AsyncHTTPTransport:
+    transport = httpx.AsyncHTTPTransport(limits=limits)
+    # httpx has no option for the network backend; rebuild its pool with
+    # the same settings plus ours.
+    pool = transport._pool
+    transport._pool = httpcore.AsyncConnectionPool(
+        ssl_context=pool._ssl_context,
+        max_connections=limits.max_connections,
+        max_keepalive_connections=limits.max_keepalive_connections,
+        keepalive_expiry=limits.keepalive_expiry,
+        network_backend=_PublicOnlyBackend(),
+    )
+    return transport
+
+
+class WebhookSender:
+    """
+    POSTs digests as JSON over one shared, pooled ``httpx.AsyncClient``,
+    so repeated deliveries to a host reuse keep-alive connections. Each
+    destination host has its own ``DomainThrottle`` slot: at most
+    ``concurrency`` requests in flight, started at most
+    ``rate_per_second`` a second, so one slow receiver never holds up the
+    others.
+
+    Transport errors and the statuses the scraper retries are retryable,
+    honouring ``Retry-After`` up to ``max_retry_after`` seconds; any other
+    non-2xx status is permanent.
+
+    Alerts only accept public HTTPS URLs, but names can be re-pointed
+    after that check, so with ``check_destinations`` (the default) every
+    new connection resolves the host again, refuses non-public addresses
+    permanently, and connects to the address it checked. Redirects are
+    never followed. Turn the check off only for local test receivers; it
+    does not apply to an injected ``transport``.
+    """
+
+    def __init__(
+        self,
+        concurrency: int,
+        rate_per_second: float,
+        timeout: float,
+        user_agent: str = "price-alerts",
+        transport: httpx.AsyncBaseTransport | None = None,
+        check_destinations: bool = True,
+        max_retry_after: float = 3600.0,
+    ):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.throttle = DomainThrottle(
+            concurrency=concurrency, delay=_spacing(rate_per_second)
+        )
+        self._transport = transport
+        self.check_destinations = check_destinations
+        self.max_retry_after = max_retry_after
+        self._client: httpx.AsyncClient | None = None
+        self.sent = 0
+        self.refused = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created lazily so the sender can be built outside an event loop.
+        if self._client is None:
+            limits = httpx.Limits(
+                max_connections=None, max_keepalive_connections=None
+            )
+            transport = self._transport
+            if transport is None and self.check_destinations:
+                transport = _public_only_transport(limits)
+            self._client = httpx.AsyncClient(
+                limits=limits,
+                timeout=self.timeout,
+                headers={"user-agent": self.user_agent},
+                follow_redirects=False,
+                transport=transport,
+            )
+        return self._client
+
+    def _refuse(self, error: UnsafeURLException) -> DeliveryError:
+        self.refused += 1
+        return DeliveryError(str(error), retryable=False)
+
+    async def send(self, digest: Digest) -> None:
+        url = httpx.URL(digest.recipient)
+        host = url.netloc.decode("ascii")
+        if self.check_destinations:
+            try:
+                check_public_url(digest.recipient)
+            except UnsafeURLException as e:
+                raise self._refuse(e) from e
+        async with self.throttle.slot(host):
+            try:
+                response = await self.client.post(
+                    url, json=render_webhook(digest)
+                )
+            except UnsafeURLException as e:
+                raise self._refuse(e) from e
+            except httpx.TransportError as e:
+                raise DeliveryError(f"{type(e).__name__}: {e}") from e
+        if response.is_success:
+            self.sent += 1
+            return
+        retryable = response.status_code in RETRY_STATUSES
+        retry_after = None
+        if retryable:
+            retry_after = self._retry_after(response)
+            if retry_after is not None:
+                self.throttle.back_off(host, retry_after)
+        raise DeliveryError(
+            f"HTTP {response.status_code}",
+            retryable=retryable,
+            retry_after=retry_after,
+        )
+
+    def _retry_after(self, response: httpx.Response) -> float | None:
+        """
+        The delay-seconds form of ``Retry-After``, clamped to
+        ``[0, max_retry_after]`` so a receiver cannot park its host (or
+        overflow the retry time) with ``inf`` or ``1e12``.
+        """
+        try:
+            seconds = float(response.headers.get("retry-after", ""))
+        except ValueError:
+            return None
+        if not math.isfinite(seconds):
+            return None
+        return min(max(seconds, 0.0), self.max_retry_after)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> dict:
+        return {
+            "sent": self.sent,
+            "refused": self.refused,
+            "hosts": len(self.throttle.stats()),
+        }
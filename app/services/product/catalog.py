@@ -0,0 +1,100 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+
+from fastapi import Depends
+
+from app.core.exceptions import InvalidCursorException
+from app.repositories.product import (
+    ProductFilter,
+    ProductListing,
+    ProductProtocol,
+    get_product_repository,
+)
+
+# The listing field each order sorts on.
+SORT_FIELDS = {
+    "newest": "id",
+    "price": "lowest_price",
+    "-price": "lowest_price",
+    "drop": "drop_pct",
+}
+
+
+@dataclass(slots=True)
+class ProductPage:
+    items: list[ProductListing] = field(default_factory=list)
+    # Pass back to get the next page; None on the last one.
+    next_cursor: str | None = None
+
+
+def encode_cursor(sort: str, product: ProductListing) -> str:
+    value = getattr(product, SORT_FIELDS[sort])
+    raw = json.dumps(
+        [
+            sort,
+            str(value) if isinstance(value, Decimal) else value,
+            product.id,
+        ],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> tuple[object, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, value, product_id = json.loads(raw)
+        if cursor_sort != sort or type(product_id) is not int:
+            raise ValueError(cursor_sort)
+        if SORT_FIELDS[sort] != "id":
+            value = Decimal(value)
+            if not value.is_finite():
+                raise ValueError(value)
+    except (
+        binascii.Error,
+        InvalidOperation,
+        TypeError,
+        UnicodeDecodeError,
+        ValueError,
+    ) as e:
+        raise InvalidCursorException() from e
+    return value, product_id
+
+
+class ProductCatalogService:
+    """
+    Pages through the product listing. Cursors are opaque to clients: the
+    order plus the sort value and id of the last product returned, which
+    the repository seeks past instead of counting an offset. A cursor is
+    only valid for the order it was issued for; filters may change
+    between pages.
+    """
+
+    def __init__(self, product_repo: ProductProtocol):
+        self.product_repo = product_repo
+
+    async def list_products(
+        self,
+        filters: ProductFilter,
+        sort: str,
+        cursor: str | None,
+        limit: int,
+    ) -> ProductPage:
+        after = decode_cursor(cursor, sort) if cursor else None
+        # One extra row tells whether there is a next page.
+        items = await self.product_repo.list_products(
+            filters, sort, after, limit + 1
+        )
+        page = ProductPage(items[:limit])
+        if len(items) > limit:
+            page.next_cursor = encode_cursor(sort, page.items[-1])
+        return page
+
+
+async def get_product_catalog_service(
+    product_repo: ProductProtocol = Depends(get_product_repository),
+) -> ProductCatalogService:
+    return ProductCatalogService(product_repo=product_repo)
@@ -0,0 +1,173 @@
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta, timezone
+from decimal import Decimal
+
+from fastapi import Depends
+
+from app.core.config import get_settings
+from app.core.exceptions import ProductNotFoundException
+from app.repositories.product import ProductProtocol, get_product_repository
+from app.utils.downsample import lttb
+
+settings = get_settings()
+
+RAW = "raw"
+DAY = "day"
+WEEK = "week"
+CENT = Decimal("0.01")
+
+
+@dataclass(slots=True)
+class ChartPoint:
+    at: datetime
+    # The observed price, or the bucket's average.
+    price: Decimal
+    min_price: Decimal
+    max_price: Decimal
+
+
+@dataclass(slots=True)
+class PriceChart:
+    product_id: int
+    currency: str
+    resolution: str
+    since: datetime
+    points: list[ChartPoint] = field(default_factory=list)
+    # Over the whole range, not just the points kept. For rollups,
+    # ``avg_price`` weighs every bucket equally, so it follows time rather
+    # than how often the price changed; within a bucket, and on raw
+    # charts, it is the mean of the observations.
+    min_price: Decimal | None = None
+    max_price: Decimal | None = None
+    avg_price: Decimal | None = None
+    last_price: Decimal | None = None
+
+
+class PriceChartService:
+    """
+    Builds price charts for a trailing range of days.
+
+    The resolution follows the range: short ranges read raw price points,
+    longer ones the daily or weekly rollups maintained on ingestion, so
+    the rows read stay roughly constant however long the range. The
+    series is then reduced to at most the requested number of points with
+    LTTB; the summary statistics are computed before downsampling.
+    """
+
+    def __init__(
+        self,
+        product_repo: ProductProtocol,
+        raw_max_days: int,
+        daily_max_days: int,
+        max_points: int,
+    ):
+        self.product_repo = product_repo
+        self.raw_max_days = raw_max_days
+        self.daily_max_days = daily_max_days
+        self.max_points = max_points
+
+    def resolution(self, days: int) -> str:
+        if days <= self.raw_max_days:
+            return RAW
+        if days <= self.daily_max_days:
+            return DAY
+        return WEEK
+
+    async def get_chart(
+        self, product_id: int, days: int, currency: str, points: int
+    ) -> PriceChart:
+        since = datetime.now(timezone.utc) - timedelta(days=days)
+        chart = PriceChart(
+            product_id=product_id,
+            currency=currency,
+            resolution=self.resolution(days),
+            since=since,
+        )
+        if chart.resolution == RAW:
+            series, total, count = await self._raw(chart)
+        else:
+            series, total, count = await self._rolled_up(chart)
+        if not series:
+            if await self.product_repo.get_by_id(product_id) is None:
+                raise ProductNotFoundException(product_id)
+            return chart
+
+        chart.min_price = min(point.min_price for point in series)
+        chart.max_price = max(point.max_price for point in series)
+        chart.avg_price = (total / count).quantize(CENT)
+        chart.points = lttb(
+            series,
+            min(points, self.max_points),
+            lambda point: (point.at.timestamp(), float(point.price)),
+        )
+        return chart
+
+    async def _raw(
+        self, chart: PriceChart
+    ) -> tuple[list[ChartPoint], Decimal, int]:
+        history = await self.product_repo.get_price_history(
+            chart.product_id, chart.since
+        )
+        series = [
+            ChartPoint(
+                point.observed_at, point.price, point.price, point.price
+            )
+            for point in history
+            if point.currency == chart.currency
+        ]
+        if series:
+            chart.last_price = series[-1].price
+        return series, sum(point.price for point in series), len(series)
+
+    async def _rolled_up(
+        self, chart: PriceChart
+    ) -> tuple[list[ChartPoint], Decimal, int]:
+        # Whole buckets: the first one may start before ``since``.
+        first_day = chart.since.date()
+        if chart.resolution == WEEK:
+            first_day -= timedelta(days=first_day.weekday())
+        rollups = await self.product_repo.get_price_rollups(
+            chart.product_id, chart.currency, chart.resolution, first_day
+        )
+        if not rollups:
+            return [], Decimal(0), 0
+        step = timedelta(days=7 if chart.resolution == WEEK else 1)
+        today = datetime.now(timezone.utc).date()
+        if chart.resolution == WEEK:
+            today -= timedelta(days=today.weekday())
+        # Prices are stored as changes, so a bucket without a row is one
+        # where the price held: carry the last price through it.
+        series: list[ChartPoint] = []
+        rollup_at = {rollup.bucket: rollup for rollup in rollups}
+        bucket, last_price = rollups[0].bucket, rollups[0].last_price
+        while bucket <= max(today, rollups[-1].bucket):
+            at = datetime.combine(bucket, time(), tzinfo=timezone.utc)
+            rollup = rollup_at.get(bucket)
+            if rollup is None:
+                series.append(
+                    ChartPoint(at, last_price, last_price, last_price)
+                )
+            else:
+                series.append(
+                    ChartPoint(
+                        at,
+                        (rollup.price_sum / rollup.price_count).quantize(CENT),
+                        rollup.min_price,
+                        rollup.max_price,
+                    )
+                )
+                last_price = rollup.last_price
+            bucket += step
+        chart.last_price = last_price
+        return series, sum(point.price for point in series), len(series)
+
+
+async def get_price_chart_service(
+    product_repo: ProductProtocol = Depends(get_product_repository),
+) -> PriceChartService:
+    return PriceChartService(
+        product_repo=product_repo,
+        raw_max_days=settings.chart_raw_max_days,
+        daily_max_days=settings.chart_daily_max_days,
+        max_points=settings.chart_max_points,
+    )
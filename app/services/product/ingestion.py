@@ -0,0 +1,149 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.repositories.alert import TriggeredAlert
+from app.repositories.product import (
+    PriceObservation,
+    ProductProtocol,
+    get_product_repository,
+)
+from app.repositories.product.repositories import SqlAlchemyProductRepository
+from app.services.alert.matcher import PriceAlertMatcher
+from app.utils.cache import TTLCache
+
+settings = get_settings()
+
+
+@dataclass
+class PriceIngestionReport:
+    observed: int = 0
+    written: int = 0
+    unchanged: int = 0
+    written_sources: list[int] = field(default_factory=list)
+    # The latest written observation of each written source.
+    changes: list[PriceObservation] = field(default_factory=list)
+    # Sources whose price or availability differed from the known one
+    # (heartbeat and first writes are not changes).
+    changed_sources: set[int] = field(default_factory=set)
+    # Alerts fired by the written prices, when matching was asked for.
+    triggered: list[TriggeredAlert] = field(default_factory=list)
+
+
+class PriceIngestionService:
+    """
+    Stores scraped prices as a change log rather than a sample log.
+
+    The last written price, currency and availability of every source are
+    kept in a process-wide cache. An observation is written as a new
+    ``PricePoint`` only if it differs from that, or if the source's last
+    point is older than the heartbeat interval (cache entries expire at
+    ``observed_at + heartbeat``, so an expired or evicted entry simply
+    forces a write). Every observed source, changed or not, gets its
+    ``last_seen_at`` bumped in one statement per batch.
+
+    With a ``matcher`` working on the same session, the written prices
+    are matched against price alerts in the transaction that writes
+    them, so prices are never stored without their alerts firing.
+    """
+
+    last_prices: TTLCache[int, PriceObservation] = TTLCache(
+        max_size=settings.price_cache_max_size
+    )
+
+    def __init__(
+        self,
+        product_repo: ProductProtocol,
+        heartbeat: int,
+        matcher: PriceAlertMatcher | None = None,
+    ):
+        self.product_repo = product_repo
+        self.heartbeat = heartbeat
+        self.matcher = matcher
+
+    async def ingest(
+        self, observations: list[PriceObservation]
+    ) -> PriceIngestionReport:
+        report = PriceIngestionReport(observed=len(observations))
+        changed: list[PriceObservation] = []
+        # Decisions within a batch are made against the batch's own
+        # earlier observations too, so repeats in one batch collapse.
+        pending: dict[int, PriceObservation] = {}
+        seen: dict[int, datetime] = {}
+
+        for observation in sorted(observations, key=lambda o: o.observed_at):
+            source_id = observation.source_id
+            seen[source_id] = observation.observed_at
+            last = pending.get(source_id) or self.last_prices.get(source_id)
+            if last is not None and self._same(last, observation):
+                report.unchanged += 1
+                continue
+            if last is not None:
+                report.changed_sources.add(source_id)
+            changed.append(observation)
+            pending[source_id] = observation
+
+        if changed:
+            report.written = await self.product_repo.record_prices(
+                changed, commit=self.matcher is None
+            )
+            report.written_sources = list(pending)
+            report.changes = list(pending.values())
+            if self.matcher is not None:
+                report.triggered = await self.matcher.match(report.changes)
+            # Only once committed: a rolled back write must be retried.
+            for observation in pending.values():
+                self._remember(observation, self.heartbeat)
+        await self.product_repo.touch_sources(seen)
+        return report
+
+    @staticmethod
+    def _same(last: PriceObservation, current: PriceObservation) -> bool:
+        return (
+            last.price == current.price
+            and last.currency == current.currency
+            and last.in_stock == current.in_stock
+        )
+
+    @classmethod
+    def _remember(cls, observation: PriceObservation, heartbeat: int) -> None:
+        cls.last_prices.set(
+            observation.source_id,
+            observation,
+            expires_at=observation.observed_at.timestamp() + heartbeat,
+        )
+
+    @classmethod
+    async def warm(cls, session: AsyncSession, heartbeat: int) -> int:
+        """
+        Load each source's latest price point from within the heartbeat
+        window; anything older would need a heartbeat write anyway.
+        """
+        since = datetime.now(timezone.utc) - timedelta(seconds=heartbeat)
+        latest = await SqlAlchemyProductRepository(session).get_latest_prices(
+            since
+        )
+        for observation in latest:
+            cls._remember(observation, heartbeat)
+        return len(latest)
+
+    @classmethod
+    def forget(cls, source_id: int) -> None:
+        """Force the next observation of ``source_id`` to be written."""
+        cls.last_prices.delete(source_id)
+
+    @classmethod
+    def stats(cls) -> dict[str, int]:
+        return cls.last_prices.stats()
+
+
+async def get_price_ingestion_service(
+    product_repo: ProductProtocol = Depends(get_product_repository),
+) -> PriceIngestionService:
+    return PriceIngestionService(
+        product_repo=product_repo,
+        heartbeat=settings.price_heartbeat_seconds,
+    )
@@ -0,0 +1,127 @@
+import asyncio
+import logging
+from datetime import date
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.db.base import SessionLocal
+from app.repositories.product.repositories import SqlAlchemyProductRepository
+from app.utils.metrics import Family, registry
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+class PricePartitionMaintainer:
+    """
+    Keeps ``months_ahead`` monthly ``price_points`` partitions created
+    ahead of the data, checking every ``interval`` seconds, and watches
+    the default partition: rows that land there mean a month was missed,
+    and block creating that month until they are moved out.
+
+    Runs in the API and in every worker process, so prices are never
+    written further ahead than the partitions, whichever one is up.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        interval: float,
+        months_ahead: int,
+    ):
+        self.session_factory = session_factory
+        self.interval = interval
+        self.months_ahead = months_ahead
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+        self.created = 0
+        self.default_rows = 0
+        self.failed_runs = 0
+
+    async def start(self) -> None:
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+            self._stopping = False
+
+    async def check(self) -> list[str]:
+        """
+        Create missing partitions and count the default partition's rows.
+        Returns the names of the partitions created.
+        """
+        try:
+            async with self.session_factory() as session:
+                repository = SqlAlchemyProductRepository(session)
+                created = await repository.ensure_partitions(
+                    date.today(), self.months_ahead
+                )
+                self.default_rows = (
+                    await repository.count_default_partition_rows()
+                )
+        except Exception as e:
+            self.failed_runs += 1
+            logger.error(f"Failed to maintain price partitions: {e}")
+            return []
+        self.created += len(created)
+        if created:
+            logger.info(f"Created price partitions {', '.join(created)}")
+        if self.default_rows:
+            logger.error(
+                f"{self.default_rows} price points are in the default "
+                "partition; move them out so their month's partition can "
+                "be created"
+            )
+        return created
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=self.interval
+                )
+            except asyncio.TimeoutError:
+                await self.check()
+            self._wakeup.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "created": self.created,
+            "default_rows": self.default_rows,
+            "failed_runs": self.failed_runs,
+        }
+
+
+price_partition_maintainer = PricePartitionMaintainer(
+    session_factory=SessionLocal,
+    interval=settings.price_partition_check_interval_seconds,
+    months_ahead=settings.price_partition_months_ahead,
+)
+
+
+@registry.register_collector
+def _collect_partitions() -> list[Family]:
+    stats = price_partition_maintainer.stats()
+    return [
+        (
+            "price_points_default_partition_rows",
+            "gauge",
+            "Price points in the default partition at the last check; "
+            "should be 0",
+            [({}, stats["default_rows"])],
+        ),
+        (
+            "price_partition_check_failures_total",
+            "counter",
+            "Partition maintenance runs that failed",
+            [({}, stats["failed_runs"])],
+        ),
+    ]
@@ -0,0 +1,244 @@
+import asyncio
+import heapq
+import logging
+import math
+import os
+import random
+import socket
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.db.base import SessionLocal
+from app.repositories.product import CrawlCompletion, CrawlLease
+from app.repositories.product.repositories import (
+    SqlAlchemyCrawlScheduleRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+def next_interval(
+    interval: int,
+    changed: bool,
+    min_interval: int,
+    max_interval: int,
+) -> int:
+    """
+    Adapt a source's revisit interval to its price volatility: halve it
+    when the price changed, grow it by a quarter when it did not.
+    """
+    interval = interval // 2 if changed else int(interval * 1.25)
+    return max(min_interval, min(max_interval, interval))
+
+
+def watcher_delay(interval: int, watchers: int, min_interval: int) -> float:
+    """Shorten the interval for watched products, logarithmically."""
+    return max(min_interval, interval / (1 + math.log2(1 + watchers)))
+
+
+class CrawlScheduler:
+    """
+    Hands out crawl jobs from the shared ``crawl_schedules`` table.
+
+    Jobs due within ``lookahead`` seconds are leased in batches with
+    ``SELECT ... FOR UPDATE SKIP LOCKED``, so any number of workers can
+    share the queue without double-crawling a source. Leased jobs wait in
+    a local heap ordered by due time (more watchers first on ties), and
+    ``next_lease`` hands each one out when it falls due. Results passed to
+    ``complete`` are buffered and written back in one statement per batch
+    with the next due time adapted to how volatile the price has been.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        owner: str,
+        batch_size: int,
+        lookahead: int,
+        lease_seconds: int,
+        poll_interval: float,
+        default_interval: int,
+        min_interval: int,
+        max_interval: int,
+    ):
+        self.session_factory = session_factory
+        self.owner = owner
+        self.batch_size = batch_size
+        self.lookahead = lookahead
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.default_interval = default_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._heap: list[tuple[datetime, int, int, CrawlLease]] = []
+        self._completions: list[CrawlCompletion] = []
+        self._refill_lock = asyncio.Lock()
+        self._next_refill = 0.0
+        self.leased = 0
+        self.completed = 0
+        self.failed = 0
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+
+    def _repository(
+        self, session: AsyncSession
+    ) -> SqlAlchemyCrawlScheduleRepository:
+        return SqlAlchemyCrawlScheduleRepository(session)
+
+    async def ensure_schedules(self) -> int:
+        async with self.session_factory() as session:
+            return await self._repository(session).ensure_schedules(
+                self.default_interval
+            )
+
+    async def refill(self) -> int:
+        """Flush buffered completions and lease the next batch of jobs."""
+        async with self._refill_lock:
+            await self.flush()
+            free = self.batch_size - len(self._heap)
+            if free <= 0:
+                return 0
+            horizon = datetime.now(timezone.utc) + timedelta(
+                seconds=self.lookahead
+            )
+            async with self.session_factory() as session:
+                leases = await self._repository(session).lease_due(
+                    self.owner, horizon, free, self.lease_seconds
+                )
+            for lease in leases:
+                heapq.heappush(
+                    self._heap,
+                    (lease.due_at, -lease.watchers, lease.schedule_id, lease),
+                )
+            self.leased += len(leases)
+            return len(leases)
+
+    async def next_lease(self) -> CrawlLease | None:
+        """
+        Return the next job if it is due, leasing more first when the
+        local queue is empty or ``poll_interval`` has passed since the last
+        refill. Otherwise sleep until it is due (at most ``poll_interval``)
+        and return None so the caller can check again.
+        """
+        loop = asyncio.get_running_loop()
+        if not self._heap or loop.time() >= self._next_refill:
+            self._next_refill = loop.time() + self.poll_interval
+            await self.refill()
+        if not self._heap:
+            await asyncio.sleep(self.poll_interval)
+            return None
+
+        now = datetime.now(timezone.utc)
+        due_at = self._heap[0][0]
+        wait = (due_at - now).total_seconds()
+        if wait > 0:
+            await asyncio.sleep(min(wait, self.poll_interval))
+            return None
+        _, _, _, lease = heapq.heappop(self._heap)
+
+        lag = -wait
+        self.lag_total += lag
+        self.lag_max = max(self.lag_max, lag)
+        return lease
+
+    async def complete(
+        self, lease: CrawlLease, success: bool, changed: bool = False
+    ) -> None:
+        """Buffer a crawl result; it is written with the next batch."""
+        now = datetime.now(timezone.utc)
+        if success:
+            failures = 0
+            interval = next_interval(
+                lease.interval_seconds,
+                changed,
+                self.min_interval,
+                self.max_interval,
+            )
+            delay = watcher_delay(interval, lease.watchers, self.min_interval)
+            self.completed += 1
+        else:
+            # Retry failed sources with jittered exponential backoff,
+            # without touching their learned interval.
+            failures = lease.failures + 1
+            interval = lease.interval_seconds
+            delay = random.uniform(0.5, 1.0) * min(
+                self.max_interval, self.min_interval * 2**failures
+            )
+            self.failed += 1
+        self._completions.append(
+            CrawlCompletion(
+                schedule_id=lease.schedule_id,
+                next_run_at=now + timedelta(seconds=delay),
+                interval_seconds=interval,
+                success=success,
+                changed=changed,
+                failures=failures,
+                finished_at=now,
+            )
+        )
+        if len(self._completions) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> int:
+        completions, self._completions = self._completions, []
+        if not completions:
+            return 0
+        async with self.session_factory() as session:
+            return await self._repository(session).complete(
+                self.owner, completions
+            )
+
+    async def stop(self) -> None:
+        """Write pending results and hand unstarted jobs back."""
+        await self.flush()
+        leases = [entry[-1] for entry in self._heap]
+        self._heap.clear()
+        if leases:
+            async with self.session_factory() as session:
+                await self._repository(session).release(self.owner, leases)
+
+    async def metrics(self) -> dict:
+        """
+        Queue health: ``due_backlog`` jobs are due but not leased by any
+        worker, and ``lag_seconds`` is how overdue the oldest of them is.
+        """
+        async with self.session_factory() as session:
+            backlog, oldest = await self._repository(session).get_backlog()
+        dispatched = self.completed + self.failed
+        return {
+            "due_backlog": backlog,
+            "lag_seconds": (
+                max(
+                    0.0,
+                    (datetime.now(timezone.utc) - oldest).total_seconds(),
+                )
+                if oldest is not None
+                else 0.0
+            ),
+            "local_queue": len(self._heap),
+            "leased": self.leased,
+            "completed": self.completed,
+            "failed": self.failed,
+            "dispatch_lag_avg_seconds": (
+                self.lag_total / dispatched if dispatched else 0.0
+            ),
+            "dispatch_lag_max_seconds": self.lag_max,
+        }
+
+
+def get_crawl_scheduler(owner: str | None = None) -> CrawlScheduler:
+    return CrawlScheduler(
+        session_factory=SessionLocal,
+        owner=owner or f"{socket.gethostname()}:{os.getpid()}",
+        batch_size=settings.crawl_batch_size,
+        lookahead=settings.crawl_lookahead_seconds,
+        lease_seconds=settings.crawl_lease_seconds,
+        poll_interval=settings.crawl_poll_interval_seconds,
+        default_interval=settings.crawl_default_interval_seconds,
+        min_interval=settings.crawl_min_interval_seconds,
+        max_interval=settings.crawl_max_interval_seconds,
+    )
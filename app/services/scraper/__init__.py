@@ -0,0 +1,27 @@
+from app.services.scraper.adapters import (
+    AdapterRegistry,
+    CssRule,
+    RegexRule,
+    SiteAdapter,
+    XPathRule,
+    get_adapter_registry,
+)
+from app.services.scraper.service import (
+    FetchResult,
+    ScraperService,
+    get_scraper_service,
+)
+from app.services.scraper.throttle import DomainThrottle
+
+__all__ = [
+    "AdapterRegistry",
+    "CssRule",
+    "DomainThrottle",
+    "FetchResult",
+    "RegexRule",
+    "ScraperService",
+    "SiteAdapter",
+    "XPathRule",
+    "get_adapter_registry",
+    "get_scraper_service",
+]
@@ -0,0 +1,359 @@
+import logging
+import math
+import re
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Protocol
+from urllib.parse import urlsplit
+
+from app.services.scraper.parsing import (
+    ParsedPrice,
+    extract_structured,
+    parse_amount,
+    parse_availability,
+    parse_currency,
+)
+
+logger = logging.getLogger(__name__)
+
+STRUCTURED = "structured"
+BYTES = "bytes"
+DOM = "dom"
+MISS = "miss"
+
+# Optional dependencies of the DOM rules that were found missing, so each
+# is reported once per process rather than once per page.
+_missing: set[str] = set()
+
+
+def _warn_missing(package: str, rule: str) -> None:
+    if package not in _missing:
+        _missing.add(package)
+        logger.warning(
+            f"{rule} extraction rules need the '{package}' package; "
+            "they are skipped until it is installed"
+        )
+
+
+def _parse_html(content: bytes) -> Any:
+    try:
+        import lxml.html
+        from lxml import etree
+    except ImportError:  # pragma: no cover - optional dependency
+        _warn_missing("lxml", "CSS/XPath")
+        return None
+    try:
+        return lxml.html.document_fromstring(content)
+    except (etree.ParserError, ValueError):
+        return None
+
+
+class Rule(Protocol):
+    # Rules with ``needs_dom`` run only after every byte-level rule of the
+    # same adapter has missed, and share one parsed tree per page.
+    needs_dom: bool
+
+    def extract(self, content: bytes, tree: Any) -> str | None:
+        """Return the matched text, or None if the rule does not match."""
+        raise NotImplementedError
+
+
+class RegexRule(Rule):
+    """
+    Search the raw bytes and return one capture group. Patterns are
+    case-sensitive unless ``flags`` says otherwise: a literal prefix lets
+    the regex engine skip ahead instead of trying every offset.
+    """
+
+    needs_dom = False
+
+    def __init__(
+        self,
+        pattern: str | bytes,
+        group: int = 1,
+        flags: int = 0,
+    ):
+        if isinstance(pattern, str):
+            pattern = pattern.encode()
+        self.pattern = re.compile(pattern, flags)
+        self.group = group
+
+    def extract(self, content: bytes, tree: Any) -> str | None:
+        match = self.pattern.search(content)
+        if match is None:
+            return None
+        return (
+            match.group(self.group).decode("utf-8", "ignore").strip() or None
+        )
+
+    def __repr__(self) -> str:
+        return f"RegexRule({self.pattern.pattern!r})"
+
+
+class XPathRule(Rule):
+    """
+    Evaluate an XPath expression on the parsed document and return the
+    first string, number or element text it selects. The expression is
+    compiled on first use and reused for every later page.
+    """
+
+    needs_dom = True
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self._compiled: Any = None
+
+    def _xpath(self) -> str:
+        return self.expression
+
+    def compile(self) -> Any:
+        if self._compiled is None:
+            from lxml import etree
+
+            self._compiled = etree.XPath(self._xpath())
+        return self._compiled
+
+    def extract(self, content: bytes, tree: Any) -> str | None:
+        result = self.compile()(tree)
+        if isinstance(result, list):
+            result = result[0] if result else None
+        if result is None or isinstance(result, bool):
+            return None
+        if isinstance(result, float):
+            return None if math.isnan(result) else str(result)
+        text = result if isinstance(result, str) else result.text_content()
+        return " ".join(text.split()) or None
+
+    def __repr__(self) -> str:
+        return f"XPathRule({self.expression!r})"
+
+
+class CssRule(XPathRule):
+    """
+    Select the first element matching a CSS selector and return its text,
+    or the value of ``attribute`` when given. The selector is translated
+    to XPath once.
+    """
+
+    def __init__(self, selector: str, attribute: str | None = None):
+        super().__init__(selector)
+        self.attribute = attribute
+
+    def _xpath(self) -> str:
+        from cssselect import HTMLTranslator
+
+        xpath = HTMLTranslator().css_to_xpath(self.expression)
+        return f"{xpath}/@{self.attribute}" if self.attribute else xpath
+
+    def extract(self, content: bytes, tree: Any) -> str | None:
+        if self._compiled is None:
+            try:
+                import cssselect  # noqa: F401
+            except ImportError:  # pragma: no cover - optional dependency
+                _warn_missing("cssselect", "CSS")
+                return None
+        return super().extract(content, tree)
+
+    def __repr__(self) -> str:
+        return f"CssRule({self.expression!r}, attribute={self.attribute!r})"
+
+
+@dataclass(frozen=True)
+class SiteAdapter:
+    """
+    Extraction rules for one retailer, matched on its domains and their
+    subdomains. ``price``, ``currency`` and ``in_stock`` rules are tried in
+    declaration order, byte-level rules first. Unless ``structured_data``
+    is off, JSON-LD and meta tags are read before any rule runs; unless
+    ``generic`` is off, the generic rules back up the adapter's own.
+    """
+
+    name: str
+    domains: tuple[str, ...] = ()
+    price: tuple[Rule, ...] = ()
+    currency: tuple[Rule, ...] = ()
+    in_stock: tuple[Rule, ...] = ()
+    default_currency: str | None = None
+    structured_data: bool = True
+    generic: bool = True
+
+
+# What most shops emit when they carry no structured data; also the
+# adapter for every domain without one of its own.
+GENERIC = SiteAdapter(
+    name="generic",
+    price=(
+        RegexRule(rb'itemprop="price"[^>]*content="([^"]+)"'),
+        RegexRule(
+            rb'class="[^"]*\bprice\b[^"]*"[^>]*>\s*([^\d<]{0,5}[\d.,]+)'
+        ),
+    ),
+    currency=(
+        RegexRule(rb'itemprop="priceCurrency"[^>]*content="([^"]+)"'),
+        RegexRule(rb'"priceCurrency"\s*:\s*"([A-Za-z]{3})"'),
+    ),
+    in_stock=(
+        RegexRule(rb'itemprop="availability"[^>]*(?:content|href)="([^"]+)"'),
+    ),
+)
+
+
+def _ordered(*groups: tuple[Rule, ...]) -> tuple[Rule, ...]:
+    return tuple(
+        rule
+        for rules in groups
+        for needs_dom in (False, True)
+        for rule in rules
+        if rule.needs_dom is needs_dom
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class _Chains:
+    adapter: SiteAdapter
+    price: tuple[Rule, ...]
+    currency: tuple[Rule, ...]
+    in_stock: tuple[Rule, ...]
+
+
+class _Document:
+    """A page whose DOM is parsed at most once, and only if needed."""
+
+    __slots__ = ("content", "_tree", "parsed")
+
+    def __init__(self, content: bytes):
+        self.content = content
+        self._tree: Any = None
+        self.parsed = False
+
+    def first(self, rules: tuple[Rule, ...]) -> str | None:
+        for rule in rules:
+            if rule.needs_dom:
+                if not self.parsed:
+                    self.parsed = True
+                    self._tree = _parse_html(self.content)
+                if self._tree is None:
+                    continue
+            value = rule.extract(self.content, self._tree)
+            if value:
+                return value
+        return None
+
+
+class AdapterRegistry:
+    """
+    Maps hostnames to ``SiteAdapter``s. Each adapter's rule chains are
+    resolved once at registration; hostname lookups are cached, up to
+    ``max_hosts`` of them. ``counts`` tracks, per adapter, which path
+    answered each page.
+    """
+
+    def __init__(self, generic: SiteAdapter = GENERIC, max_hosts: int = 10000):
+        self.max_hosts = max_hosts
+        self._generic = self._chains(generic, generic)
+        self._domains: dict[str, _Chains] = {}
+        self._hosts: dict[str, _Chains] = {}
+        self.counts: dict[str, dict[str, int]] = {}
+
+    @staticmethod
+    def _chains(adapter: SiteAdapter, generic: SiteAdapter) -> _Chains:
+        sources = [adapter]
+        if adapter.generic and adapter is not generic:
+            sources.append(generic)
+        return _Chains(
+            adapter=adapter,
+            price=_ordered(*(source.price for source in sources)),
+            currency=_ordered(*(source.currency for source in sources)),
+            in_stock=_ordered(*(source.in_stock for source in sources)),
+        )
+
+    def register(self, adapter: SiteAdapter) -> SiteAdapter:
+        chains = self._chains(adapter, self._generic.adapter)
+        for domain in adapter.domains:
+            domain = domain.lower().removeprefix("www.")
+            existing = self._domains.get(domain)
+            if existing is not None and existing.adapter.name != adapter.name:
+                raise ValueError(
+                    f"{domain} is already handled by {existing.adapter.name}"
+                )
+            self._domains[domain] = chains
+        self._hosts.clear()
+        return adapter
+
+    def _resolve(self, host: str) -> _Chains:
+        domain = host
+        while domain:
+            chains = self._domains.get(domain)
+            if chains is not None:
+                return chains
+            domain = domain.partition(".")[2]
+        return self._generic
+
+    def _lookup(self, host: str) -> _Chains:
+        chains = self._hosts.get(host)
+        if chains is None:
+            chains = self._resolve(host)
+            if len(self._hosts) >= self.max_hosts:
+                self._hosts.clear()
+            self._hosts[host] = chains
+        return chains
+
+    def for_url(self, url: str) -> SiteAdapter:
+        return self._lookup(urlsplit(url).hostname or "").adapter
+
+    def parse(self, url: str, content: bytes) -> ParsedPrice | None:
+        chains = self._lookup(urlsplit(url).hostname or "")
+        parsed, path = self._extract(chains, content)
+        counts = self.counts.setdefault(chains.adapter.name, {})
+        counts[path] = counts.get(path, 0) + 1
+        return parsed
+
+    @staticmethod
+    def _extract(
+        chains: _Chains, content: bytes
+    ) -> tuple[ParsedPrice | None, str]:
+        adapter = chains.adapter
+        document = _Document(content)
+        parsed = (
+            extract_structured(content) if adapter.structured_data else None
+        )
+        path = STRUCTURED
+        if parsed is None:
+            raw = document.first(chains.price)
+            price: Decimal | None = parse_amount(raw) if raw else None
+            if price is None:
+                return None, MISS
+            parsed = ParsedPrice(price=price)
+            path = DOM if document.parsed else BYTES
+        if parsed.currency is None:
+            raw = document.first(chains.currency)
+            parsed.currency = (
+                parse_currency(raw) if raw else None
+            ) or adapter.default_currency
+        if parsed.in_stock is None:
+            raw = document.first(chains.in_stock)
+            parsed.in_stock = parse_availability(raw) if raw else None
+        return parsed, path
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        return {name: dict(counts) for name, counts in self.counts.items()}
+
+
+@lru_cache()
+def get_adapter_registry() -> AdapterRegistry:
+    from app.services.scraper.sites import SITE_ADAPTERS
+
+    registry = AdapterRegistry()
+    for adapter in SITE_ADAPTERS:
+        registry.register(adapter)
+    return registry
+
+
+def parse_page(url: str, content: bytes) -> ParsedPrice | None:
+    """
+    Extract a price from a product page with the adapter for its domain.
+    Runs in the worker's parse process pool, so it must stay picklable;
+    each process builds and compiles the registry once.
+    """
+    return get_adapter_registry().parse(url, content)
@@ -0,0 +1,240 @@
+import asyncio
+import logging
+from concurrent.futures import Executor
+from dataclasses import replace
+from datetime import datetime, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db.base import is_data_error
+from app.repositories.alert.repositories import SqlAlchemyAlertRepository
+from app.repositories.product import CrawlLease, PriceObservation
+from app.repositories.product.repositories import SqlAlchemyProductRepository
+from app.services.alert.matcher import PriceAlertMatcher
+from app.services.product.ingestion import PriceIngestionService
+from app.services.product.scheduler import CrawlScheduler
+from app.services.scraper.adapters import parse_page
+from app.services.scraper.service import ScraperService
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlWorker:
+    """
+    The fetch loop of one worker process.
+
+    Keeps up to ``concurrency`` crawls in flight: each leases a job from
+    the ``CrawlScheduler``, fetches it through the ``ScraperService`` and
+    hands the HTML to ``parse_executor`` (a process pool) so parsing never
+    blocks the event loop. Parsed prices are buffered and ingested in
+    batches through ``PriceIngestionService``, which matches the written
+    prices against price alerts in the same transaction (notifications
+    are held back for ``alert_delay`` seconds so the dispatcher can send
+    them as digests), after which the leases are completed with whether
+    the price changed.
+
+    Every ``report_interval`` seconds (if positive) the crawl queue's
+    backlog and lag and the worker's counters are logged.
+
+    ``run`` returns once ``stop`` is set and every in-flight crawl has
+    finished, been ingested and completed; jobs leased but not started
+    are handed back to the queue.
+    """
+
+    def __init__(
+        self,
+        scheduler: CrawlScheduler,
+        scraper: ScraperService,
+        parse_executor: Executor,
+        session_factory: async_sessionmaker[AsyncSession],
+        concurrency: int,
+        ingest_batch_size: int,
+        ingest_interval: float,
+        heartbeat: int,
+        alert_delay: int = 0,
+        report_interval: float = 0,
+    ):
+        self.scheduler = scheduler
+        self.scraper = scraper
+        self.parse_executor = parse_executor
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.ingest_batch_size = ingest_batch_size
+        self.ingest_interval = ingest_interval
+        self.heartbeat = heartbeat
+        self.alert_delay = alert_delay
+        self.report_interval = report_interval
+        self._buffer: list[tuple[CrawlLease, PriceObservation]] = []
+        self._flush_lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task] = set()
+        self.crawled = 0
+        self.failed = 0
+        self.written = 0
+        self.alerts = 0
+
+    async def run(self, stop: asyncio.Event) -> None:
+        await self.scheduler.ensure_schedules()
+        flusher = asyncio.create_task(self._flush_periodically(stop))
+        reporter = (
+            asyncio.create_task(self._report_periodically(stop))
+            if self.report_interval > 0
+            else None
+        )
+        slots = asyncio.Semaphore(self.concurrency)
+        try:
+            while not stop.is_set():
+                await slots.acquire()
+                if stop.is_set():
+                    # Stopped while waiting for a slot: lease nothing more.
+                    slots.release()
+                    break
+                try:
+                    lease = await self.scheduler.next_lease()
+                except Exception as e:
+                    logger.error(f"Could not lease crawl jobs: {e}")
+                    lease = None
+                    await asyncio.sleep(self.scheduler.poll_interval)
+                if lease is None:
+                    slots.release()
+                    continue
+                task = asyncio.create_task(self._crawl(lease))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+                task.add_done_callback(lambda _: slots.release())
+        finally:
+            # Drain: finish in-flight crawls, then write everything back.
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+            await flusher
+            if reporter is not None:
+                await reporter
+            await self.flush()
+            await self.scheduler.stop()
+
+    async def _crawl(self, lease: CrawlLease) -> None:
+        try:
+            observation = await self._observe(lease)
+        except Exception as e:
+            logger.error(f"Crawl of {lease.url} failed: {e}")
+            observation = None
+        if observation is None:
+            self.failed += 1
+            await self.scheduler.complete(lease, success=False)
+            return
+        self.crawled += 1
+        self._buffer.append((lease, observation))
+        if len(self._buffer) >= self.ingest_batch_size:
+            await self.flush()
+
+    async def _observe(self, lease: CrawlLease) -> PriceObservation | None:
+        result = await self.scraper.fetch(lease.url)
+        if result.ok and result.not_modified:
+            # Unchanged page: re-observe the last known price so the
+            # source's last_seen_at still moves.
+            last = PriceIngestionService.last_prices.get(lease.source_id)
+            if last is not None:
+                return replace(last, observed_at=datetime.now(timezone.utc))
+            # The price expired from the cache, or this process never
+            # wrote it: fetch the page in full rather than fail a source
+            # that answered fine.
+            result = await self.scraper.fetch(lease.url, conditional=False)
+        if not result.ok or result.not_modified:
+            return None
+        now = datetime.now(timezone.utc)
+
+        loop = asyncio.get_running_loop()
+        parsed = await loop.run_in_executor(
+            self.parse_executor, parse_page, lease.url, result.content
+        )
+        if parsed is None:
+            logger.warning(f"No price found on {lease.url}")
+            return None
+        return PriceObservation(
+            product_id=lease.product_id,
+            source_id=lease.source_id,
+            price=parsed.price,
+            currency=parsed.currency or "USD",
+            in_stock=parsed.in_stock,
+            observed_at=now,
+        )
+
+    async def flush(self) -> int:
+        async with self._flush_lock:
+            batch, self._buffer = self._buffer, []
+            if not batch:
+                return 0
+            return await self._ingest(batch)
+
+    async def _ingest(
+        self, batch: list[tuple[CrawlLease, PriceObservation]]
+    ) -> int:
+        try:
+            async with self.session_factory() as session:
+                report = await PriceIngestionService(
+                    SqlAlchemyProductRepository(session),
+                    self.heartbeat,
+                    matcher=PriceAlertMatcher(
+                        SqlAlchemyAlertRepository(session), self.alert_delay
+                    ),
+                ).ingest([observation for _, observation in batch])
+        except Exception as e:
+            if len(batch) > 1 and is_data_error(e):
+                # One row the database rejects fails the whole batch:
+                # halve it until the bad row is on its own.
+                middle = len(batch) // 2
+                written = await self._ingest(batch[:middle])
+                return written + await self._ingest(batch[middle:])
+            logger.error(f"Failed to ingest {len(batch)} prices: {e}")
+            for lease, _ in batch:
+                await self.scheduler.complete(lease, success=False)
+            return 0
+        self.written += report.written
+        self.alerts += len(report.triggered)
+        for lease, _ in batch:
+            await self.scheduler.complete(
+                lease,
+                success=True,
+                changed=lease.source_id in report.changed_sources,
+            )
+        return report.written
+
+    async def _flush_periodically(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(
+                    stop.wait(), timeout=self.ingest_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+            await self.scheduler.flush()
+
+    async def _report_periodically(self, stop: asyncio.Event) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    stop.wait(), timeout=self.report_interval
+                )
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                metrics = await self.scheduler.metrics()
+            except Exception as e:
+                logger.error(f"Could not read crawl queue metrics: {e}")
+                continue
+            logger.info(
+                f"Crawl queue: {metrics['due_backlog']} due, "
+                f"{metrics['lag_seconds']:.0f}s behind; "
+                f"scheduler {metrics}; worker {self.stats()}"
+            )
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "in_flight": len(self._tasks),
+            "buffered": len(self._buffer),
+            "crawled": self.crawled,
+            "failed": self.failed,
+            "written": self.written,
+            "alerts": self.alerts,
+        }
@@ -0,0 +1,239 @@
+import json
+import re
+from dataclasses import dataclass
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Any
+
+
+@dataclass(slots=True)
+class ParsedPrice:
+    price: Decimal
+    currency: str | None = None
+    in_stock: bool | None = None
+
+
+# Structured data is located on the raw bytes: only the matched
+# ``<script>`` bodies and ``<meta>`` tags are decoded, and no DOM is built.
+_JSON_LD = re.compile(
+    rb"<script[^>]+application/ld\+json[^>]*>(.*?)</script",
+    re.IGNORECASE | re.DOTALL,
+)
+_HEAD_END = re.compile(rb"</head\s*>|<body[\s>]", re.IGNORECASE)
+_META = re.compile(rb"<meta\s[^>]*>", re.IGNORECASE)
+_META_ATTRIBUTE = re.compile(
+    rb"""(property|name|itemprop|content)\s*=\s*(?:"([^"]*)"|'([^']*)')""",
+    re.IGNORECASE,
+)
+_META_PRICE = (b"og:price:amount", b"product:price:amount", b"price")
+_META_CURRENCY = (
+    b"og:price:currency",
+    b"product:price:currency",
+    b"pricecurrency",
+)
+_META_AVAILABILITY = (
+    b"og:availability",
+    b"product:availability",
+    b"availability",
+)
+
+_AMOUNT = re.compile(r"\d[\d.,]*")
+# Prices are stored as NUMERIC(12, 2).
+_CENT = Decimal("0.01")
+_MAX_PRICE = Decimal("9999999999.99")
+_CURRENCY_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP", "¥": "JPY"}
+_IN_STOCK = {
+    "instock",
+    "in stock",
+    "limitedavailability",
+    "onlineonly",
+    "instoreonly",
+    "true",
+}
+_OUT_OF_STOCK = {
+    "outofstock",
+    "out of stock",
+    "oos",
+    "soldout",
+    "sold out",
+    "discontinued",
+    "false",
+}
+
+
+def parse_decimal(raw: str) -> Decimal | None:
+    """
+    Parse ``1,299.00``/``1.299,00``/``1299`` style amounts, rounded to
+    cents. Amounts that are not positive or do not fit the price columns
+    are rejected, so one odd page cannot fail a whole ingest batch.
+    """
+    raw = raw.strip()
+    if "," in raw and "." in raw:
+        if raw.rfind(",") > raw.rfind("."):
+            raw = raw.replace(".", "").replace(",", ".")
+        else:
+            raw = raw.replace(",", "")
+    elif "," in raw:
+        whole, _, fraction = raw.rpartition(",")
+        raw = (
+            f"{whole.replace(',', '')}.{fraction}"
+            if len(fraction) != 3
+            else raw.replace(",", "")
+        )
+    try:
+        value = Decimal(raw)
+    except InvalidOperation:
+        return None
+    if not value.is_finite() or not 0 < value <= _MAX_PRICE:
+        return None
+    value = value.quantize(_CENT, rounding=ROUND_HALF_UP)
+    return value if value > 0 else None
+
+
+def parse_amount(text: str) -> Decimal | None:
+    """Parse the first amount in display text such as ``$1,299.00``."""
+    match = _AMOUNT.search(text)
+    return parse_decimal(match.group().rstrip(".,")) if match else None
+
+
+def parse_currency(text: str) -> str | None:
+    """Normalise an ISO code or a common currency symbol."""
+    text = text.strip()
+    if len(text) == 3 and text.isalpha():
+        return text.upper()
+    for symbol, code in _CURRENCY_SYMBOLS.items():
+        if symbol in text:
+            return code
+    return None
+
+
+def parse_availability(text: str) -> bool | None:
+    """Map schema.org availability URLs and common labels to a flag."""
+    value = text.strip().rsplit("/", 1)[-1].lower().replace("_", " ")
+    if value in _IN_STOCK:
+        return True
+    if value in _OUT_OF_STOCK:
+        return False
+    return None
+
+
+def _types(node: dict) -> list:
+    types = node.get("@type")
+    return types if isinstance(types, list) else [types]
+
+
+def _find_offer(node: Any, depth: int = 0) -> dict | None:
+    """Depth-first search for the first offer carrying a price."""
+    if depth > 8:
+        return None
+    if isinstance(node, list):
+        for item in node:
+            offer = _find_offer(item, depth + 1)
+            if offer is not None:
+                return offer
+        return None
+    if not isinstance(node, dict):
+        return None
+    types = _types(node)
+    if "Offer" in types or "AggregateOffer" in types:
+        if node.get("price") is not None or node.get("lowPrice") is not None:
+            return node
+        specification = node.get("priceSpecification")
+        if isinstance(specification, list) and specification:
+            specification = specification[0]
+        if isinstance(specification, dict) and specification.get("price"):
+            return {**specification, **node, "price": specification["price"]}
+        return None
+    for key in ("@graph", "offers", "mainEntity", "hasVariant"):
+        if key in node:
+            offer = _find_offer(node[key], depth + 1)
+            if offer is not None:
+                return offer
+    return None
+
+
+def _from_json_ld(content: bytes) -> ParsedPrice | None:
+    for match in _JSON_LD.finditer(content):
+        body = match.group(1).strip()
+        if body.startswith(b"<!--"):
+            body = body[4:].rsplit(b"-->", 1)[0]
+        try:
+            data = json.loads(body)
+        except ValueError:
+            continue
+        offer = _find_offer(data)
+        if offer is None:
+            continue
+        raw = offer.get("price", offer.get("lowPrice"))
+        price = (
+            parse_decimal(str(raw))
+            if isinstance(raw, (str, int, float))
+            else None
+        )
+        if price is None:
+            continue
+        currency = offer.get("priceCurrency")
+        availability = offer.get("availability")
+        return ParsedPrice(
+            price=price,
+            currency=(
+                parse_currency(currency) if isinstance(currency, str) else None
+            ),
+            in_stock=(
+                parse_availability(availability)
+                if isinstance(availability, str)
+                else None
+            ),
+        )
+    return None
+
+
+def _meta_tags(content: bytes) -> dict[bytes, str]:
+    head_end = _HEAD_END.search(content)
+    head = content if head_end is None else content[: head_end.start()]
+    tags: dict[bytes, str] = {}
+    for tag in _META.finditer(head):
+        key = value = None
+        for name, double, single in _META_ATTRIBUTE.findall(tag.group()):
+            text = double or single
+            if name.lower() == b"content":
+                value = text
+            else:
+                key = text.lower()
+        if key is not None and value is not None:
+            tags.setdefault(key, value.decode("utf-8", "ignore"))
+    return tags
+
+
+def _first_meta(
+    tags: dict[bytes, str], names: tuple[bytes, ...]
+) -> str | None:
+    for name in names:
+        if tags.get(name):
+            return tags[name]
+    return None
+
+
+def extract_structured(content: bytes) -> ParsedPrice | None:
+    """
+    Fast path: read the price from JSON-LD offers or from Open Graph /
+    microdata ``<meta>`` tags in the document head, whichever answers
+    first. Missing currency or availability on a JSON-LD offer is filled
+    in from the meta tags.
+    """
+    parsed = _from_json_ld(content)
+    if parsed is not None and parsed.currency and parsed.in_stock is not None:
+        return parsed
+    tags = _meta_tags(content)
+    if parsed is None:
+        raw = _first_meta(tags, _META_PRICE)
+        price = parse_amount(raw) if raw else None
+        if price is None:
+            return None
+        parsed = ParsedPrice(price=price)
+    if parsed.currency is None:
+        raw = _first_meta(tags, _META_CURRENCY)
+        parsed.currency = parse_currency(raw) if raw else None
+    if parsed.in_stock is None:
+        raw = _first_meta(tags, _META_AVAILABILITY)
+        parsed.in_stock = parse_availability(raw) if raw else None
+    return parsed
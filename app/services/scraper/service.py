@@ -0,0 +1,253 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import get_settings
+from app.services.scraper.throttle import DomainThrottle
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status_code: int | None = None
+    content: bytes | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    not_modified: bool = False
+    attempts: int = 0
+    elapsed: float = 0.0
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and (
+            self.not_modified
+            or (self.status_code is not None and self.status_code < 400)
+        )
+
+
+@dataclass
+class _Validators:
+    etag: str | None
+    last_modified: str | None
+
+
+class ScraperService:
+    """
+    Fetches pages over one shared, pooled ``httpx.AsyncClient``.
+
+    Requests are throttled per domain by a ``DomainThrottle``. Transport
+    errors and retryable statuses are retried with full-jitter exponential
+    backoff, honouring ``Retry-After``. ETag/Last-Modified validators of
+    successful responses are remembered, so the next fetch of the same URL
+    is conditional and an unchanged page comes back as an empty 304
+    (``FetchResult.not_modified``).
+    """
+
+    def __init__(
+        self,
+        throttle: DomainThrottle,
+        max_connections: int,
+        max_keepalive: int,
+        timeout: float,
+        user_agent: str,
+        max_retries: int,
+        backoff_base: float,
+        backoff_max: float,
+        validator_cache_size: int,
+        validator_ttl: int,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.throttle = throttle
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.validator_ttl = validator_ttl
+        self.validators: TTLCache[str, _Validators] = TTLCache(
+            max_size=validator_cache_size
+        )
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self.requests = 0
+        self.retries = 0
+        self.not_modified = 0
+        self.failures = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created lazily so the service can be built outside an event loop.
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive,
+                ),
+                timeout=self.timeout,
+                headers={"user-agent": self.user_agent},
+                follow_redirects=True,
+                transport=self._transport,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def fetch(self, url: str, conditional: bool = True) -> FetchResult:
+        """
+        Fetch ``url``. Never raises for network or HTTP errors; failures
+        are reported through ``FetchResult.error``.
+        """
+        domain = urlsplit(url).netloc
+        headers = self._conditional_headers(url) if conditional else {}
+        result = FetchResult(url=url)
+        started = time.perf_counter()
+
+        for attempt in range(self.max_retries + 1):
+            result.attempts = attempt + 1
+            retry_after = None
+            try:
+                async with self.throttle.slot(domain):
+                    self.requests += 1
+                    response = await self.client.get(url, headers=headers)
+            except httpx.TransportError as e:
+                result.error = f"{type(e).__name__}: {e}"
+            else:
+                result.status_code = response.status_code
+                if response.status_code not in RETRY_STATUSES:
+                    result.error = None
+                    self._complete(result, response)
+                    break
+                result.error = f"HTTP {response.status_code}"
+                retry_after = self._retry_after(response)
+                if retry_after is not None:
+                    self.throttle.back_off(domain, retry_after)
+
+            if attempt < self.max_retries:
+                self.retries += 1
+                await asyncio.sleep(
+                    retry_after
+                    if retry_after is not None
+                    else self._backoff(attempt)
+                )
+
+        if result.error is not None:
+            self.failures += 1
+            logger.warning(f"Giving up on {url}: {result.error}")
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    async def fetch_many(
+        self, urls: list[str], conditional: bool = True
+    ) -> list[FetchResult]:
+        """Fetch ``urls`` concurrently, subject to the per-domain limits."""
+        return await asyncio.gather(
+            *(self.fetch(url, conditional=conditional) for url in urls)
+        )
+
+    def _conditional_headers(self, url: str) -> dict[str, str]:
+        validators = self.validators.get(url)
+        if validators is None:
+            return {}
+        headers = {}
+        if validators.etag:
+            headers["if-none-match"] = validators.etag
+        if validators.last_modified:
+            headers["if-modified-since"] = validators.last_modified
+        return headers
+
+    def _complete(self, result: FetchResult, response: httpx.Response) -> None:
+        if response.status_code == 304:
+            result.not_modified = True
+            self.not_modified += 1
+            # Keep the validators we sent; refresh their lifetime.
+            validators = self.validators.get(result.url)
+            if validators is not None:
+                self._remember(result.url, validators)
+                result.etag = validators.etag
+                result.last_modified = validators.last_modified
+            return
+
+        result.content = response.content
+        result.etag = response.headers.get("etag")
+        result.last_modified = response.headers.get("last-modified")
+        if response.status_code == 200 and (
+            result.etag or result.last_modified
+        ):
+            self._remember(
+                result.url, _Validators(result.etag, result.last_modified)
+            )
+        elif response.status_code >= 400:
+            result.error = f"HTTP {response.status_code}"
+
+    def _remember(self, url: str, validators: _Validators) -> None:
+        self.validators.set(
+            url, validators, expires_at=time.time() + self.validator_ttl
+        )
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: spreads retries from many workers over the window.
+        return random.uniform(
+            0, min(self.backoff_max, self.backoff_base * 2**attempt)
+        )
+
+    def _retry_after(self, response: httpx.Response) -> float | None:
+        value = response.headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            seconds = float(value)
+        except ValueError:
+            try:
+                seconds = (
+                    parsedate_to_datetime(value).timestamp() - time.time()
+                )
+            except (TypeError, ValueError):
+                return None
+        return min(max(seconds, 0.0), self.backoff_max)
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "not_modified": self.not_modified,
+            "failures": self.failures,
+            "domains": self.throttle.stats(),
+        }
+
+
+@lru_cache()
+def get_scraper_service() -> ScraperService:
+    settings = get_settings()
+    return ScraperService(
+        throttle=DomainThrottle(
+            concurrency=settings.scraper_per_domain_concurrency,
+            delay=settings.scraper_per_domain_delay_seconds,
+        ),
+        max_connections=settings.scraper_max_connections,
+        max_keepalive=settings.scraper_max_keepalive_connections,
+        timeout=settings.scraper_timeout_seconds,
+        user_agent=settings.scraper_user_agent,
+        max_retries=settings.scraper_max_retries,
+        backoff_base=settings.scraper_backoff_base_seconds,
+        backoff_max=settings.scraper_backoff_max_seconds,
+        validator_cache_size=settings.scraper_validator_cache_size,
+        validator_ttl=settings.scraper_validator_ttl_seconds,
+    )
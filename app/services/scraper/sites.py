@@ -0,0 +1,29 @@
+"""
+Per-retailer extraction rules.
+
+Domains without an adapter here are read from their JSON-LD / meta tags
+and then the generic rules in ``app.services.scraper.adapters``. Declare
+an adapter when a retailer's structured data is missing or wrong::
+
+    SiteAdapter(
+        name="example",
+        domains=("example.com", "example.co.uk"),
+        price=(
+            RegexRule(rb'data-price-amount="([\\d.]+)"'),
+            CssRule("#buybox .price-now"),
+        ),
+        in_stock=(XPathRule("//link[@itemprop='availability']/@href"),),
+        default_currency="USD",
+    )
+
+Byte-level ``RegexRule``s need nothing beyond the standard library;
+``CssRule`` and ``XPathRule`` need ``lxml`` (and ``cssselect`` for CSS),
+installed with the ``parsing`` extra.
+
+The registry ships empty: which retailers need rules is a deployment
+decision, and the structured-data and generic rules cover the rest.
+"""
+
+from app.services.scraper.adapters import SiteAdapter
+
+SITE_ADAPTERS: tuple[SiteAdapter, ...] = ()
@@ -0,0 +1,65 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable
+
+
+class _DomainState:
+    def __init__(self, concurrency: int):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.lock = asyncio.Lock()
+        self.next_start = 0.0
+        self.active = 0
+        self.peak = 0
+
+
+class DomainThrottle:
+    """
+    Per-domain politeness: at most ``concurrency`` requests in flight to a
+    domain, and request starts to the same domain spaced at least ``delay``
+    seconds apart. Different domains never wait on each other.
+    """
+
+    def __init__(
+        self,
+        concurrency: int,
+        delay: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.concurrency = concurrency
+        self.delay = delay
+        self._clock = clock
+        self._domains: dict[str, _DomainState] = {}
+
+    def _state(self, domain: str) -> _DomainState:
+        state = self._domains.get(domain)
+        if state is None:
+            state = self._domains[domain] = _DomainState(self.concurrency)
+        return state
+
+    @asynccontextmanager
+    async def slot(self, domain: str) -> AsyncIterator[None]:
+        state = self._state(domain)
+        async with state.semaphore:
+            async with state.lock:
+                wait = state.next_start - self._clock()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                state.next_start = self._clock() + self.delay
+            state.active += 1
+            state.peak = max(state.peak, state.active)
+            try:
+                yield
+            finally:
+                state.active -= 1
+
+    def back_off(self, domain: str, seconds: float) -> None:
+        """Hold off new requests to ``domain`` (e.g. after a 429)."""
+        state = self._state(domain)
+        state.next_start = max(state.next_start, self._clock() + seconds)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        return {
+            domain: {"active": state.active, "peak": state.peak}
+            for domain, state in self._domains.items()
+        }
@@ -0,0 +1,221 @@
+import asyncio
+import csv
+import itertools
+import json
+from concurrent.futures import Executor, ProcessPoolExecutor
+from enum import Enum
+from functools import lru_cache
+from typing import Iterator, TextIO
+
+from fastapi import Depends
+from pydantic import ValidationError
+
+from app.core.config import get_settings
+from app.models.auth import User
+from app.repositories.auth import AuthProtocol, get_auth_repository
+from app.schemas import (
+    CreateUserSchema,
+    UserImportReportSchema,
+    UserImportRowErrorSchema,
+)
+from app.utils.hashing import hash_passwords
+
+
+class UserImportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+    @classmethod
+    def from_filename(cls, filename: str | None) -> "UserImportFormat":
+        if filename and filename.lower().endswith((".ndjson", ".jsonl")):
+            return cls.NDJSON
+        return cls.CSV
+
+
+def iter_rows(
+    stream: TextIO, fmt: UserImportFormat
+) -> Iterator[tuple[int, dict | None]]:
+    """
+    Lazily yield ``(line_number, row)`` pairs from a CSV (with a header
+    row) or NDJSON stream. Unparseable NDJSON lines yield ``None``.
+    """
+    if fmt is UserImportFormat.CSV:
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            yield line_number, None
+            continue
+        yield line_number, row if isinstance(row, dict) else None
+
+
+class UserImportService:
+    """
+    Streams users from CSV/NDJSON input into the database in chunks.
+
+    Each chunk's passwords are hashed in parallel on a process pool, then
+    written with one batched insert per chunk. Inserting a chunk overlaps
+    with parsing and hashing the next one. The input is read on a worker
+    thread, a chunk at a time, since an upload spooled to disk would
+    otherwise block the event loop. Invalid rows and rows that clash with
+    existing accounts are reported without aborting the import.
+    """
+
+    def __init__(
+        self,
+        auth_repo: AuthProtocol,
+        executor: Executor,
+        workers: int,
+        chunk_size: int,
+    ):
+        self.auth_repo = auth_repo
+        self.executor = executor
+        self.workers = workers
+        self.chunk_size = chunk_size
+
+    async def import_stream(
+        self, stream: TextIO, fmt: UserImportFormat
+    ) -> UserImportReportSchema:
+        report = UserImportReportSchema()
+        chunk: list[tuple[int, CreateUserSchema]] = []
+        pending: asyncio.Task | None = None
+
+        rows = iter_rows(stream, fmt)
+        while batch := await asyncio.to_thread(
+            list, itertools.islice(rows, self.chunk_size)
+        ):
+            for line_number, row in batch:
+                report.total += 1
+                schema = self._validate(line_number, row, report)
+                if schema is None:
+                    continue
+                chunk.append((line_number, schema))
+                if len(chunk) >= self.chunk_size:
+                    pending = await self._submit(chunk, pending, report)
+                    chunk = []
+
+        if chunk:
+            pending = await self._submit(chunk, pending, report)
+        if pending is not None:
+            await pending
+        return report
+
+    def _validate(
+        self,
+        line_number: int,
+        row: dict | None,
+        report: UserImportReportSchema,
+    ) -> CreateUserSchema | None:
+        if row is None:
+            report.invalid.append(
+                UserImportRowErrorSchema(
+                    line=line_number, reason="Malformed row"
+                )
+            )
+            return None
+        try:
+            return CreateUserSchema.model_validate(
+                {key: value for key, value in row.items() if value != ""}
+            )
+        except ValidationError as e:
+            report.invalid.append(
+                UserImportRowErrorSchema(
+                    line=line_number,
+                    email=row.get("email"),
+                    reason="; ".join(
+                        f"{'.'.join(map(str, err['loc']))}: {err['msg']}"
+                        for err in e.errors()
+                    ),
+                )
+            )
+            return None
+
+    async def _submit(
+        self,
+        chunk: list[tuple[int, CreateUserSchema]],
+        pending: asyncio.Task | None,
+        report: UserImportReportSchema,
+    ) -> asyncio.Task:
+        hashes = await self._hash(
+            [schema.hashed_password for _, schema in chunk]
+        )
+        # Only one insert may run on the session at a time.
+        if pending is not None:
+            await pending
+        return asyncio.create_task(self._insert(chunk, hashes, report))
+
+    async def _hash(self, passwords: list[str]) -> list[str]:
+        loop = asyncio.get_running_loop()
+        size = -(-len(passwords) // self.workers)
+        parts = [
+            passwords[i : i + size] for i in range(0, len(passwords), size)
+        ]
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(self.executor, hash_passwords, part)
+                for part in parts
+            )
+        )
+        return [hashed for part in results for hashed in part]
+
+    async def _insert(
+        self,
+        chunk: list[tuple[int, CreateUserSchema]],
+        hashes: list[str],
+        report: UserImportReportSchema,
+    ) -> None:
+        users = [
+            User(
+                email=schema.email,
+                username=schema.username,
+                full_name=schema.full_name,
+                hashed_password=hashed,
+            )
+            for (_, schema), hashed in zip(chunk, hashes)
+        ]
+        created = {
+            user.email for user in await self.auth_repo.create_many(users)
+        }
+        report.created += len(created)
+        for line_number, schema in chunk:
+            if schema.email in created:
+                # Later duplicates of the same email in the chunk conflict.
+                created.discard(schema.email)
+                continue
+            report.conflicts.append(
+                UserImportRowErrorSchema(
+                    line=line_number,
+                    email=schema.email,
+                    reason="Email or username already exists",
+                )
+            )
+
+
+@lru_cache()
+def get_user_import_executor() -> ProcessPoolExecutor:
+    """
+    The process pool imports hash passwords on: created on first use,
+    shared by every import in the process, and shut down by the app's
+    lifespan.
+    """
+    return ProcessPoolExecutor(max_workers=get_settings().user_import_workers)
+
+
+async def get_user_import_service(
+    auth_repo: AuthProtocol = Depends(get_auth_repository),
+) -> UserImportService:
+    settings = get_settings()
+    return UserImportService(
+        auth_repo=auth_repo,
+        executor=get_user_import_executor(),
+        workers=settings.user_import_workers,
+        chunk_size=settings.user_import_chunk_size,
+    )
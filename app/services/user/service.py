@@ -12,7 +12,7 @@ class UserService:
 
     async def create_user(self, user: CreateUserSchema) -> User:
         user_data = user.model_dump()
-        user_data["hashed_password"] = Security.hash_password(
+        user_data["hashed_password"] = await Security.hash_password_async(
             user_data["hashed_password"]
         )
         return await self.auth_repo.create(User(**user_data))
@@ -20,6 +20,9 @@ class UserService:
     async def get_user_by_email(self, email: str) -> User | None:
         return await self.auth_repo.get_by_email(email)
 
+    async def get_user_for_login(self, email: str) -> User | None:
+        return await self.auth_repo.get_for_login(email)
+
     async def get_user_by_id(self, user_id: int) -> User | None:
         return await self.auth_repo.get_by_id(user_id)
 
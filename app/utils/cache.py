@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded, thread-safe LRU cache whose entries carry their own expiry.
+
+    Each entry expires at the absolute UNIX timestamp given to ``set``;
+    expired entries are never returned and are dropped lazily on access or
+    when they reach the LRU end. When the cache is full the least recently
+    used entry is evicted.
+    """
+
+    def __init__(self, max_size: int, clock: Callable[[], float] = time.time):
+        self.max_size = max_size
+        self._clock = clock
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: K, value: V, expires_at: float) -> None:
+        if self.max_size <= 0 or expires_at <= self._clock():
+            return
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._evict_one()
+
+    def delete(self, key: K) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[K, V], bool]) -> int:
+        with self._lock:
+            keys = [k for k, (_, v) in self._data.items() if predicate(k, v)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _evict_one(self) -> None:
+        key, (expires_at, _) = next(iter(self._data.items()))
+        del self._data[key]
+        if expires_at <= self._clock():
+            self.expirations += 1
+        else:
+            self.evictions += 1
+
+
+class ExpiringMap(Generic[K, V]):
+    """
+    Thread-safe map whose entries carry their own expiry and are never
+    evicted early. For state that must hold until it expires, however
+    many entries there are (e.g. revocations); use ``TTLCache`` for
+    anything that can be recomputed.
+
+    Expired entries are never returned and are dropped on ``set``.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._data: dict[K, tuple[float, V]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> V | None:
+        entry = self._data.get(key)
+        if entry is None or entry[0] <= self._clock():
+            return None
+        return entry[1]
+
+    def set(self, key: K, value: V, expires_at: float) -> None:
+        now = self._clock()
+        with self._lock:
+            for expired in [
+                k for k, (at, _) in self._data.items() if at <= now
+            ]:
+                del self._data[expired]
+            if expires_at > now:
+                self._data[key] = (expires_at, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,145 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+
+from passlib.context import CryptContext
+
+from app.core.exceptions import PasswordHasherBusyException
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def _hash(password: str) -> tuple[float, str]:
+    # Module-level so it can be pickled into a process pool. Returns the
+    # time the worker picked the job up, to measure queue wait.
+    return time.perf_counter(), pwd_context.hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> tuple[float, bool]:
+    return time.perf_counter(), pwd_context.verify(
+        plain_password, hashed_password
+    )
+
+
+def _load_backend() -> str:
+    return pwd_context.handler().get_backend()
+
+
+class PasswordHasher:
+    """
+    Async facade that runs bcrypt hashing and verification on a bounded
+    thread or process pool instead of the event loop.
+
+    bcrypt releases the GIL, so a thread pool scales across cores without
+    the pickling overhead of processes. At most ``max_pending`` jobs may be
+    queued or running; beyond that ``PasswordHasherBusyException`` is raised
+    so callers can shed load instead of piling up requests.
+    """
+
+    def __init__(
+        self, executor: str = "thread", workers: int = 4, max_pending: int = 64
+    ):
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown password hash executor: {executor}")
+        self.executor_type = executor
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._submitted = 0
+        self._rejected = 0
+        self._completed = 0
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.executor_type == "process":
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=self.workers
+                        )
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.workers,
+                            thread_name_prefix="bcrypt",
+                        )
+        return self._executor
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(_verify, plain_password, hashed_password)
+
+    async def _run(self, func, *args):
+        if self._pending >= self.max_pending:
+            self._rejected += 1
+            raise PasswordHasherBusyException(self._pending)
+
+        self._pending += 1
+        self._submitted += 1
+        submitted_at = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            started_at, result = await loop.run_in_executor(
+                self.executor, func, *args
+            )
+        finally:
+            self._pending -= 1
+
+        wait = max(started_at - submitted_at, 0.0)
+        self._completed += 1
+        self._queue_wait_total += wait
+        self._queue_wait_max = max(self._queue_wait_max, wait)
+        return result
+
+    async def warm(self) -> None:
+        """
+        Load the bcrypt backend, which passlib picks and self-tests on first
+        use, so the first login does not pay for it. With a process pool
+        every worker is started and loads its own.
+        """
+        loop = asyncio.get_running_loop()
+        jobs = 1
+        if self.executor_type == "process":
+            # This process needs it too, for the synchronous helpers.
+            await asyncio.to_thread(_load_backend)
+            jobs = self.workers
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(self.executor, _load_backend)
+                for _ in range(jobs)
+            )
+        )
+
+    def stats(self) -> dict[str, float | int | str]:
+        return {
+            "executor": self.executor_type,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "submitted": self._submitted,
+            "rejected": self._rejected,
+            "completed": self._completed,
+            "queue_wait_seconds_total": self._queue_wait_total,
+            "queue_wait_seconds_max": self._queue_wait_max,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+def hash_passwords(passwords: list[str]) -> list[str]:
+    """Hash a batch of passwords; meant to run inside a process pool."""
+    return [pwd_context.hash(password) for password in passwords]
@@ -0,0 +1,89 @@
+import asyncio
+import ipaddress
+import socket
+from urllib.parse import urlsplit
+
+from app.core.exceptions import UnsafeURLException
+
+
+def is_public_address(address: str) -> bool:
+    """
+    Whether ``address`` is a globally routable unicast address: not
+    private, loopback, link-local, shared, reserved or unspecified.
+    """
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    return ip.is_global and not ip.is_multicast
+
+
+def check_public_url(url: str) -> tuple[str, int]:
+    """
+    Check what can be checked without DNS: ``url`` is HTTPS, has a host,
+    and that host, if it is an IP address, is public.
+
+    Returns:
+        The host and port to resolve.
+
+    Raises:
+        UnsafeURLException: if any check fails.
+    """
+    parts = urlsplit(url)
+    if parts.scheme != "https":
+        raise UnsafeURLException(url, "only https URLs are allowed")
+    try:
+        port = parts.port or 443
+    except ValueError:
+        raise UnsafeURLException(url, "the port is invalid")
+    host = parts.hostname
+    if not host:
+        raise UnsafeURLException(url, "the URL has no host")
+    try:
+        public = is_public_address(host)
+    except ValueError:
+        # A name; resolve_public_url() checks where it points.
+        return host, port
+    if not public:
+        raise UnsafeURLException(url, f"{host} is not a public address")
+    return host, port
+
+
+async def resolve_public_host(host: str, port: int) -> str:
+    """
+    Resolve ``host`` and check that every address it resolves to is
+    public, so a name cannot smuggle in an internal destination.
+
+    Returns:
+        One of the checked addresses, for the caller to connect to, so a
+        second lookup cannot return a different answer (DNS rebinding).
+
+    Raises:
+        UnsafeURLException: if the name resolves to a non-public address.
+        OSError: if the name cannot be resolved.
+    """
+    infos = await asyncio.get_running_loop().getaddrinfo(
+        host, port, type=socket.SOCK_STREAM
+    )
+    addresses = [info[4][0] for info in infos]
+    for address in addresses:
+        if not is_public_address(address):
+            raise UnsafeURLException(
+                host, f"{host} resolves to non-public address {address}"
+            )
+    if not addresses:
+        raise OSError(f"{host} did not resolve")
+    return addresses[0]
+
+
+async def resolve_public_url(url: str) -> str:
+    """
+    ``check_public_url`` followed by ``resolve_public_host``.
+
+    Raises:
+        UnsafeURLException: if the URL fails ``check_public_url`` or the
+            name resolves to a non-public address.
+        OSError: if the name cannot be resolved.
+    """
+    host, port = check_public_url(url)
+    try:
+        return await resolve_public_host(host, port)
+    except UnsafeURLException as e:
+        raise UnsafeURLException(url, e.reason) from None
@@ -1,61 +1,173 @@
+import hashlib
+import secrets
+import time
 from datetime import datetime, timedelta, timezone
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 
 from app.core.config import get_settings
+from app.utils.cache import ExpiringMap, TTLCache
+from app.utils.hashing import PasswordHasher, pwd_context
+from app.utils.metrics import Family, registry
 
 settings = get_settings()
 
+security_time = registry.histogram(
+    "security_operation_seconds",
+    "Time spent hashing and verifying passwords (including the hasher's "
+    "queue) and encoding and decoding JWTs",
+    ("operation",),
+)
+
 
 class Security:
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    pwd_context = pwd_context
+    password_hasher = PasswordHasher(
+        executor=settings.password_hash_executor,
+        workers=settings.password_hash_workers,
+        max_pending=settings.password_hash_max_pending,
+    )
+    token_cache: TTLCache[str, dict] = TTLCache(
+        max_size=settings.token_cache_max_size
+    )
+    # Subject -> tokens issued up to this UNIX second are rejected. Never
+    # evicted before the access tokens it covers have expired.
+    revoked_subjects: ExpiringMap[str, int] = ExpiringMap()
     oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
     @classmethod
     def hash_password(cls, password: str) -> str:
-        return cls.pwd_context.hash(password)
+        with security_time.time("bcrypt_hash"):
+            return cls.pwd_context.hash(password)
 
     @classmethod
     def verify_password(
         cls, plain_password: str, hashed_password: str
     ) -> bool:
-        return cls.pwd_context.verify(plain_password, hashed_password)
+        with security_time.time("bcrypt_verify"):
+            return cls.pwd_context.verify(plain_password, hashed_password)
+
+    @classmethod
+    async def hash_password_async(cls, password: str) -> str:
+        with security_time.time("bcrypt_hash"):
+            return await cls.password_hasher.hash(password)
+
+    @classmethod
+    async def verify_password_async(
+        cls, plain_password: str, hashed_password: str
+    ) -> bool:
+        with security_time.time("bcrypt_verify"):
+            return await cls.password_hasher.verify(
+                plain_password, hashed_password
+            )
 
     @classmethod
     def create_access_token(
         cls,
         data: dict,
     ) -> str:
+        started = time.perf_counter()
         to_encode = data.copy()
-        expire = datetime.now(timezone.utc) + timedelta(
+        now = datetime.now(timezone.utc)
+        expire = now + timedelta(
             minutes=settings.jwt_access_token_expire_minutes
         )
-        to_encode.update({"exp": expire})
+        to_encode.update({"exp": expire, "iat": int(now.timestamp())})
         encoded_jwt = jwt.encode(
             to_encode,
             key=settings.jwt_secret_key,
             algorithm=settings.jwt_algorithm,
         )
+        security_time.observe(time.perf_counter() - started, "jwt_encode")
         return encoded_jwt
 
+    @classmethod
+    def create_refresh_token(cls) -> tuple[str, str, datetime]:
+        """
+        Generate an opaque refresh token. Returns the token, the digest to
+        store in its place and its expiry.
+        """
+        token = secrets.token_urlsafe(48)
+        expires_at = datetime.now(timezone.utc) + timedelta(
+            days=settings.jwt_refresh_token_expire_days
+        )
+        return token, cls.refresh_token_digest(token), expires_at
+
+    @staticmethod
+    def refresh_token_digest(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    @staticmethod
+    def _token_digest(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    @classmethod
+    def invalidate_token(cls, token: str) -> None:
+        """Drop a token from the verified-token cache (e.g. on revocation)."""
+        cls.token_cache.delete(cls._token_digest(token))
+
+    @classmethod
+    def invalidate_subject(cls, subject: str) -> int:
+        """
+        Drop every cached token issued to ``subject`` and, in this process,
+        reject the access tokens issued to it so far until they would have
+        expired (e.g. when its refresh tokens are revoked or the account is
+        deactivated). Returns the number of cached tokens dropped.
+        """
+        now = time.time()
+        cls.revoked_subjects.set(
+            subject,
+            int(now),
+            expires_at=now + settings.jwt_access_token_expire_minutes * 60,
+        )
+        return cls.token_cache.delete_where(
+            lambda _, payload: payload.get("sub") == subject
+        )
+
+    @classmethod
+    def _revoked(cls, payload: dict) -> bool:
+        revoked_at = cls.revoked_subjects.get(payload.get("sub"))
+        # ``iat`` is whole seconds, so a token from the revoking second
+        # may predate the revocation; reject it too.
+        return revoked_at is not None and payload.get("iat", 0) <= revoked_at
+
     @classmethod
     def verify_token(cls, token: str = Depends(oauth2_scheme)) -> dict:
+        digest = cls._token_digest(token)
+        cached = cls.token_cache.get(digest)
+        if cached is not None:
+            if cls._revoked(cached):
+                cls.token_cache.delete(digest)
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Could not validate credentials",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            return dict(cached)
+        started = time.perf_counter()
         try:
             payload = jwt.decode(
                 token=token,
                 key=settings.jwt_secret_key,
                 algorithms=[settings.jwt_algorithm],
             )
+            security_time.observe(time.perf_counter() - started, "jwt_decode")
             email: str | None = payload.get("sub", None)
-            if email is None:
+            if email is None or cls._revoked(payload):
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Could not validate credentials",
                     headers={"WWW-Authenticate": "Bearer"},
                 )
+            if "perms" in payload:
+                # Membership checks in require_permission stay O(1).
+                payload["perms"] = frozenset(payload["perms"])
+            if "exp" in payload:
+                cls.token_cache.set(
+                    digest, dict(payload), expires_at=float(payload["exp"])
+                )
             return payload
         except JWTError:
             raise HTTPException(
@@ -63,3 +175,38 @@ class Security:
                 detail="Could not validate credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+
+
+@registry.register_collector
+def _collect_security() -> list[Family]:
+    hasher = Security.password_hasher.stats()
+    cache = Security.token_cache.stats()
+    return [
+        (
+            "password_hasher_pending",
+            "gauge",
+            "Password hash jobs queued or running",
+            [({}, hasher["pending"])],
+        ),
+        (
+            "password_hasher_rejected_total",
+            "counter",
+            "Password hash jobs refused because the queue was full",
+            [({}, hasher["rejected"])],
+        ),
+        (
+            "password_hasher_queue_wait_seconds_total",
+            "counter",
+            "Time password hash jobs spent queued for a worker",
+            [({}, hasher["queue_wait_seconds_total"])],
+        ),
+        (
+            "token_cache_requests_total",
+            "counter",
+            "Verified-token cache lookups by result",
+            [
+                ({"result": "hit"}, cache["hits"]),
+                ({"result": "miss"}, cache["misses"]),
+            ],
+        ),
+    ]
@@ -0,0 +1,160 @@
+"""
+Run the scraper workers: N processes, each with its own async fetch loop
+and a process pool for HTML parsing.
+
+Usage:
+    python -m app.worker
+    python -m app.worker --processes 4 --concurrency 64 --parse-workers 2
+
+SIGINT/SIGTERM stop leasing new jobs; in-flight crawls are finished and
+written back before the processes exit.
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app.core.config import get_settings
+
+logger = logging.getLogger("app.worker")
+
+
+async def run_process(index: int, args: argparse.Namespace) -> None:
+    # Imported here so every spawned process builds its own engine and
+    # connection pool from the same Settings.
+    from app.db.base import SessionLocal, get_engine, get_pool_maintainer
+    from app.services.product.ingestion import PriceIngestionService
+    from app.services.product.partitions import price_partition_maintainer
+    from app.services.product.scheduler import get_crawl_scheduler
+    from app.services.scraper import get_scraper_service
+    from app.services.scraper.crawler import CrawlWorker
+
+    settings = get_settings()
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    scraper = get_scraper_service()
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    with ProcessPoolExecutor(
+        max_workers=args.parse_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as parse_executor:
+        worker = CrawlWorker(
+            scheduler=get_crawl_scheduler(owner=owner),
+            scraper=scraper,
+            parse_executor=parse_executor,
+            session_factory=SessionLocal,
+            concurrency=args.concurrency,
+            ingest_batch_size=settings.worker_ingest_batch_size,
+            ingest_interval=settings.worker_ingest_interval_seconds,
+            heartbeat=settings.price_heartbeat_seconds,
+            alert_delay=settings.notification_digest_window_seconds,
+            report_interval=settings.worker_report_interval_seconds,
+        )
+        logger.info(f"Worker {index} ({owner}) started")
+        await get_pool_maintainer().start()
+        # Prices are written here, so partitions must be kept ahead here
+        # too, not only by the API.
+        await price_partition_maintainer.check()
+        await price_partition_maintainer.start()
+        # Each process has its own last-price cache; a cold one would
+        # rewrite every unchanged price it sees until the heartbeat.
+        try:
+            async with SessionLocal() as session:
+                warmed = await PriceIngestionService.warm(
+                    session, settings.price_heartbeat_seconds
+                )
+            logger.info(f"Worker {index} loaded {warmed} last prices")
+        except Exception as e:
+            logger.warning(f"Could not warm the last-price cache: {e}")
+        try:
+            await worker.run(stop)
+        finally:
+            await price_partition_maintainer.stop()
+            await scraper.aclose()
+            await get_pool_maintainer().stop()
+            await get_engine().dispose()
+            logger.info(f"Worker {index} stopped: {worker.stats()}")
+
+
+def _process_main(index: int, args: argparse.Namespace) -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(processName)s %(levelname)s %(message)s",
+    )
+    # The parent forwards shutdown; a terminal Ctrl-C also reaches us
+    # directly through the process group.
+    asyncio.run(run_process(index, args))
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--processes", type=int, default=settings.worker_processes
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.worker_concurrency,
+        help="In-flight crawls per process",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=settings.worker_parse_workers,
+        help="HTML parsing processes per worker process",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(
+            target=_process_main, args=(i, args), name=f"worker-{i}"
+        )
+        for i in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    deadline: float | None = None
+
+    def shutdown(signum: int, _frame) -> None:
+        nonlocal deadline
+        if deadline is not None:
+            return
+        logger.info(f"Received signal {signum}, draining workers")
+        deadline = time.monotonic() + settings.worker_shutdown_timeout_seconds
+        for process in processes:
+            if process.is_alive() and process.pid is not None:
+                os.kill(process.pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    while any(process.is_alive() for process in processes):
+        for process in processes:
+            process.join(0.5)
+        if deadline is not None and time.monotonic() > deadline:
+            for process in processes:
+                if process.is_alive():
+                    logger.warning(
+                        f"{process.name} did not stop in time, killing"
+                    )
+                    process.kill()
+                    process.join()
+    sys.exit(max((process.exitcode or 0) for process in processes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Price alert matching benchmark: indexed matching against a full scan.
+
+Creates ``--products`` products and ``--alerts`` alerts spread over
+``--users`` users, then runs ``--rounds`` rounds in which ``--batch``
+random products get a new price. Each round is matched twice:
+
+    scan     load every active alert and compare it with the batch in
+             Python (what matching costs without an index)
+    indexed  ``PriceAlertMatcher.match``: one probe of the
+             ``(product_id, target_price)`` index per changed product,
+             firing alerts and writing outbox rows in the same statement
+
+The indexed pass is then repeated with the same batch to check that no
+alert fires twice. Reports changes/s for both, alerts fired and the most
+pending notifications any alert has (should be 1).
+
+Runs against the database configured in ``.env`` (migrated); the rows it
+writes are deleted afterwards.
+
+Usage:
+    python -m benchmarks.alert_matching --products 5000 --alerts 100000 \\
+        --batch 500 --rounds 10
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from decimal import Decimal
+
+from sqlalchemy import delete, func, insert, select, text
+
+from app.db.base import SessionLocal
+from app.models.alert import Notification, PriceAlert
+from app.models.auth import User
+from app.models.product import Product
+from app.repositories.alert.repositories import SqlAlchemyAlertRepository
+from app.repositories.product import PriceObservation
+from app.services.alert.matcher import PriceAlertMatcher
+
+CHUNK = 10000
+
+
+async def _setup(
+    products: int, users: int, alerts: int
+) -> tuple[list[int], list[int]]:
+    run = uuid.uuid4().hex[:12]
+    async with SessionLocal() as session:
+        product_ids = list(
+            (
+                await session.execute(
+                    insert(Product).returning(Product.id),
+                    [
+                        {"name": f"bench-{run}-{i}", "is_active": True}
+                        for i in range(products)
+                    ],
+                )
+            ).scalars()
+        )
+        user_ids = list(
+            (
+                await session.execute(
+                    insert(User).returning(User.id),
+                    [
+                        {"email": f"bench-{run}-{i}@example.com"}
+                        for i in range(users)
+                    ],
+                )
+            ).scalars()
+        )
+        pairs: set[tuple[int, int]] = set()
+        while len(pairs) < min(alerts, products * users):
+            pairs.add((random.choice(user_ids), random.choice(product_ids)))
+        rows = [
+            {
+                "user_id": user_id,
+                "product_id": product_id,
+                "target_price": Decimal(random.randint(5000, 10000)) / 100,
+                "currency": "USD",
+                "channel": "email",
+                "is_active": True,
+            }
+            for user_id, product_id in pairs
+        ]
+        for i in range(0, len(rows), CHUNK):
+            await session.execute(insert(PriceAlert), rows[i : i + CHUNK])
+        await session.commit()
+        # Fresh statistics, so the planner sees how selective the index is.
+        await session.execute(text("ANALYZE price_alerts"))
+    return product_ids, user_ids
+
+
+async def _cleanup(product_ids: list[int], user_ids: list[int]) -> None:
+    async with SessionLocal() as session:
+        await session.execute(
+            delete(Notification).where(Notification.user_id.in_(user_ids))
+        )
+        await session.execute(
+            delete(PriceAlert).where(PriceAlert.user_id.in_(user_ids))
+        )
+        await session.execute(delete(User).where(User.id.in_(user_ids)))
+        await session.execute(
+            delete(Product).where(Product.id.in_(product_ids))
+        )
+        await session.commit()
+
+
+async def _scan(observations: list[PriceObservation]) -> int:
+    lowest = PriceAlertMatcher.lowest_prices(observations)
+    async with SessionLocal() as session:
+        result = await session.execute(
+            select(
+                PriceAlert.product_id,
+                PriceAlert.currency,
+                PriceAlert.target_price,
+                PriceAlert.notified_price,
+            ).where(PriceAlert.is_active.is_(True))
+        )
+        matched = 0
+        for product_id, currency, target, notified in result.all():
+            price = lowest.get((product_id, currency))
+            if (
+                price is not None
+                and price <= target
+                and (notified is None or price < notified)
+            ):
+                matched += 1
+    return matched
+
+
+async def _match(observations: list[PriceObservation]) -> int:
+    async with SessionLocal() as session:
+        matcher = PriceAlertMatcher(SqlAlchemyAlertRepository(session))
+        return len(await matcher.match(observations))
+
+
+async def run(
+    products: int, users: int, alerts: int, batch: int, rounds: int
+) -> dict:
+    product_ids, user_ids = await _setup(products, users, alerts)
+    scan_elapsed = indexed_elapsed = 0.0
+    scanned = fired = repeated = 0
+    try:
+        for _ in range(rounds):
+            observations = [
+                PriceObservation(
+                    product_id=product_id,
+                    source_id=0,
+                    price=Decimal(random.randint(4000, 12000)) / 100,
+                    currency="USD",
+                    in_stock=True,
+                )
+                for product_id in random.sample(
+                    product_ids, min(batch, products)
+                )
+            ]
+            started = time.perf_counter()
+            scanned += await _scan(observations)
+            scan_elapsed += time.perf_counter() - started
+
+            started = time.perf_counter()
+            fired += await _match(observations)
+            indexed_elapsed += time.perf_counter() - started
+
+            repeated += await _match(observations)
+
+        async with SessionLocal() as session:
+            most_pending = (
+                await session.execute(
+                    select(func.count())
+                    .select_from(Notification)
+                    .where(Notification.user_id.in_(user_ids))
+                    .group_by(Notification.alert_id)
+                    .order_by(func.count().desc())
+                    .limit(1)
+                )
+            ).scalar()
+    finally:
+        await _cleanup(product_ids, user_ids)
+
+    changes = rounds * min(batch, products)
+    return {
+        "alerts": alerts,
+        "changes": changes,
+        "scan_changes_per_s": round(changes / scan_elapsed, 1),
+        "indexed_changes_per_s": round(changes / indexed_elapsed, 1),
+        "speedup": round(scan_elapsed / indexed_elapsed, 1),
+        "scan_would_fire": scanned,
+        "alerts_fired": fired,
+        "fired_on_repeat": repeated,
+        "max_pending_per_alert": most_pending or 0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--alerts", type=int, default=100000)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        run(args.products, args.users, args.alerts, args.batch, args.rounds)
+    )
+    for key, value in report.items():
+        print(f"{key:>22}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Minimal in-process ASGI client used by the benchmark scripts.
+
+Drives the FastAPI app directly on the running event loop so concurrent
+requests share one loop exactly like they do inside a uvicorn worker;
+any blocking call in a handler shows up as lost throughput.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlencode
+
+
+@dataclass
+class ASGIResponse:
+    status_code: int
+    body: bytes
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class ASGIClient:
+    def __init__(self, app, client_host: str = "127.0.0.1"):
+        self.app = app
+        self.client_host = client_host
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        json_body: Any = None,
+        form: dict[str, str] | None = None,
+        headers: dict[str, str] | None = None,
+        client_host: str | None = None,
+    ) -> ASGIResponse:
+        raw_headers = [(b"host", b"benchmark")]
+        body = b""
+        if json_body is not None:
+            body = json.dumps(json_body).encode()
+            raw_headers.append((b"content-type", b"application/json"))
+        elif form is not None:
+            body = urlencode(form).encode()
+            raw_headers.append(
+                (b"content-type", b"application/x-www-form-urlencoded")
+            )
+        for key, value in (headers or {}).items():
+            raw_headers.append((key.lower().encode(), value.encode()))
+        raw_headers.append((b"content-length", str(len(body)).encode()))
+
+        path, _, query = path.partition("?")
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": raw_headers,
+            "client": (client_host or self.client_host, 50000),
+            "server": ("benchmark", 80),
+        }
+        sent = False
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {
+                    "type": "http.request",
+                    "body": body,
+                    "more_body": False,
+                }
+            return {"type": "http.disconnect"}
+
+        status_code = 500
+        chunks: list[bytes] = []
+
+        async def send(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return ASGIResponse(status_code=status_code, body=b"".join(chunks))
@@ -0,0 +1,136 @@
+"""
+Concurrent-request throughput benchmark for the auth endpoints.
+
+Runs the FastAPI app in-process against the database configured in
+``.env`` (migrated and seeded with ``app/db/seed.sql``) and fires
+``--requests`` requests with ``--concurrency`` in flight at once.
+
+Scenarios:
+    unknown-login  POST /auth/token for emails that do not exist
+                   (database lookup only, no bcrypt), each from its own
+                   client address so the login rate limiter stays idle
+    login          POST /auth/token with valid credentials
+    me             GET /auth/me with a valid bearer token
+
+Usage:
+    python -m benchmarks.auth_concurrency --scenario unknown-login \\
+        --requests 2000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from benchmarks.asgi import ASGIClient
+
+PASSWORD = "benchmark-password"
+
+
+async def _register(client: ASGIClient, email: str) -> None:
+    response = await client.request(
+        "POST",
+        "/auth/register",
+        json_body={"email": email, "password": PASSWORD},
+    )
+    if response.status_code not in (201, 409):
+        raise RuntimeError(
+            f"Registration failed with {response.status_code}: "
+            f"{response.body!r}"
+        )
+
+
+async def _token(client: ASGIClient, email: str) -> str:
+    response = await client.request(
+        "POST",
+        "/auth/token",
+        form={"username": email, "password": PASSWORD},
+    )
+    return response.json()["access_token"]
+
+
+async def run(scenario: str, total: int, concurrency: int) -> dict:
+    from app.main import app
+
+    client = ASGIClient(app)
+    async with app.router.lifespan_context(app):
+        email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+        headers: dict[str, str] = {}
+        if scenario in ("login", "me"):
+            await _register(client, email)
+        if scenario == "me":
+            token = await _token(client, email)
+            headers = {"authorization": f"Bearer {token}"}
+
+        async def one(i: int) -> tuple[float, int]:
+            started = time.perf_counter()
+            if scenario == "unknown-login":
+                address = f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"
+                response = await client.request(
+                    "POST",
+                    "/auth/token",
+                    form={
+                        "username": f"missing-{i}@example.com",
+                        "password": PASSWORD,
+                    },
+                    client_host=address,
+                )
+            elif scenario == "login":
+                response = await client.request(
+                    "POST",
+                    "/auth/token",
+                    form={"username": email, "password": PASSWORD},
+                )
+            else:
+                response = await client.request(
+                    "GET", "/auth/me", headers=headers
+                )
+            return time.perf_counter() - started, response.status_code
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded(i: int) -> tuple[float, int]:
+            async with semaphore:
+                return await one(i)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(bounded(i) for i in range(total)))
+        elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _ in results)
+    statuses: dict[int, int] = {}
+    for _, status_code in results:
+        statuses[status_code] = statuses.get(status_code, 0) + 1
+    return {
+        "scenario": scenario,
+        "requests": total,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 1),
+        "latency_p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "latency_p99_ms": round(
+            latencies[int(len(latencies) * 0.99) - 1] * 1000, 2
+        ),
+        "statuses": statuses,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--scenario",
+        choices=["unknown-login", "login", "me"],
+        default="unknown-login",
+    )
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.scenario, args.requests, args.concurrency))
+    for key, value in report.items():
+        print(f"{key:>16}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,395 @@
+"""
+End-to-end load test for /auth/register, /auth/token and /auth/me.
+
+Keeps ``--concurrency`` simulated users busy for ``--duration`` seconds,
+each picking its next request by the weights of the user-mix profile:
+
+    signup     register only
+    login      log in only (valid credentials, so the rate limiter idles)
+    session    /auth/me only, with a bearer token
+    mixed      5% register, 15% log in, 80% /auth/me
+
+``--mix register=1,login=3,me=6`` overrides the profile's weights. Logins
+and /auth/me pick from ``--users`` accounts created before the run (with
+one shared password hash, so setup does not pay bcrypt per user).
+
+``--transport asgi`` calls the application in-process on the harness's
+event loop, which measures the application alone; ``--transport uvicorn``
+starts ``uvicorn app.main:app`` with ``--workers`` processes and sends
+real HTTP requests over a socket, so the client shares the box with the
+server. Requests finishing within the first ``--warmup`` seconds are not
+counted.
+
+By default the run gets a disposable database (created on the server in
+``.env``, migrated, seeded and dropped afterwards); ``--database
+configured`` uses the configured database and deletes the run's users
+afterwards.
+
+Reports requests/s, p50/p90/p99/max latency and status counts per
+endpoint. ``--output`` writes them as JSON; ``--baseline`` compares the
+run with a stored report and exits 1 if a throughput dropped or a
+latency grew by more than ``--tolerance``.
+
+Usage:
+    python -m benchmarks.auth_load --profile mixed --concurrency 32 \\
+        --duration 20 --output auth_load.json
+    python -m benchmarks.auth_load --transport uvicorn --workers 2 \\
+        --baseline auth_load.json --tolerance 0.15
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from contextlib import asynccontextmanager, nullcontext
+from typing import AsyncIterator
+
+import httpx
+
+from benchmarks import reporting
+from benchmarks.asgi import ASGIClient
+from benchmarks.database import disposable_database
+
+PASSWORD = "load-test-password"
+PROFILES = {
+    "signup": {"register": 1.0},
+    "login": {"login": 1.0},
+    "session": {"me": 1.0},
+    "mixed": {"register": 0.05, "login": 0.15, "me": 0.8},
+}
+EXPECTED_STATUS = {"register": 201, "login": 200, "me": 200}
+
+
+def _parse_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in EXPECTED_STATUS:
+            raise argparse.ArgumentTypeError(f"Unknown endpoint: {name}")
+        mix[name] = float(weight)
+    return mix
+
+
+class HTTPClient:
+    """``ASGIClient``'s interface over a real HTTP connection pool."""
+
+    def __init__(self, base_url: str, connections: int):
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            limits=httpx.Limits(
+                max_connections=connections,
+                max_keepalive_connections=connections,
+            ),
+            timeout=60,
+        )
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        json_body=None,
+        form: dict[str, str] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> httpx.Response:
+        return await self.client.request(
+            method, path, json=json_body, data=form, headers=headers
+        )
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+@asynccontextmanager
+async def _asgi_client() -> AsyncIterator[ASGIClient]:
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        yield ASGIClient(app)
+
+
+@asynccontextmanager
+async def _uvicorn_client(
+    concurrency: int, port: int, workers: int
+) -> AsyncIterator[HTTPClient]:
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+        env=dict(os.environ),
+    )
+    client = HTTPClient(f"http://127.0.0.1:{port}", concurrency)
+    try:
+        deadline = time.perf_counter() + 60
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with {server.returncode}")
+            if time.perf_counter() > deadline:
+                raise RuntimeError("uvicorn did not answer in time")
+            try:
+                if (await client.request("GET", "/health")).status_code == 200:
+                    break
+            except httpx.TransportError:
+                await asyncio.sleep(0.05)
+        yield client
+    finally:
+        await client.aclose()
+        server.terminate()
+        server.wait()
+
+
+async def _create_users(run_id: str, users: int) -> tuple[list[str], list]:
+    """Create the accounts to log in as, and an access token for each."""
+    from app.db.base import SessionLocal
+    from app.models.auth import User
+    from app.repositories.auth.repositories import SqlAlchemyAuthRepository
+    from app.utils.security import Security
+
+    hashed_password = Security.hash_password(PASSWORD)
+    emails = [f"load-{run_id}-user{i}@example.com" for i in range(users)]
+    async with SessionLocal() as session:
+        await SqlAlchemyAuthRepository(session).create_many(
+            [
+                User(email=email, hashed_password=hashed_password)
+                for email in emails
+            ]
+        )
+    tokens = [Security.create_access_token({"sub": email}) for email in emails]
+    return emails, [{"authorization": f"Bearer {token}"} for token in tokens]
+
+
+async def _delete_users(run_id: str) -> None:
+    from sqlalchemy import delete, select
+
+    from app.db.base import SessionLocal, get_engine
+    from app.models.auth import LoginAttempt, RefreshToken, User, UserRole
+
+    pattern = f"load-{run_id}-%"
+    users = select(User.id).where(User.email.like(pattern))
+    async with SessionLocal() as session:
+        await session.execute(
+            delete(RefreshToken).where(RefreshToken.user_id.in_(users))
+        )
+        await session.execute(
+            delete(UserRole).where(UserRole.user_id.in_(users))
+        )
+        await session.execute(
+            delete(LoginAttempt).where(LoginAttempt.email.like(pattern))
+        )
+        await session.execute(delete(User).where(User.email.like(pattern)))
+        await session.commit()
+    await get_engine().dispose()
+
+
+async def _drive(
+    client,
+    run_id: str,
+    mix: dict[str, float],
+    emails: list[str],
+    tokens: list[dict[str, str]],
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    seed: int,
+) -> dict[str, list]:
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    samples: dict[str, list[tuple[float, int]]] = {name: [] for name in names}
+    signups = 0
+
+    async def request(name: str, rng: random.Random) -> int:
+        nonlocal signups
+        if name == "register":
+            signups += 1
+            response = await client.request(
+                "POST",
+                "/auth/register",
+                json_body={
+                    "email": f"load-{run_id}-signup{signups}@example.com",
+                    "password": PASSWORD,
+                },
+            )
+        elif name == "login":
+            response = await client.request(
+                "POST",
+                "/auth/token",
+                form={"username": rng.choice(emails), "password": PASSWORD},
+            )
+        else:
+            response = await client.request(
+                "GET", "/auth/me", headers=rng.choice(tokens)
+            )
+        return response.status_code
+
+    started = time.perf_counter()
+    measure_from = started + warmup
+    deadline = measure_from + duration
+
+    async def user(index: int) -> None:
+        rng = random.Random(seed + index)
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            request_started = time.perf_counter()
+            status = await request(name, rng)
+            finished = time.perf_counter()
+            if measure_from <= request_started and finished <= deadline:
+                samples[name].append((finished - request_started, status))
+
+    await asyncio.gather(*(user(i) for i in range(concurrency)))
+    return samples
+
+
+def _summarise(samples: dict[str, list], seconds: float) -> dict:
+    endpoints = {}
+    for name, results in samples.items():
+        latencies = sorted(latency for latency, _ in results)
+        statuses: dict[str, int] = {}
+        for _, status in results:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        endpoints[name] = {
+            "requests": len(results),
+            "errors": len(results)
+            - statuses.get(str(EXPECTED_STATUS[name]), 0),
+            "rps": round(len(results) / seconds, 1),
+            "p50_ms": round(reporting.percentile(latencies, 50) * 1000, 2),
+            "p90_ms": round(reporting.percentile(latencies, 90) * 1000, 2),
+            "p99_ms": round(reporting.percentile(latencies, 99) * 1000, 2),
+            "max_ms": round(max(latencies, default=0) * 1000, 2),
+            "statuses": statuses,
+        }
+    return endpoints
+
+
+async def run(args: argparse.Namespace, mix: dict[str, float]) -> dict:
+    run_id = uuid.uuid4().hex[:8]
+    emails, tokens = await _create_users(run_id, args.users)
+    if args.transport == "asgi":
+        client_context = _asgi_client()
+    else:
+        # The server processes open their own pools; this one is done.
+        from app.db.base import get_engine
+
+        await get_engine().dispose()
+        client_context = _uvicorn_client(
+            args.concurrency, args.port, args.workers
+        )
+    try:
+        async with client_context as client:
+            samples = await _drive(
+                client,
+                run_id,
+                mix,
+                emails,
+                tokens,
+                args.concurrency,
+                args.duration,
+                args.warmup,
+                args.seed,
+            )
+    finally:
+        if args.database == "configured":
+            await _delete_users(run_id)
+
+    seconds = args.duration
+    endpoints = _summarise(samples, seconds)
+    metrics = {}
+    for name, result in endpoints.items():
+        metrics[f"{name}.rps"] = reporting.metric(
+            result["rps"], reporting.HIGHER
+        )
+        for key in ("p50_ms", "p99_ms"):
+            metrics[f"{name}.{key}"] = reporting.metric(
+                result[key], reporting.LOWER
+            )
+    total = sum(result["requests"] for result in endpoints.values())
+    metrics["total.rps"] = reporting.metric(
+        round(total / seconds, 1), reporting.HIGHER
+    )
+    return {
+        "benchmark": "auth_load",
+        "environment": reporting.environment(),
+        "config": {
+            "transport": args.transport,
+            "workers": args.workers if args.transport == "uvicorn" else None,
+            "database": args.database,
+            "profile": args.profile,
+            "mix": mix,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "users": args.users,
+        },
+        "endpoints": endpoints,
+        "metrics": metrics,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--transport", choices=["asgi", "uvicorn"], default="asgi"
+    )
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument(
+        "--database",
+        choices=["disposable", "configured"],
+        default="disposable",
+    )
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="mixed")
+    parser.add_argument("--mix", type=_parse_mix)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output")
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args()
+    mix = args.mix or PROFILES[args.profile]
+    logging.getLogger("passlib").setLevel(logging.ERROR)
+
+    database = (
+        disposable_database("loadtest")
+        if args.database == "disposable"
+        else nullcontext()
+    )
+    with database:
+        report = asyncio.run(run(args, mix))
+
+    for name, result in report["endpoints"].items():
+        print(
+            f"{name:>8}: {result['rps']:>8} req/s  "
+            f"p50 {result['p50_ms']} ms  p99 {result['p99_ms']} ms  "
+            f"max {result['max_ms']} ms  statuses {result['statuses']}"
+        )
+    print(f"{'total':>8}: {report['metrics']['total.rps']['value']:>8} req/s")
+    if args.output:
+        reporting.save(args.output, report)
+    if args.baseline:
+        baseline = reporting.load(args.baseline)
+        if baseline.get("config") != report["config"]:
+            print("warning: the baseline was run with a different config")
+        comparisons = reporting.compare(report, baseline, args.tolerance)
+        reporting.print_comparison(comparisons)
+        if any(comparison.regressed for comparison in comparisons):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+End-to-end crawl worker benchmark.
+
+Starts ``--domains`` local stub shops, registers ``--sources`` product
+pages on them (all due now) and runs ``python -m app.worker`` as a
+subprocess until every page has been crawled once. Then sends SIGTERM and
+checks the shutdown was graceful: the worker exits cleanly and holds no
+leases. Reports pages/s and price points written.
+
+Runs against the database configured in ``.env`` (migrated); the rows it
+writes are deleted afterwards.
+
+Usage:
+    python -m benchmarks.crawl_worker --sources 2000 --processes 2
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import sys
+import time
+from contextlib import AsyncExitStack
+
+from sqlalchemy import delete, func, insert, select
+
+from app.db.base import SessionLocal, get_engine
+from app.models.product import (
+    CrawlSchedule,
+    PricePoint,
+    Product,
+    ProductSource,
+)
+from benchmarks.stub_server import StubShopServer
+
+
+async def _register(servers: list[StubShopServer], count: int) -> int:
+    async with SessionLocal() as session:
+        product = Product(name="benchmark")
+        session.add(product)
+        await session.flush()
+        await session.execute(
+            insert(ProductSource),
+            [
+                {
+                    "product_id": product.id,
+                    "url": f"{servers[i % len(servers)].base_url}/products/{i}",
+                    "domain": f"127.0.0.1:{servers[i % len(servers)].port}",
+                    "currency": "USD",
+                    "is_active": True,
+                }
+                for i in range(count)
+            ],
+        )
+        await session.commit()
+        return product.id
+
+
+async def _crawled(product_id: int) -> tuple[int, int]:
+    async with SessionLocal() as session:
+        sources = select(ProductSource.id).where(
+            ProductSource.product_id == product_id
+        )
+        result = await session.execute(
+            select(
+                func.count(CrawlSchedule.last_run_at),
+                func.count(CrawlSchedule.lease_owner),
+            ).where(CrawlSchedule.source_id.in_(sources))
+        )
+        return result.one()
+
+
+async def run(
+    sources: int, domains: int, processes: int, concurrency: int
+) -> dict:
+    async with AsyncExitStack() as stack:
+        servers = [
+            await stack.enter_async_context(StubShopServer(latency=0.02))
+            for _ in range(domains)
+        ]
+        product_id = await _register(servers, sources)
+        env = os.environ | {
+            "SCRAPER_PER_DOMAIN_DELAY_SECONDS": "0",
+            "CRAWL_POLL_INTERVAL_SECONDS": "0.5",
+            "CRAWL_LOOKAHEAD_SECONDS": "0",
+            "WORKER_INGEST_INTERVAL_SECONDS": "0.5",
+        }
+        try:
+            started = time.perf_counter()
+            worker = await asyncio.create_subprocess_exec(
+                sys.executable,
+                "-m",
+                "app.worker",
+                "--processes",
+                str(processes),
+                "--concurrency",
+                str(concurrency),
+                env=env,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            crawled = 0
+            while crawled < sources and time.perf_counter() - started < 300:
+                await asyncio.sleep(0.25)
+                crawled, _ = await _crawled(product_id)
+            elapsed = time.perf_counter() - started
+
+            worker.send_signal(signal.SIGTERM)
+            exit_code = await worker.wait()
+            _, leased = await _crawled(product_id)
+            async with SessionLocal() as session:
+                written = (
+                    await session.execute(
+                        select(func.count()).where(
+                            PricePoint.product_id == product_id
+                        )
+                    )
+                ).scalar()
+        finally:
+            async with SessionLocal() as session:
+                source_ids = select(ProductSource.id).where(
+                    ProductSource.product_id == product_id
+                )
+                await session.execute(
+                    delete(PricePoint).where(
+                        PricePoint.product_id == product_id
+                    )
+                )
+                await session.execute(
+                    delete(CrawlSchedule).where(
+                        CrawlSchedule.source_id.in_(source_ids)
+                    )
+                )
+                await session.execute(
+                    delete(ProductSource).where(
+                        ProductSource.product_id == product_id
+                    )
+                )
+                await session.execute(
+                    delete(Product).where(Product.id == product_id)
+                )
+                await session.commit()
+            await get_engine().dispose()
+
+    return {
+        "sources": sources,
+        "processes": processes,
+        "crawled": crawled,
+        "pages_per_s_incl_startup": round(crawled / elapsed, 1),
+        "price_points_written": written,
+        "exit_code": exit_code,
+        "leases_held_after_stop": leased,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sources", type=int, default=2000)
+    parser.add_argument("--domains", type=int, default=8)
+    parser.add_argument("--processes", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        run(args.sources, args.domains, args.processes, args.concurrency)
+    )
+    for key, value in report.items():
+        print(f"{key:>26}: {value}")
+
+
+if __name__ == "__main__":
+    main()
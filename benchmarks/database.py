@@ -0,0 +1,79 @@
+"""
+Disposable databases for benchmarks that write.
+
+``disposable_database()`` creates a database on the server configured in
+``.env``, migrates it to head, loads ``app/db/seed.sql``, points
+``DB_NAME`` at it for this process and the ones it starts, and drops it
+on the way out.
+"""
+
+import os
+import subprocess
+import sys
+import uuid
+from contextlib import contextmanager
+from typing import Iterator
+
+import psycopg
+from psycopg import sql
+
+from app.core.config import BASE_DIR, get_settings
+
+SEED_FILE = BASE_DIR / "app" / "db" / "seed.sql"
+
+
+def _connect(dbname: str) -> psycopg.Connection:
+    settings = get_settings()
+    return psycopg.connect(
+        host=settings.db_host,
+        port=settings.db_port,
+        user=settings.db_user,
+        password=settings.db_password,
+        dbname=dbname,
+        autocommit=True,
+    )
+
+
+def _use(name: str | None) -> None:
+    if name is None:
+        os.environ.pop("DB_NAME", None)
+    else:
+        os.environ["DB_NAME"] = name
+    get_settings.cache_clear()
+
+
+@contextmanager
+def disposable_database(prefix: str = "bench") -> Iterator[str]:
+    """
+    Yield the name of a fresh, migrated and seeded database.
+
+    Application modules read ``Settings`` when imported, so import them
+    only inside the block.
+    """
+    name = f"{prefix}_{uuid.uuid4().hex[:8]}"
+    previous = os.environ.get("DB_NAME")
+    with _connect("postgres") as admin:
+        admin.execute(
+            sql.SQL("CREATE DATABASE {}").format(sql.Identifier(name))
+        )
+    try:
+        _use(name)
+        migration = subprocess.run(
+            [sys.executable, "-m", "alembic", "upgrade", "head"],
+            cwd=BASE_DIR,
+            capture_output=True,
+            text=True,
+        )
+        if migration.returncode != 0:
+            raise RuntimeError(f"Migrating {name} failed:\n{migration.stderr}")
+        with _connect(name) as connection:
+            connection.execute(SEED_FILE.read_text())
+        yield name
+    finally:
+        _use(previous)
+        with _connect("postgres") as admin:
+            admin.execute(
+                sql.SQL("DROP DATABASE IF EXISTS {} WITH (FORCE)").format(
+                    sql.Identifier(name)
+                )
+            )
@@ -0,0 +1,116 @@
+"""
+Price extraction throughput per site adapter, on fixture pages.
+
+Generates ``--pages`` pages of about ``--page-size`` bytes for each
+fixture retailer (see ``benchmarks.extraction_fixtures``) and extracts
+their prices three ways:
+
+    adapter   the adapter registry: structured-data fast path, byte-level
+              rules, then DOM rules only where an adapter declares them
+    generic   the generic adapter alone, with no retailer rules
+    full-dom  parse every page with lxml and evaluate a CSS selector,
+              the approach the registry avoids (needs ``lxml`` and
+              ``cssselect``)
+
+Reports pages/s, MB/s and how many extracted prices were correct.
+
+Usage:
+    python -m benchmarks.extraction --pages 500 --page-size 150000
+"""
+
+import argparse
+import time
+from typing import Callable
+
+from app.services.scraper.adapters import AdapterRegistry, CssRule
+from benchmarks.extraction_fixtures import ADAPTERS, RETAILERS, fixtures
+
+# What a DOM-only scraper would select on each fixture retailer.
+FULL_DOM_SELECTORS = {
+    "jsonld": CssRule('script[type="application/ld+json"]'),
+    "opengraph": CssRule('meta[property="og:price:amount"]', "content"),
+    "microdata": CssRule('[itemprop="price"]', "content"),
+    "dom": CssRule("#buy-box .amount"),
+}
+
+
+def _measure(pages: list, extract: Callable) -> dict:
+    started = time.perf_counter()
+    prices = [extract(page) for page in pages]
+    elapsed = time.perf_counter() - started
+    size = sum(len(page.content) for page in pages)
+    return {
+        "pages_per_s": round(len(pages) / elapsed, 1),
+        "mb_per_s": round(size / elapsed / 1e6, 1),
+        "correct": sum(
+            price == page.price for price, page in zip(prices, pages)
+        ),
+    }
+
+
+def _full_dom(retailer: str) -> Callable | None:
+    try:
+        import cssselect  # noqa: F401
+        import lxml.html
+    except ImportError:
+        return None
+    import json
+
+    from app.services.scraper.parsing import parse_amount
+
+    rule = FULL_DOM_SELECTORS[retailer]
+
+    def extract(page):
+        raw = rule.extract(
+            page.content, lxml.html.document_fromstring(page.content)
+        )
+        if raw and retailer == "jsonld":
+            raw = json.loads(raw)["offers"]["price"]
+        return parse_amount(raw) if raw else None
+
+    return extract
+
+
+def run(pages: int, page_size: int) -> dict:
+    registry = AdapterRegistry()
+    for adapter in ADAPTERS:
+        registry.register(adapter)
+    generic = AdapterRegistry()
+
+    def price(registry: AdapterRegistry) -> Callable:
+        def extract(page):
+            parsed = registry.parse(page.url, page.content)
+            return parsed.price if parsed else None
+
+        return extract
+
+    report: dict = {}
+    for retailer in RETAILERS:
+        sample = fixtures(retailer, pages, page_size)
+        modes = {
+            "adapter": price(registry),
+            "generic": price(generic),
+            "full-dom": _full_dom(retailer),
+        }
+        for mode, extract in modes.items():
+            if extract is None:
+                report[f"{retailer}/{mode}"] = "skipped (lxml not installed)"
+                continue
+            report[f"{retailer}/{mode}"] = _measure(sample, extract)
+    report["adapter_paths"] = registry.stats()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--page-size", type=int, default=150_000)
+    args = parser.parse_args()
+
+    report = run(args.pages, args.page_size)
+    for key, value in report.items():
+        print(f"{key:>20}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Synthetic product pages for the extraction benchmark.
+
+Each fixture retailer publishes its price a different way: JSON-LD near
+the end of the body, Open Graph tags in the head, schema.org microdata,
+or only in the markup of a buy box. Pages are padded with the navigation,
+listing grids and inline scripts real product pages carry, so the
+benchmark pays for scanning realistic amounts of HTML.
+"""
+
+import json
+import random
+from dataclasses import dataclass
+from decimal import Decimal
+
+from app.services.scraper.adapters import CssRule, SiteAdapter, XPathRule
+
+
+@dataclass(slots=True)
+class Fixture:
+    url: str
+    content: bytes
+    price: Decimal
+
+
+def _padding(rng: random.Random, size: int) -> str:
+    parts = ['<nav class="menu"><ul>']
+    parts += [
+        f'<li><a href="/c/{rng.randrange(10**6)}">Category {i}</a></li>'
+        for i in range(60)
+    ]
+    parts.append('</ul></nav><section class="related">')
+    length = sum(map(len, parts))
+    while length < size:
+        # Listing tiles deliberately avoid the "price" class so only the
+        # product's own price is found.
+        if rng.randrange(4):
+            tile = (
+                f'<div class="tile" data-sku="{rng.randrange(10**8)}">'
+                f'<a href="/p/{rng.randrange(10**6)}"><img src="/i/1.jpg" '
+                f'alt="Item"></a><p class="tile-title">Product '
+                f'{rng.randrange(10**6)}</p><p class="tile-cost">from '
+                f"{rng.randrange(5, 500)}.99</p></div>"
+            )
+        else:
+            tile = (
+                "<script>window.dataLayer=window.dataLayer||[];"
+                f"dataLayer.push({{'event':'view',"
+                f"'id':{rng.randrange(10**6)}}})</script>"
+            )
+        parts.append(tile)
+        length += len(tile)
+    parts.append("</section>")
+    return "".join(parts)
+
+
+def _head(title: str, extra: str = "") -> str:
+    return (
+        f'<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">'
+        f"<title>{title}</title>"
+        '<meta name="viewport" content="width=device-width">'
+        '<link rel="stylesheet" href="/static/site.css">'
+        f"{extra}</head>"
+    )
+
+
+def jsonld_page(rng: random.Random, price: Decimal, size: int) -> str:
+    data = {
+        "@context": "https://schema.org",
+        "@type": "Product",
+        "name": "Widget",
+        "sku": str(rng.randrange(10**8)),
+        "offers": {
+            "@type": "Offer",
+            "price": str(price),
+            "priceCurrency": "USD",
+            "availability": "https://schema.org/InStock",
+        },
+    }
+    return (
+        _head("Widget")
+        + f"<body><h1>Widget</h1>{_padding(rng, size)}"
+        + '<script type="application/ld+json">'
+        + json.dumps(data)
+        + "</script></body></html>"
+    )
+
+
+def og_page(rng: random.Random, price: Decimal, size: int) -> str:
+    meta = (
+        f'<meta property="og:title" content="Widget">'
+        f'<meta property="og:price:amount" content="{price}">'
+        '<meta property="og:price:currency" content="EUR">'
+        '<meta property="og:availability" content="instock">'
+    )
+    return (
+        _head("Widget", meta)
+        + f"<body><h1>Widget</h1>{_padding(rng, size)}</body></html>"
+    )
+
+
+def microdata_page(rng: random.Random, price: Decimal, size: int) -> str:
+    return (
+        _head("Widget")
+        + '<body><div itemscope itemtype="https://schema.org/Product">'
+        f"<h1>Widget</h1>{_padding(rng, size // 2)}"
+        '<div itemprop="offers" itemscope itemtype="https://schema.org/Offer">'
+        f'<span itemprop="price" content="{price}">{price}</span>'
+        '<meta itemprop="priceCurrency" content="GBP">'
+        '<link itemprop="availability" href="https://schema.org/InStock">'
+        f"</div>{_padding(rng, size // 2)}</div></body></html>"
+    )
+
+
+def dom_page(rng: random.Random, price: Decimal, size: int) -> str:
+    whole, _, cents = f"{price:,.2f}".partition(".")
+    return (
+        _head("Widget") + f"<body><h1>Widget</h1>{_padding(rng, size // 2)}"
+        '<div id="buy-box" data-currency="USD"><div class="amount">'
+        f'<span class="sym">$</span><span class="int">{whole}</span>'
+        f'<span class="dec">.{cents}</span></div>'
+        '<button class="add">Add to cart</button></div>'
+        f"{_padding(rng, size // 2)}</body></html>"
+    )
+
+
+RETAILERS = {
+    "jsonld": ("jsonld.shop.test", jsonld_page),
+    "opengraph": ("og.shop.test", og_page),
+    "microdata": ("microdata.shop.test", microdata_page),
+    "dom": ("dom.shop.test", dom_page),
+}
+
+# Only the buy-box retailer needs rules of its own; the others are served
+# by the structured-data fast path and the generic rules.
+ADAPTERS = (
+    SiteAdapter(
+        name="dom",
+        domains=("dom.shop.test",),
+        price=(CssRule("#buy-box .amount"),),
+        currency=(XPathRule("//div[@id='buy-box']/@data-currency"),),
+        structured_data=False,
+        generic=False,
+    ),
+)
+
+
+def fixtures(retailer: str, pages: int, size: int, seed: int = 0) -> list:
+    host, render = RETAILERS[retailer]
+    rng = random.Random(seed)
+    result = []
+    for i in range(pages):
+        price = Decimal(rng.randrange(100, 500000)) / 100
+        result.append(
+            Fixture(
+                url=f"https://{host}/products/{i}",
+                content=render(rng, price, size).encode(),
+                price=price,
+            )
+        )
+    return result
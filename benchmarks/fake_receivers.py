@@ -0,0 +1,145 @@
+"""
+Local stand-ins for an SMTP relay and webhook endpoints.
+
+Both are minimal asyncio servers that accept everything the dispatcher
+sends, keep connections open between messages, and can fail a share of
+deliveries with a transient error (SMTP 451, HTTP 503) to exercise the
+retry path. They count connections, deliveries and how often each
+notification id was delivered, so duplicates can be detected.
+"""
+
+import asyncio
+import json
+import random
+from collections import Counter
+from email import policy
+from email.parser import BytesHeaderParser
+
+
+class _Receiver:
+    def __init__(self, fail_rate: float = 0.0, seed: int = 0):
+        self.fail_rate = fail_rate
+        self.rng = random.Random(seed)
+        self.connections = 0
+        self.delivered = 0
+        self.rejected = 0
+        self.ids: Counter[int] = Counter()
+        self.port = 0
+        self._server: asyncio.Server | None = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(
+            self._connection, "127.0.0.1", 0, limit=2**20
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def _fails(self) -> bool:
+        if self.rng.random() < self.fail_rate:
+            self.rejected += 1
+            return True
+        return False
+
+    def _received(self, ids: list[int]) -> None:
+        self.delivered += 1
+        self.ids.update(ids)
+
+    @property
+    def duplicates(self) -> int:
+        return sum(count - 1 for count in self.ids.values() if count > 1)
+
+    async def _connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        try:
+            await self._serve(reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        return {
+            "connections": self.connections,
+            "delivered": self.delivered,
+            "rejected": self.rejected,
+            "duplicates": self.duplicates,
+        }
+
+
+class FakeSmtpServer(_Receiver):
+    """Just enough ESMTP for ``smtplib``: no TLS, no AUTH."""
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        writer.write(b"220 fake.test ESMTP\r\n")
+        await writer.drain()
+        while line := await reader.readline():
+            command = line[:4].upper()
+            if command in (b"EHLO", b"HELO"):
+                reply = b"250 fake.test"
+            elif command == b"RCPT" and self._fails():
+                reply = b"451 4.3.0 Try again later"
+            elif command == b"DATA":
+                writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                await writer.drain()
+                message = await reader.readuntil(b"\r\n.\r\n")
+                self._received(self._ids(message))
+                reply = b"250 2.0.0 Queued"
+            elif command == b"QUIT":
+                writer.write(b"221 2.0.0 Bye\r\n")
+                await writer.drain()
+                return
+            else:
+                # MAIL, RCPT, RSET, NOOP
+                reply = b"250 2.0.0 OK"
+            writer.write(reply + b"\r\n")
+            await writer.drain()
+
+    @staticmethod
+    def _ids(message: bytes) -> list[int]:
+        # Long id lists are folded over several header lines.
+        headers = BytesHeaderParser(policy=policy.default).parsebytes(message)
+        value = str(headers.get("x-notification-ids", ""))
+        return [int(i) for i in value.split(",") if i.strip()]
+
+
+class FakeWebhookServer(_Receiver):
+    """HTTP/1.1 with keep-alive that answers every POST with 200 or 503."""
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.port}{path}"
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n")[1:]:
+                name, _, value = line.partition(b":")
+                if name.strip().lower() == b"content-length":
+                    length = int(value)
+            body = await reader.readexactly(length)
+            if self._fails():
+                status = b"503 Service Unavailable"
+            else:
+                payload = json.loads(body)
+                self._received([n["id"] for n in payload["notifications"]])
+                status = b"200 OK"
+            writer.write(
+                b"HTTP/1.1 " + status + b"\r\n"
+                b"content-length: 0\r\nconnection: keep-alive\r\n\r\n"
+            )
+            await writer.drain()
@@ -0,0 +1,357 @@
+"""
+Microbenchmarks for the auth hot paths, with a regression gate.
+
+Times each case below on its own: calls it in a loop calibrated to take
+at least ``--min-time`` seconds, ``--rounds`` times, and reports the
+median, minimum and spread of the time per call.
+
+    security.*    Security.create_access_token; Security.verify_token
+                  served from the verified-token cache and decoded afresh;
+                  Security.verify_password for hashes of each
+                  ``--bcrypt-rounds`` cost
+    schemas.*     CreateUserSchema validation from a request body, and
+                  UserSchema.model_validate from a User row
+    repository.*  each SqlAlchemyAuthRepository method, in its own session
+                  as a request would use it, against a disposable database
+                  (created on the server in ``.env``, migrated, seeded and
+                  dropped afterwards) holding ``--users`` users; ``delete``
+                  deactivates a user reactivated before each (untimed) call
+
+``--filter`` runs only the cases whose name contains it. ``--output``
+writes the results as JSON, to serve as a baseline for later runs;
+``--baseline`` compares with one and exits 1 if any case's median grew
+by more than ``--tolerance``. Baselines only compare on the same machine.
+
+Usage:
+    python -m benchmarks.micro --output micro.json
+    python -m benchmarks.micro --baseline micro.json --tolerance 0.2
+    python -m benchmarks.micro --filter security.verify_password \\
+        --bcrypt-rounds 4 10 12
+"""
+
+import argparse
+import asyncio
+import inspect
+import itertools
+import logging
+import math
+import statistics
+import sys
+import time
+import uuid
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from benchmarks import reporting
+from benchmarks.database import disposable_database
+
+PASSWORD = "micro-benchmark-password"
+REPOSITORY_CASES = (
+    "repository.load_default_role_id",
+    "repository.get_by_id",
+    "repository.get_by_email",
+    "repository.create",
+    "repository.create_many[100]",
+    "repository.update",
+    "repository.delete",
+)
+
+
+@dataclass
+class Case:
+    name: str
+    # Called without arguments; may be a coroutine function.
+    func: Callable[[], Any]
+    # Called before each call of func, outside the timing; likewise.
+    setup: Callable[[], Any] | None = None
+
+
+async def _call(func: Callable[[], Any]) -> None:
+    if inspect.iscoroutinefunction(func):
+        await func()
+    else:
+        func()
+
+
+async def _loop(case: Case, iterations: int) -> float:
+    func = case.func
+    if case.setup is not None:
+        elapsed = 0.0
+        for _ in range(iterations):
+            await _call(case.setup)
+            started = time.perf_counter()
+            await _call(func)
+            elapsed += time.perf_counter() - started
+        return elapsed
+    if inspect.iscoroutinefunction(func):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await func()
+    else:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+    return time.perf_counter() - started
+
+
+async def _measure(case: Case, min_time: float, rounds: int) -> dict:
+    await _loop(case, 1)
+    iterations = 1
+    elapsed = await _loop(case, iterations)
+    while elapsed < min_time:
+        # Aim a little past min_time so one more pass is usually enough.
+        scale = min_time / max(elapsed, 1e-9) * 1.2
+        iterations = max(iterations + 1, math.ceil(iterations * scale))
+        elapsed = await _loop(case, iterations)
+    per_call = [
+        await _loop(case, iterations) / iterations for _ in range(rounds)
+    ]
+    median = statistics.median(per_call)
+    return {
+        "iterations": iterations,
+        "rounds": rounds,
+        "median_us": round(median * 1e6, 3),
+        "min_us": round(min(per_call) * 1e6, 3),
+        "stdev_us": round(
+            statistics.stdev(per_call) * 1e6 if rounds > 1 else 0.0, 3
+        ),
+        "ops_per_s": round(1 / median, 1),
+    }
+
+
+def _security_cases(bcrypt_rounds: list[int]) -> list[Case]:
+    from app.utils.hashing import pwd_context
+    from app.utils.security import Security
+
+    token = Security.create_access_token({"sub": "micro@example.com"})
+
+    def verify_uncached() -> dict:
+        Security.invalidate_token(token)
+        return Security.verify_token(token)
+
+    cases = [
+        Case(
+            "security.create_access_token",
+            lambda: Security.create_access_token({"sub": "micro@example.com"}),
+        ),
+        Case(
+            "security.verify_token[cached]",
+            lambda: Security.verify_token(token),
+        ),
+        Case("security.verify_token[uncached]", verify_uncached),
+    ]
+    for rounds in bcrypt_rounds:
+        hashed = pwd_context.handler().using(rounds=rounds).hash(PASSWORD)
+        cases.append(
+            Case(
+                f"security.verify_password[rounds={rounds}]",
+                lambda hashed=hashed: Security.verify_password(
+                    PASSWORD, hashed
+                ),
+            )
+        )
+    return cases
+
+
+def _schema_cases() -> list[Case]:
+    from app.models.auth import User
+    from app.schemas import CreateUserSchema, UserSchema
+
+    body = {
+        "email": "micro@example.com",
+        "password": PASSWORD,
+        "username": "micro",
+        "full_name": "Micro Benchmark",
+    }
+    user = User(
+        id=1,
+        email="micro@example.com",
+        full_name="Micro Benchmark",
+        is_active=True,
+        created_at=datetime.now(timezone.utc),
+    )
+    return [
+        Case(
+            "schemas.CreateUserSchema",
+            lambda: CreateUserSchema.model_validate(body),
+        ),
+        Case(
+            "schemas.UserSchema.model_validate",
+            lambda: UserSchema.model_validate(user),
+        ),
+    ]
+
+
+async def _repository_cases(users: int) -> list[Case]:
+    from sqlalchemy import update as sql_update
+
+    from app.db.base import SessionLocal
+    from app.models.auth import User
+    from app.repositories.auth.repositories import SqlAlchemyAuthRepository
+    from app.utils.hashing import pwd_context
+
+    # The cost does not matter here; only the stored string does.
+    hashed_password = pwd_context.handler().using(rounds=4).hash(PASSWORD)
+    run_id = uuid.uuid4().hex[:8]
+    async with SessionLocal() as session:
+        created = await SqlAlchemyAuthRepository(session).create_many(
+            [
+                User(
+                    email=f"micro-{run_id}-{i}@example.com",
+                    hashed_password=hashed_password,
+                )
+                for i in range(users)
+            ]
+        )
+    ids = itertools.cycle([user.id for user in created])
+    emails = itertools.cycle([user.email for user in created])
+    deletable = itertools.cycle([user.id for user in created])
+    to_delete: list[int] = []
+    editable = created[0]
+    counter = itertools.count()
+
+    def new_user() -> User:
+        return User(
+            email=f"micro-{run_id}-new{next(counter)}@example.com",
+            hashed_password=hashed_password,
+        )
+
+    async def load_default_role_id() -> int:
+        SqlAlchemyAuthRepository._default_role_id = None
+        async with SessionLocal() as session:
+            return await SqlAlchemyAuthRepository.load_default_role_id(session)
+
+    async def get_by_id() -> User | None:
+        async with SessionLocal() as session:
+            return await SqlAlchemyAuthRepository(session).get_by_id(next(ids))
+
+    async def get_by_email() -> User | None:
+        async with SessionLocal() as session:
+            return await SqlAlchemyAuthRepository(session).get_by_email(
+                next(emails)
+            )
+
+    async def create() -> User:
+        async with SessionLocal() as session:
+            return await SqlAlchemyAuthRepository(session).create(new_user())
+
+    async def create_many() -> list[User]:
+        async with SessionLocal() as session:
+            return await SqlAlchemyAuthRepository(session).create_many(
+                [new_user() for _ in range(100)]
+            )
+
+    async def update() -> User:
+        editable.full_name = f"Micro {next(counter)}"
+        async with SessionLocal() as session:
+            return await SqlAlchemyAuthRepository(session).update(editable)
+
+    async def reactivate() -> None:
+        # Deactivating an already inactive user would time a no-op.
+        user_id = next(deletable)
+        async with SessionLocal() as session:
+            await session.execute(
+                sql_update(User)
+                .where(User.id == user_id)
+                .values(is_active=True)
+            )
+            await session.commit()
+        to_delete.append(user_id)
+
+    async def delete() -> None:
+        async with SessionLocal() as session:
+            await SqlAlchemyAuthRepository(session).delete(to_delete.pop())
+
+    funcs = (
+        load_default_role_id,
+        get_by_id,
+        get_by_email,
+        create,
+        create_many,
+        update,
+        delete,
+    )
+    cases = [Case(name, func) for name, func in zip(REPOSITORY_CASES, funcs)]
+    cases[-1].setup = reactivate
+    return cases
+
+
+async def run(args: argparse.Namespace) -> dict:
+    from app.utils.security import Security
+
+    await Security.password_hasher.warm()
+    cases = _security_cases(args.bcrypt_rounds) + _schema_cases()
+    if args.database:
+        cases += await _repository_cases(args.users)
+    results = {}
+    try:
+        for case in cases:
+            if args.filter and args.filter not in case.name:
+                continue
+            result = await _measure(case, args.min_time, args.rounds)
+            results[case.name] = result
+            print(
+                f"{case.name:>42}: {result['median_us']:>12} us  "
+                f"(min {result['min_us']}, stdev {result['stdev_us']})"
+            )
+    finally:
+        if args.database:
+            from app.db.base import get_engine
+
+            await get_engine().dispose()
+    return {
+        "benchmark": "micro",
+        "environment": reporting.environment(),
+        "config": {
+            "min_time_s": args.min_time,
+            "rounds": args.rounds,
+            "users": args.users,
+        },
+        "cases": results,
+        "metrics": {
+            f"{name}.median_us": reporting.metric(
+                result["median_us"], reporting.LOWER
+            )
+            for name, result in results.items()
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filter")
+    parser.add_argument("--min-time", type=float, default=0.1)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument(
+        "--bcrypt-rounds", type=int, nargs="+", default=[4, 8, 10, 12]
+    )
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--output")
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+    logging.getLogger("passlib").setLevel(logging.ERROR)
+    # Only the repository cases need a database.
+    args.database = any(
+        not args.filter or args.filter in name for name in REPOSITORY_CASES
+    )
+
+    database = disposable_database("micro") if args.database else nullcontext()
+    with database:
+        report = asyncio.run(run(args))
+
+    if args.output:
+        reporting.save(args.output, report)
+    if args.baseline:
+        comparisons = reporting.compare(
+            report, reporting.load(args.baseline), args.tolerance
+        )
+        reporting.print_comparison(comparisons)
+        if any(comparison.regressed for comparison in comparisons):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
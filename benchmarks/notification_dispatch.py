@@ -0,0 +1,224 @@
+"""
+Notification dispatch throughput against local fake SMTP/webhook receivers.
+
+Queues ``--notifications`` pending price-drop notifications for
+``--users`` users (so about notifications/users per user), a
+``--webhook-share`` of them to webhooks and the rest by email, and runs
+``--dispatchers`` ``NotificationDispatcher``s side by side until the
+outbox is drained. The receivers (``benchmarks.fake_receivers``) reject
+``--fail-rate`` of deliveries with a transient error, which the
+dispatchers retry after a short backoff.
+
+Reports notifications/s and messages/s delivered, how many notifications
+each message carried (the digest ratio), retries, connections the
+receivers accepted (reused connections keep this at the pool sizes) and
+notifications delivered more than once (should be 0).
+
+Runs against the database configured in ``.env`` (migrated) and sends any
+other due notifications in it to the fakes too; the rows it writes are
+deleted afterwards.
+
+Usage:
+    python -m benchmarks.notification_dispatch --notifications 20000 \\
+        --users 5000 --dispatchers 2 --fail-rate 0.05
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+
+from sqlalchemy import delete, func, insert, select
+
+from app.db.base import SessionLocal
+from app.models.alert import Notification
+from app.models.alert.models import NOTIFICATION_PENDING
+from app.models.auth import User
+from app.repositories.alert.repositories import PRICE_DROP
+from app.services.notification.dispatcher import NotificationDispatcher
+from app.services.notification.senders import EmailSender, WebhookSender
+from benchmarks.fake_receivers import FakeSmtpServer, FakeWebhookServer
+
+CHUNK = 10000
+
+
+async def _setup(
+    users: int, notifications: int, webhook_share: float, hooks: str
+) -> list[int]:
+    run = uuid.uuid4().hex[:12]
+    async with SessionLocal() as session:
+        user_ids = list(
+            (
+                await session.execute(
+                    insert(User).returning(User.id),
+                    [
+                        {"email": f"bench-{run}-{i}@example.com"}
+                        for i in range(users)
+                    ],
+                )
+            ).scalars()
+        )
+        webhook_users = set(
+            random.sample(user_ids, round(users * webhook_share))
+        )
+        rows = []
+        for i in range(notifications):
+            user_id = random.choice(user_ids)
+            webhook = user_id in webhook_users
+            rows.append(
+                {
+                    "user_id": user_id,
+                    "channel": "webhook" if webhook else "email",
+                    "recipient": (
+                        f"{hooks}/{user_id}"
+                        if webhook
+                        else f"bench-{run}-{user_id}@example.com"
+                    ),
+                    "kind": PRICE_DROP,
+                    "payload": {
+                        "product_id": i,
+                        "product_name": f"Product {i}",
+                        "price": "9.99",
+                        "target_price": "10.00",
+                        "currency": "USD",
+                    },
+                    "status": NOTIFICATION_PENDING,
+                    "attempts": 0,
+                }
+            )
+        for i in range(0, len(rows), CHUNK):
+            await session.execute(insert(Notification), rows[i : i + CHUNK])
+        await session.commit()
+    return user_ids
+
+
+async def _cleanup(user_ids: list[int]) -> None:
+    async with SessionLocal() as session:
+        await session.execute(
+            delete(Notification).where(Notification.user_id.in_(user_ids))
+        )
+        await session.execute(delete(User).where(User.id.in_(user_ids)))
+        await session.commit()
+
+
+async def _counts(user_ids: list[int]) -> dict[str, int]:
+    async with SessionLocal() as session:
+        result = await session.execute(
+            select(Notification.status, func.count())
+            .where(Notification.user_id.in_(user_ids))
+            .group_by(Notification.status)
+        )
+        return dict(result.all())
+
+
+async def run(
+    notifications: int,
+    users: int,
+    webhook_share: float,
+    dispatchers: int,
+    batch_size: int,
+    fail_rate: float,
+) -> dict:
+    smtp = FakeSmtpServer(fail_rate, seed=1)
+    webhooks = FakeWebhookServer(fail_rate, seed=2)
+    await smtp.start()
+    await webhooks.start()
+    user_ids = await _setup(
+        users, notifications, webhook_share, webhooks.url("/hooks")
+    )
+    workers = [
+        NotificationDispatcher(
+            session_factory=SessionLocal,
+            senders={
+                "email": EmailSender(
+                    host="127.0.0.1",
+                    port=smtp.port,
+                    sender="alerts@example.com",
+                    connections=4,
+                    rate_per_second=0,
+                    timeout=10,
+                ),
+                # The fake receiver listens on plain HTTP on localhost.
+                "webhook": WebhookSender(
+                    concurrency=16,
+                    rate_per_second=0,
+                    timeout=10,
+                    check_destinations=False,
+                ),
+            },
+            batch_size=batch_size,
+            poll_interval=0.05,
+            lease_seconds=60,
+            max_attempts=10,
+            backoff_base=0.05,
+            backoff_max=0.5,
+            digest_window=0,
+            digest_limit=batch_size * 5,
+        )
+        for _ in range(dispatchers)
+    ]
+    stop = asyncio.Event()
+    try:
+        started = time.perf_counter()
+        tasks = [asyncio.create_task(worker.run(stop)) for worker in workers]
+        while (await _counts(user_ids)).get(NOTIFICATION_PENDING):
+            await asyncio.sleep(0.1)
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await asyncio.gather(*tasks)
+        counts = await _counts(user_ids)
+    finally:
+        stop.set()
+        for worker in workers:
+            await worker.aclose()
+        await smtp.stop()
+        await webhooks.stop()
+        await _cleanup(user_ids)
+
+    messages = smtp.delivered + webhooks.delivered
+    claimed = sum(worker.claimed for worker in workers)
+    return {
+        "notifications": notifications,
+        "elapsed_s": round(elapsed, 2),
+        "notifications_per_s": round(notifications / elapsed, 1),
+        "messages_per_s": round(messages / elapsed, 1),
+        "messages": messages,
+        "rows_per_message": round(
+            claimed / sum(worker.messages for worker in workers), 2
+        ),
+        "retries": sum(worker.retried for worker in workers),
+        "sent": counts.get("sent", 0),
+        "failed": counts.get("failed", 0),
+        "smtp_connections": smtp.connections,
+        "webhook_connections": webhooks.connections,
+        "duplicates": smtp.duplicates + webhooks.duplicates,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notifications", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--webhook-share", type=float, default=0.3)
+    parser.add_argument("--dispatchers", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--fail-rate", type=float, default=0.05)
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        run(
+            args.notifications,
+            args.users,
+            args.webhook_share,
+            args.dispatchers,
+            args.batch_size,
+            args.fail_rate,
+        )
+    )
+    for key, value in report.items():
+        print(f"{key:>20}: {value}")
+
+
+if __name__ == "__main__":
+    main()
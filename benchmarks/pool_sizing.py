@@ -0,0 +1,196 @@
+"""
+Connection pool liveness checks and adaptive sizing.
+
+First times ``--checkouts`` checkouts, each running ``SELECT 1``, on a
+private engine with per-checkout ``pre_ping`` and on one relying on
+``PoolMaintainer`` background liveness checks instead; the variants run
+interleaved for ``--rounds`` rounds and the fastest round of each counts.
+
+Then drives a private ``InstrumentedQueuePool`` starting at ``--min-size``
+with a ``PoolSizeController`` adjusting it every ``--interval`` seconds:
+``--concurrency`` tasks each holding a connection for ``--hold-ms`` per
+checkout for ``--duration`` seconds, followed by a quiet phase of two
+tasks. Reports the pool size at each adjustment, and per phase the mean
+checkout wait and timeouts, to show the size converging on the load and
+coming back down.
+
+Runs against the database configured in ``.env``; writes nothing.
+
+Usage:
+    python -m benchmarks.pool_sizing --checkouts 2000 --concurrency 16 \\
+        --duration 10
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import get_settings
+from app.db.pool import (
+    InstrumentedQueuePool,
+    PoolMaintainer,
+    PoolSizeController,
+)
+
+settings = get_settings()
+
+
+def _engine(**kw):
+    return create_async_engine(
+        settings.database_url, poolclass=InstrumentedQueuePool, **kw
+    )
+
+
+async def _per_checkout(engine, checkouts: int) -> float:
+    started = time.perf_counter()
+    for _ in range(checkouts):
+        async with engine.connect() as connection:
+            await connection.exec_driver_sql("SELECT 1")
+    return (time.perf_counter() - started) / checkouts * 1e6
+
+
+async def _fastest(rounds: int, variants: dict) -> dict[str, float]:
+    best = {name: float("inf") for name in variants}
+    for _ in range(rounds):
+        for name, call in variants.items():
+            best[name] = min(best[name], await call())
+    return best
+
+
+async def _load(engine, tasks: int, hold: float, duration: float) -> None:
+    deadline = time.perf_counter() + duration
+    sql = f"SELECT pg_sleep({hold})"
+
+    async def client() -> None:
+        while time.perf_counter() < deadline:
+            try:
+                async with engine.connect() as connection:
+                    await connection.exec_driver_sql(sql)
+            except exc.TimeoutError:
+                pass
+
+    await asyncio.gather(*(client() for _ in range(tasks)))
+
+
+async def _phase(maintainer, tasks, hold, duration, sizes) -> dict:
+    pool = maintainer.pool
+    checkouts, waited, timeouts = (
+        pool.checkouts,
+        pool.wait_seconds,
+        pool.timeouts,
+    )
+    await _load(maintainer.engine, tasks, hold, duration)
+    checkouts = pool.checkouts - checkouts
+    return {
+        "sizes": sizes[:],
+        "mean_wait_ms": round(
+            (pool.wait_seconds - waited) / max(checkouts, 1) * 1000, 3
+        ),
+        "timeouts": pool.timeouts - timeouts,
+        "checkouts": checkouts,
+    }
+
+
+async def run(
+    checkouts: int,
+    rounds: int,
+    min_size: int,
+    max_size: int,
+    concurrency: int,
+    hold_ms: float,
+    duration: float,
+    interval: float,
+) -> dict:
+    report: dict = {}
+    pinged = _engine(pool_size=1, pool_pre_ping=True)
+    background = _engine(pool_size=1)
+    try:
+        timings = await _fastest(
+            rounds,
+            {
+                "pre_ping": lambda: _per_checkout(pinged, checkouts),
+                "background": lambda: _per_checkout(background, checkouts),
+            },
+        )
+        maintainer = PoolMaintainer(background, liveness_interval=1)
+        started = time.perf_counter()
+        await maintainer.check_idle()
+        report["liveness_check_us"] = round(
+            (time.perf_counter() - started) * 1e6, 1
+        )
+    finally:
+        await pinged.dispose()
+        await background.dispose()
+    report["checkout_pre_ping_us"] = round(timings["pre_ping"], 1)
+    report["checkout_background_us"] = round(timings["background"], 1)
+    report["pre_ping_saved_us"] = round(
+        timings["pre_ping"] - timings["background"], 1
+    )
+
+    engine = _engine(
+        pool_size=min_size,
+        max_pool_size=max_size,
+        max_overflow=0,
+        pool_timeout=1,
+    )
+    maintainer = PoolMaintainer(
+        engine,
+        controller=PoolSizeController(min_size, max_size, target_wait=0.005),
+        adjust_interval=interval,
+    )
+    sizes: list[int] = []
+
+    async def sample() -> None:
+        while True:
+            await asyncio.sleep(interval)
+            sizes.append(maintainer.adjust())
+
+    sampler = asyncio.create_task(sample())
+    hold = hold_ms / 1000
+    try:
+        busy = await _phase(maintainer, concurrency, hold, duration, sizes)
+        sizes.clear()
+        quiet = await _phase(maintainer, 2, hold, duration, sizes)
+    finally:
+        sampler.cancel()
+        await engine.dispose()
+    for name, phase in (("busy", busy), ("quiet", quiet)):
+        for key, value in phase.items():
+            report[f"{name}_{key}"] = value
+    report["resizes"] = maintainer.resizes
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--checkouts", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--min-size", type=int, default=2)
+    parser.add_argument("--max-size", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--hold-ms", type=float, default=5.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--interval", type=float, default=1.0)
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        run(
+            args.checkouts,
+            args.rounds,
+            args.min_size,
+            args.max_size,
+            args.concurrency,
+            args.hold_ms,
+            args.duration,
+            args.interval,
+        )
+    )
+    for key, value in report.items():
+        print(f"{key:>22}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Price chart latency: rollup tables against aggregating raw history.
+
+Writes ``--days`` days of price history for ``--products`` products with
+``--sources`` sources each, ``--points-per-day`` points per source and
+day, oldest first in batches of ``--batch`` through ``record_prices``
+(which maintains the daily and weekly rollups), then checks the rollups
+against a full recompute from the raw points.
+
+Each chart range is then requested ``--requests`` times two ways:
+
+    raw      load every point in the range and aggregate per day in
+             Python (what a chart costs without rollups)
+    rollup   ``PriceChartService.get_chart``: raw points for short
+             ranges, daily or weekly rollups for longer ones, downsampled
+             to ``--chart-points`` with LTTB
+
+Reports ingest points/s, rollup mismatches (should be 0), and per range
+the ms per request and points returned by each.
+
+Runs against the database configured in ``.env`` (migrated); creates the
+monthly partitions the history needs and deletes its rows afterwards.
+
+Usage:
+    python -m benchmarks.price_charts --products 10 --sources 3 \\
+        --days 365 --points-per-day 12
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import delete, insert, text
+
+from app.db.base import SessionLocal
+from app.models.product import PricePoint, Product, ProductSource
+from app.repositories.product.protocols import PriceObservation
+from app.repositories.product.repositories import SqlAlchemyProductRepository
+from app.services.product.charts import PriceChartService
+
+RANGES = (7, 30, 90, 365)
+
+# Rollup rows that differ from a recompute over the raw points.
+MISMATCHES = """
+SELECT count(*) FROM (
+    (SELECT product_id, currency, bucket, min_price, max_price, price_sum,
+            price_count, last_observed_at
+     FROM {table} WHERE product_id = ANY(:ids)
+     EXCEPT
+     SELECT product_id, currency, {bucket}, min(price), max(price),
+            sum(price), count(*), max(observed_at)
+     FROM price_points WHERE product_id = ANY(:ids) GROUP BY 1, 2, 3)
+    UNION ALL
+    (SELECT product_id, currency, {bucket}, min(price), max(price),
+            sum(price), count(*), max(observed_at)
+     FROM price_points WHERE product_id = ANY(:ids) GROUP BY 1, 2, 3
+     EXCEPT
+     SELECT product_id, currency, bucket, min_price, max_price, price_sum,
+            price_count, last_observed_at
+     FROM {table} WHERE product_id = ANY(:ids))
+) AS differences
+"""
+DAY = "(observed_at AT TIME ZONE 'UTC')::date"
+WEEK = f"date_trunc('week', {DAY})::date"
+
+
+async def _setup(products: int, sources: int, days: int) -> dict:
+    run = uuid.uuid4().hex[:12]
+    async with SessionLocal() as session:
+        repository = SqlAlchemyProductRepository(session)
+        await repository.ensure_partitions(
+            date.today() - timedelta(days=days + 1), days // 28 + 3
+        )
+        product_ids = list(
+            (
+                await session.execute(
+                    insert(Product).returning(Product.id),
+                    [
+                        {"name": f"bench-{run}-{i}", "is_active": True}
+                        for i in range(products)
+                    ],
+                )
+            ).scalars()
+        )
+        result = await session.execute(
+            insert(ProductSource).returning(
+                ProductSource.id, ProductSource.product_id
+            ),
+            [
+                {
+                    "product_id": product_id,
+                    "url": f"https://example.com/{run}/{product_id}/{i}",
+                    "domain": "example.com",
+                    "currency": "USD",
+                    "is_active": True,
+                }
+                for product_id in product_ids
+                for i in range(sources)
+            ],
+        )
+        sources_of = dict(result.all())
+        await session.commit()
+    return sources_of
+
+
+async def _cleanup(sources_of: dict[int, int]) -> None:
+    product_ids = list(set(sources_of.values()))
+    async with SessionLocal() as session:
+        await session.execute(
+            delete(PricePoint).where(PricePoint.product_id.in_(product_ids))
+        )
+        await session.execute(
+            delete(ProductSource).where(ProductSource.id.in_(sources_of))
+        )
+        # The rollups go with their products.
+        await session.execute(
+            delete(Product).where(Product.id.in_(product_ids))
+        )
+        await session.commit()
+
+
+def _history(
+    sources_of: dict[int, int], days: int, per_day: int
+) -> list[PriceObservation]:
+    now = datetime.now(timezone.utc)
+    start = now - timedelta(days=days)
+    step = timedelta(days=1) / per_day
+    prices = {source_id: 10000 for source_id in sources_of}
+    history = []
+    for i in range(days * per_day):
+        observed_at = start + i * step + timedelta(seconds=random.random())
+        for source_id, product_id in sources_of.items():
+            prices[source_id] = max(
+                100, prices[source_id] + random.randint(-300, 300)
+            )
+            history.append(
+                PriceObservation(
+                    product_id=product_id,
+                    source_id=source_id,
+                    price=Decimal(prices[source_id]) / 100,
+                    currency="USD",
+                    in_stock=True,
+                    observed_at=observed_at,
+                )
+            )
+    return history
+
+
+async def _raw_chart(product_id: int, days: int) -> int:
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    async with SessionLocal() as session:
+        history = await SqlAlchemyProductRepository(session).get_price_history(
+            product_id, since
+        )
+    buckets: dict[date, list[Decimal]] = {}
+    for point in history:
+        buckets.setdefault(point.observed_at.date(), []).append(point.price)
+    chart = [
+        (day, min(prices), max(prices), sum(prices) / len(prices))
+        for day, prices in buckets.items()
+    ]
+    return len(chart)
+
+
+async def _rollup_chart(product_id: int, days: int, points: int) -> int:
+    async with SessionLocal() as session:
+        service = PriceChartService(
+            SqlAlchemyProductRepository(session),
+            raw_max_days=7,
+            daily_max_days=180,
+            max_points=1000,
+        )
+        chart = await service.get_chart(product_id, days, "USD", points)
+    return len(chart.points)
+
+
+async def _timed(requests: int, call) -> tuple[float, int]:
+    started = time.perf_counter()
+    for _ in range(requests):
+        returned = await call()
+    return (time.perf_counter() - started) / requests * 1000, returned
+
+
+async def run(
+    products: int,
+    sources: int,
+    days: int,
+    per_day: int,
+    batch: int,
+    requests: int,
+    chart_points: int,
+) -> dict:
+    sources_of = await _setup(products, sources, days)
+    product_ids = list(set(sources_of.values()))
+    report: dict = {}
+    try:
+        history = _history(sources_of, days, per_day)
+        started = time.perf_counter()
+        for i in range(0, len(history), batch):
+            async with SessionLocal() as session:
+                await SqlAlchemyProductRepository(session).record_prices(
+                    history[i : i + batch]
+                )
+        elapsed = time.perf_counter() - started
+        report["points"] = len(history)
+        report["ingest_points_per_s"] = round(len(history) / elapsed, 1)
+
+        async with SessionLocal() as session:
+            await session.execute(text("ANALYZE price_daily, price_weekly"))
+            for table, bucket in (
+                ("price_daily", DAY),
+                ("price_weekly", WEEK),
+            ):
+                report[f"{table}_rows"] = (
+                    await session.execute(
+                        text(
+                            f"SELECT count(*) FROM {table} "
+                            "WHERE product_id = ANY(:ids)"
+                        ),
+                        {"ids": product_ids},
+                    )
+                ).scalar()
+                report[f"{table}_mismatches"] = (
+                    await session.execute(
+                        text(MISMATCHES.format(table=table, bucket=bucket)),
+                        {"ids": product_ids},
+                    )
+                ).scalar()
+
+        for days_back in RANGES:
+            if days_back > days:
+                continue
+            product_id = random.choice(product_ids)
+            raw_ms, raw_points = await _timed(
+                requests, lambda: _raw_chart(product_id, days_back)
+            )
+            rollup_ms, rollup_points = await _timed(
+                requests,
+                lambda: _rollup_chart(product_id, days_back, chart_points),
+            )
+            report[f"{days_back}d"] = {
+                "raw_ms": round(raw_ms, 2),
+                "rollup_ms": round(rollup_ms, 2),
+                "speedup": round(raw_ms / rollup_ms, 1),
+                "raw_points": raw_points,
+                "rollup_points": rollup_points,
+            }
+    finally:
+        await _cleanup(sources_of)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=10)
+    parser.add_argument("--sources", type=int, default=3)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--points-per-day", type=int, default=12)
+    parser.add_argument("--batch", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--chart-points", type=int, default=200)
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        run(
+            args.products,
+            args.sources,
+            args.days,
+            args.points_per_day,
+            args.batch,
+            args.requests,
+            args.chart_points,
+        )
+    )
+    for key, value in report.items():
+        print(f"{key:>24}: {value}")
+
+
+if __name__ == "__main__":
+    main()
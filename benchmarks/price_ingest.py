@@ -0,0 +1,119 @@
+"""
+Price-history write throughput benchmark.
+
+Appends ``--rows`` price observations for one product, spread over the
+current month, with each of three strategies and reports rows/s:
+
+    orm      one ORM object per row (``session.add_all`` + flush)
+    insert   one batched ``INSERT`` executemany
+    copy     ``ProductProtocol.record_prices`` (``COPY ... FROM STDIN``)
+
+Runs against the database configured in ``.env`` (migrated); the rows it
+writes are deleted afterwards.
+
+Usage:
+    python -m benchmarks.price_ingest --rows 50000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from dataclasses import asdict
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import delete, insert
+
+from app.db.base import SessionLocal
+from app.models.product import PricePoint, Product, ProductSource
+from app.repositories.product.protocols import PriceObservation
+from app.repositories.product.repositories import SqlAlchemyProductRepository
+
+
+def _observations(
+    product_id: int, source_id: int, rows: int
+) -> list[PriceObservation]:
+    month = datetime.now(timezone.utc).replace(
+        day=1, hour=0, minute=0, second=0, microsecond=0
+    )
+    step = timedelta(days=27) / rows
+    return [
+        PriceObservation(
+            product_id=product_id,
+            source_id=source_id,
+            price=Decimal(random.randint(1000, 99999)) / 100,
+            currency="USD",
+            in_stock=True,
+            observed_at=month + step * i,
+        )
+        for i in range(rows)
+    ]
+
+
+async def run(rows: int) -> dict:
+    async with SessionLocal() as session:
+        repository = SqlAlchemyProductRepository(session)
+        await repository.ensure_partitions(date.today(), 1)
+        product = await repository.create(Product(name="benchmark"))
+        source = await repository.add_source(
+            ProductSource(
+                product_id=product.id,
+                url=f"https://example.com/{uuid.uuid4().hex}",
+                domain="example.com",
+            )
+        )
+        product_id, source_id = product.id, source.id
+
+    report = {"rows": rows}
+    try:
+        for strategy in ("orm", "insert", "copy"):
+            observations = _observations(product_id, source_id, rows)
+            async with SessionLocal() as session:
+                started = time.perf_counter()
+                if strategy == "orm":
+                    session.add_all(
+                        PricePoint(**asdict(observation))
+                        for observation in observations
+                    )
+                    await session.commit()
+                elif strategy == "insert":
+                    await session.execute(
+                        insert(PricePoint),
+                        [asdict(observation) for observation in observations],
+                    )
+                    await session.commit()
+                else:
+                    await SqlAlchemyProductRepository(session).record_prices(
+                        observations
+                    )
+                elapsed = time.perf_counter() - started
+            report[f"{strategy}_rows_per_s"] = round(rows / elapsed)
+    finally:
+        async with SessionLocal() as session:
+            await session.execute(
+                delete(PricePoint).where(PricePoint.product_id == product_id)
+            )
+            await session.execute(
+                delete(ProductSource).where(ProductSource.id == source_id)
+            )
+            await session.execute(
+                delete(Product).where(Product.id == product_id)
+            )
+            await session.commit()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=50000)
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.rows))
+    for key, value in report.items():
+        print(f"{key:>18}: {value}")
+
+
+if __name__ == "__main__":
+    main()
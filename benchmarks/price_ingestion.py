@@ -0,0 +1,135 @@
+"""
+Change-only price ingestion benchmark.
+
+Simulates ``--rounds`` scrape rounds over ``--sources`` product sources in
+which each price changes with probability ``--change-rate``, and feeds
+every round through ``PriceIngestionService.ingest`` as one batch. Reports
+observations/s, how many price points were written compared to storing
+every observation, and the last-price cache hit rate.
+
+Runs against the database configured in ``.env`` (migrated); the rows it
+writes are deleted afterwards.
+
+Usage:
+    python -m benchmarks.price_ingestion --sources 5000 --rounds 10 \\
+        --change-rate 0.05
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import delete, insert
+
+from app.db.base import SessionLocal
+from app.models.product import PricePoint, Product, ProductSource
+from app.repositories.product.protocols import PriceObservation
+from app.repositories.product.repositories import SqlAlchemyProductRepository
+from app.services.product.ingestion import PriceIngestionService
+
+
+async def _sources(count: int) -> tuple[int, list[int]]:
+    async with SessionLocal() as session:
+        repository = SqlAlchemyProductRepository(session)
+        await repository.ensure_partitions(date.today(), 1)
+        product = await repository.create(Product(name="benchmark"))
+        run = uuid.uuid4().hex
+        result = await session.execute(
+            insert(ProductSource).returning(ProductSource.id),
+            [
+                {
+                    "product_id": product.id,
+                    "url": f"https://example.com/{run}/{i}",
+                    "domain": "example.com",
+                    "currency": "USD",
+                    "is_active": True,
+                }
+                for i in range(count)
+            ],
+        )
+        source_ids = list(result.scalars().all())
+        await session.commit()
+        return product.id, source_ids
+
+
+async def run(sources: int, rounds: int, change_rate: float) -> dict:
+    product_id, source_ids = await _sources(sources)
+    prices = {
+        source_id: Decimal(random.randint(1000, 99999)) / 100
+        for source_id in source_ids
+    }
+    PriceIngestionService.last_prices.clear()
+    written = 0
+    elapsed = 0.0
+    started_at = datetime.now(timezone.utc) - timedelta(hours=rounds)
+    try:
+        for round_number in range(rounds):
+            observed_at = started_at + timedelta(hours=round_number)
+            batch = []
+            for source_id in source_ids:
+                if random.random() < change_rate:
+                    prices[source_id] += Decimal("1.00")
+                batch.append(
+                    PriceObservation(
+                        product_id=product_id,
+                        source_id=source_id,
+                        price=prices[source_id],
+                        currency="USD",
+                        in_stock=True,
+                        observed_at=observed_at,
+                    )
+                )
+            async with SessionLocal() as session:
+                service = PriceIngestionService(
+                    SqlAlchemyProductRepository(session), heartbeat=86400
+                )
+                started = time.perf_counter()
+                report = await service.ingest(batch)
+                elapsed += time.perf_counter() - started
+            written += report.written
+    finally:
+        async with SessionLocal() as session:
+            await session.execute(
+                delete(PricePoint).where(PricePoint.product_id == product_id)
+            )
+            await session.execute(
+                delete(ProductSource).where(
+                    ProductSource.product_id == product_id
+                )
+            )
+            await session.execute(
+                delete(Product).where(Product.id == product_id)
+            )
+            await session.commit()
+
+    observations = sources * rounds
+    stats = PriceIngestionService.stats()
+    return {
+        "observations": observations,
+        "observations_per_s": round(observations / elapsed),
+        "price_points_written": written,
+        "write_reduction": f"{observations / max(written, 1):.1f}x",
+        "cache_hit_rate": round(
+            stats["hits"] / max(stats["hits"] + stats["misses"], 1), 3
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sources", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--change-rate", type=float, default=0.05)
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.sources, args.rounds, args.change_rate))
+    for key, value in report.items():
+        print(f"{key:>22}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+Product listing latency: keyset pages, full-text search, column selects.
+
+Creates ``--products`` active products with a current price, drop
+percentage and a source on one of ``--retailers`` domains, then times
+``--requests`` requests of each of:
+
+    offset / keyset     the page ``--depth`` rows deep in price order,
+                        with ``OFFSET`` and with the repository's keyset
+                        seek past the previous page's (price, id)
+    ilike / tsvector    a search for a kind of product and a model number,
+                        as ``name ILIKE '%...%'`` per word and through
+                        ``ProductCatalogService`` (prefix match on the
+                        GIN-indexed search vector)
+    orm / columns       a ``--limit`` row page loading full ``Product``
+                        objects, and selecting only the listing columns
+    retailer            a page of one retailer's products by biggest drop
+
+Reports the ms per request of each, and the speedups.
+
+Runs against the database configured in ``.env`` (migrated); deletes its
+rows afterwards.
+
+Usage:
+    python -m benchmarks.product_listing --products 50000 --depth 40000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from decimal import Decimal
+
+from sqlalchemy import and_, delete, insert, select, text
+
+from app.db.base import SessionLocal
+from app.models.product import Product, ProductSource
+from app.repositories.product import ProductFilter
+from app.repositories.product.repositories import (
+    LISTING_COLUMNS,
+    SqlAlchemyProductRepository,
+)
+from app.services.product.catalog import ProductCatalogService
+
+CHUNK = 5000
+BRANDS = ("Acme", "Globex", "Initech", "Umbrella", "Soylent", "Hooli")
+KINDS = (
+    "phone",
+    "laptop",
+    "headphones",
+    "kettle",
+    "monitor",
+    "keyboard",
+    "camera",
+    "speaker",
+    "blender",
+    "router",
+)
+ADJECTIVES = ("pro", "mini", "max", "ultra", "lite", "plus", "air", "neo")
+
+
+async def _setup(products: int, retailers: int) -> tuple[str, list[int]]:
+    run = uuid.uuid4().hex[:12]
+    async with SessionLocal() as session:
+        product_ids: list[int] = []
+        for start in range(0, products, CHUNK):
+            rows = []
+            for i in range(start, min(start + CHUNK, products)):
+                price = Decimal(random.randint(500, 200000)) / 100
+                drop = Decimal(random.randint(0, 6000)) / 100
+                rows.append(
+                    {
+                        "name": (
+                            f"{random.choice(KINDS)} "
+                            f"{random.choice(ADJECTIVES)} {i} bench{run}"
+                        ),
+                        "brand": random.choice(BRANDS),
+                        "is_active": True,
+                        "lowest_price": price,
+                        "currency": "USD",
+                        "in_stock": random.random() < 0.8,
+                        "reference_price": (
+                            price * 100 / (100 - drop)
+                        ).quantize(Decimal("0.01")),
+                        "drop_pct": drop,
+                    }
+                )
+            product_ids += (
+                await session.execute(
+                    insert(Product).returning(Product.id), rows
+                )
+            ).scalars()
+        for start in range(0, products, CHUNK):
+            await session.execute(
+                insert(ProductSource),
+                [
+                    {
+                        "product_id": product_id,
+                        "url": f"https://shop{product_id % retailers}.example"
+                        f"/{run}/{product_id}",
+                        "domain": f"shop{product_id % retailers}.example",
+                        "currency": "USD",
+                        "is_active": True,
+                    }
+                    for product_id in product_ids[start : start + CHUNK]
+                ],
+            )
+        await session.execute(text("ANALYZE products, product_sources"))
+        await session.commit()
+    return run, product_ids
+
+
+async def _cleanup(product_ids: list[int]) -> None:
+    async with SessionLocal() as session:
+        for start in range(0, len(product_ids), CHUNK):
+            chunk = product_ids[start : start + CHUNK]
+            await session.execute(
+                delete(ProductSource).where(
+                    ProductSource.product_id.in_(chunk)
+                )
+            )
+            await session.execute(delete(Product).where(Product.id.in_(chunk)))
+        await session.commit()
+
+
+def _price_order(query):
+    return query.where(
+        Product.is_active == True,  # noqa: E712
+        Product.lowest_price.isnot(None),
+    ).order_by(Product.lowest_price, Product.id)
+
+
+async def _offset_page(depth: int, limit: int) -> list:
+    async with SessionLocal() as session:
+        result = await session.execute(
+            _price_order(select(*LISTING_COLUMNS)).offset(depth).limit(limit)
+        )
+        return result.all()
+
+
+async def _keyset_page(after: tuple, limit: int) -> list:
+    async with SessionLocal() as session:
+        return await SqlAlchemyProductRepository(session).list_products(
+            ProductFilter(), "price", after, limit
+        )
+
+
+async def _ilike_search(words: list[str], limit: int) -> list:
+    async with SessionLocal() as session:
+        result = await session.execute(
+            select(*LISTING_COLUMNS)
+            .where(
+                Product.is_active == True,  # noqa: E712
+                and_(*(Product.name.ilike(f"%{word}%") for word in words)),
+            )
+            .order_by(Product.id.desc())
+            .limit(limit)
+        )
+        return result.all()
+
+
+async def _catalog_page(filters: ProductFilter, sort: str, limit: int):
+    async with SessionLocal() as session:
+        service = ProductCatalogService(SqlAlchemyProductRepository(session))
+        return (await service.list_products(filters, sort, None, limit)).items
+
+
+async def _orm_page(limit: int) -> list:
+    async with SessionLocal() as session:
+        result = await session.execute(
+            _price_order(select(Product)).limit(limit)
+        )
+        return list(result.scalars().all())
+
+
+async def _column_page(limit: int) -> list:
+    async with SessionLocal() as session:
+        result = await session.execute(
+            _price_order(select(*LISTING_COLUMNS)).limit(limit)
+        )
+        return result.all()
+
+
+async def _timed(requests: int, call) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        await call()
+    return (time.perf_counter() - started) / requests * 1000
+
+
+async def run(
+    products: int, retailers: int, depth: int, limit: int, requests: int
+) -> dict:
+    _, product_ids = await _setup(products, retailers)
+    report: dict = {"products": products}
+    try:
+        previous = (await _offset_page(depth - 1, 1))[0]
+        after = (previous.lowest_price, previous.id)
+        offset_rows = await _offset_page(depth, limit)
+        keyset_rows = await _keyset_page(after, limit)
+        report["same_page"] = [row.id for row in offset_rows] == [
+            row.id for row in keyset_rows
+        ]
+        offset_ms = await _timed(requests, lambda: _offset_page(depth, limit))
+        keyset_ms = await _timed(requests, lambda: _keyset_page(after, limit))
+        report["offset_ms"] = round(offset_ms, 2)
+        report["keyset_ms"] = round(keyset_ms, 2)
+        report["keyset_speedup"] = round(offset_ms / keyset_ms, 1)
+
+        # A kind and a model number: few matches, as in real searches.
+        words = [random.choice(KINDS), str(random.randrange(products))]
+        search = ProductFilter(q=" ".join(words))
+        ilike_ms = await _timed(
+            requests,
+            lambda: _ilike_search(words, limit),
+        )
+        tsvector_ms = await _timed(
+            requests, lambda: _catalog_page(search, "newest", limit)
+        )
+        report["ilike_ms"] = round(ilike_ms, 2)
+        report["tsvector_ms"] = round(tsvector_ms, 2)
+        report["search_speedup"] = round(ilike_ms / tsvector_ms, 1)
+
+        orm_ms = await _timed(requests, lambda: _orm_page(limit))
+        column_ms = await _timed(requests, lambda: _column_page(limit))
+        report["orm_ms"] = round(orm_ms, 2)
+        report["columns_ms"] = round(column_ms, 2)
+        report["columns_speedup"] = round(orm_ms / column_ms, 1)
+
+        retailer = ProductFilter(retailer="www.shop0.example")
+        report["retailer_ms"] = round(
+            await _timed(
+                requests, lambda: _catalog_page(retailer, "drop", limit)
+            ),
+            2,
+        )
+    finally:
+        await _cleanup(product_ids)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--products", type=int, default=50000)
+    parser.add_argument("--retailers", type=int, default=20)
+    parser.add_argument("--depth", type=int, default=40000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        run(
+            args.products,
+            args.retailers,
+            args.depth,
+            args.limit,
+            args.requests,
+        )
+    )
+    for key, value in report.items():
+        print(f"{key:>16}: {value}")
+
+
+if __name__ == "__main__":
+    main()
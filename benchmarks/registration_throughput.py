@@ -0,0 +1,108 @@
+"""
+Signups/sec benchmark for SqlAlchemyAuthRepository.create.
+
+Calls the repository directly with a precomputed bcrypt hash so only the
+database path is measured, against the database configured in ``.env``
+(migrated and seeded with ``app/db/seed.sql``). ``--duplicate-ratio`` of
+the signups reuse a small set of hot emails to create contention on the
+``users.email`` unique index. Statements executed per signup are counted
+with a cursor-execute listener.
+
+Usage:
+    python -m benchmarks.registration_throughput --signups 2000 \\
+        --concurrency 20 --duplicate-ratio 0.2
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+
+from sqlalchemy import event
+
+from app.core.exceptions import EmailAlreadyExistsException
+from app.db.base import SessionLocal, get_engine
+from app.models.auth import User
+from app.repositories.auth.repositories import SqlAlchemyAuthRepository
+from app.utils.security import Security
+
+
+async def run(
+    signups: int, concurrency: int, duplicate_ratio: float, hot_emails: int
+) -> dict:
+    engine = get_engine()
+    hashed_password = Security.hash_password("benchmark-password")
+    run_id = uuid.uuid4().hex[:8]
+    hot = [f"hot-{run_id}-{i}@example.com" for i in range(hot_emails)]
+    statements = 0
+
+    def count(*_):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    outcomes = {"created": 0, "conflict": 0, "error": 0}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        if random.random() < duplicate_ratio:
+            email = random.choice(hot)
+        else:
+            email = f"signup-{run_id}-{i}@example.com"
+        async with semaphore, SessionLocal() as session:
+            repository = SqlAlchemyAuthRepository(session)
+            try:
+                await repository.create(
+                    User(email=email, hashed_password=hashed_password)
+                )
+                outcomes["created"] += 1
+            except EmailAlreadyExistsException:
+                outcomes["conflict"] += 1
+            except Exception:
+                outcomes["error"] += 1
+
+    # Warm the pool and the default role cache outside the timed section.
+    async with SessionLocal() as session:
+        await SqlAlchemyAuthRepository.load_default_role_id(session)
+    statements = 0
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(signups)))
+    elapsed = time.perf_counter() - started
+    event.remove(engine.sync_engine, "before_cursor_execute", count)
+    await engine.dispose()
+
+    return {
+        "signups": signups,
+        "concurrency": concurrency,
+        "duplicate_ratio": duplicate_ratio,
+        "elapsed_s": round(elapsed, 3),
+        "signups_per_s": round(signups / elapsed, 1),
+        "statements_per_signup": round(statements / signups, 2),
+        **outcomes,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--signups", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.2)
+    parser.add_argument("--hot-emails", type=int, default=10)
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        run(
+            args.signups,
+            args.concurrency,
+            args.duplicate_ratio,
+            args.hot_emails,
+        )
+    )
+    for key, value in report.items():
+        print(f"{key:>22}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Machine-readable benchmark reports and baseline comparison.
+
+A report is a JSON object whose ``metrics`` map names to
+``{"value": ..., "better": "higher" | "lower"}``, so a stored report can
+serve as the baseline for a later run of the same benchmark without the
+comparison knowing what the metrics mean.
+"""
+
+import json
+import math
+import os
+import platform
+import subprocess
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+HIGHER = "higher"
+LOWER = "lower"
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    """The ``q`` (0-100) nearest-rank percentile of sorted values."""
+    if not ordered:
+        return math.nan
+    rank = max(math.ceil(q / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def metric(value: float, better: str) -> dict:
+    return {"value": value, "better": better}
+
+
+def environment() -> dict:
+    """Where a report was produced, to tell comparable runs apart."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def load(path: str | Path) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save(path: str | Path, report: dict) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+@dataclass
+class Comparison:
+    name: str
+    baseline: float
+    current: float
+    # Relative change against the baseline; positive means larger.
+    change: float
+    regressed: bool
+
+
+def compare(
+    current: dict, baseline: dict, tolerance: float
+) -> list[Comparison]:
+    """
+    Compare the metrics both reports have. A metric regresses when it
+    moved the wrong way by more than ``tolerance`` (a fraction of the
+    baseline value).
+    """
+    comparisons = []
+    for name, entry in sorted(current["metrics"].items()):
+        previous = baseline["metrics"].get(name)
+        if previous is None or not previous["value"]:
+            continue
+        change = entry["value"] / previous["value"] - 1
+        if entry["better"] == HIGHER:
+            regressed = change < -tolerance
+        else:
+            regressed = change > tolerance
+        comparisons.append(
+            Comparison(
+                name, previous["value"], entry["value"], change, regressed
+            )
+        )
+    return comparisons
+
+
+def print_comparison(comparisons: list[Comparison]) -> None:
+    width = max((len(c.name) for c in comparisons), default=0)
+    for c in comparisons:
+        flag = "REGRESSED" if c.regressed else ""
+        print(
+            f"{c.name:>{width}}: {c.baseline:>12.4g} -> "
+            f"{c.current:>12.4g} ({c.change:+.1%}) {flag}".rstrip()
+        )
@@ -0,0 +1,167 @@
+"""
+Overhead of request metrics: the middleware and the SQL cursor hooks.
+
+Calls the application's router directly as an ASGI app, ``--requests``
+times on ``/health``, three ways: bare, wrapped in ``MetricsMiddleware``
+with SQL sampling off, and with every request sampled. Then executes
+``SELECT 1`` ``--statements`` times on a private engine: without hooks,
+with ``instrument_engine`` hooks but no sampled request, and inside a
+sampled request.
+
+The variants run interleaved for ``--rounds`` rounds and the fastest
+round of each counts, which keeps noise from the database (and anything
+else on the box) out of the differences. Reports µs per request and per
+statement for each, the overhead against the bare case, and the size and
+render time of the ``/metrics`` page.
+
+Runs against the database configured in ``.env``; writes nothing.
+
+Usage:
+    python -m benchmarks.request_metrics --requests 20000 \\
+        --statements 5000 --rounds 5
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.api.middleware.metrics import MetricsMiddleware
+from app.core.config import get_settings
+from app.db.instrumentation import (
+    RequestStats,
+    instrument_engine,
+    request_stats,
+)
+from app.main import app
+from app.utils.metrics import registry
+
+settings = get_settings()
+
+
+def _scope(path: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+        "app": app,
+    }
+
+
+async def _receive() -> dict:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message: dict) -> None:
+    pass
+
+
+async def _per_request(asgi, requests: int) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        await asgi(_scope("/health"), _receive, _send)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+async def _per_statement(engine, statements: int) -> float:
+    async with engine.connect() as connection:
+        select_one = text("SELECT 1")
+        await connection.execute(select_one)
+        started = time.perf_counter()
+        for _ in range(statements):
+            await connection.execute(select_one)
+    return (time.perf_counter() - started) / statements * 1e6
+
+
+async def _sampled_statement(engine, statements: int) -> float:
+    token = request_stats.set(RequestStats())
+    try:
+        return await _per_statement(engine, statements)
+    finally:
+        request_stats.reset(token)
+
+
+async def _fastest(rounds: int, variants: dict) -> dict[str, float]:
+    best = {name: float("inf") for name in variants}
+    for _ in range(rounds):
+        for name, call in variants.items():
+            best[name] = min(best[name], await call())
+    return best
+
+
+async def run(requests: int, statements: int, rounds: int) -> dict:
+    report: dict = {}
+    router = app.router
+    unsampled_app = MetricsMiddleware(router, sql_sample_rate=0)
+    sampled_app = MetricsMiddleware(router, sql_sample_rate=1)
+    # Warm up routing and the endpoint.
+    await _per_request(router, 100)
+    timings = await _fastest(
+        rounds,
+        {
+            "bare": lambda: _per_request(router, requests),
+            "unsampled": lambda: _per_request(unsampled_app, requests),
+            "sampled": lambda: _per_request(sampled_app, requests),
+        },
+    )
+    report["request_bare_us"] = round(timings["bare"], 2)
+    report["request_unsampled_us"] = round(timings["unsampled"], 2)
+    report["request_sampled_us"] = round(timings["sampled"], 2)
+    report["request_overhead_us"] = round(
+        timings["sampled"] - timings["bare"], 2
+    )
+
+    plain = create_async_engine(settings.database_url, pool_size=1)
+    hooked = create_async_engine(settings.database_url, pool_size=1)
+    instrument_engine(hooked.sync_engine)
+    try:
+        timings = await _fastest(
+            rounds,
+            {
+                "plain": lambda: _per_statement(plain, statements),
+                "hooked": lambda: _per_statement(hooked, statements),
+                "sampled": lambda: _sampled_statement(hooked, statements),
+            },
+        )
+    finally:
+        await plain.dispose()
+        await hooked.dispose()
+    report["statement_plain_us"] = round(timings["plain"], 2)
+    report["statement_hooked_us"] = round(timings["hooked"], 2)
+    report["statement_sampled_us"] = round(timings["sampled"], 2)
+    report["statement_overhead_us"] = round(
+        timings["sampled"] - timings["plain"], 2
+    )
+
+    started = time.perf_counter()
+    page = registry.render()
+    report["render_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    report["render_bytes"] = len(page)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--statements", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.requests, args.statements, args.rounds))
+    for key, value in report.items():
+        print(f"{key:>22}: {value}")
+
+
+if __name__ == "__main__":
+    main()
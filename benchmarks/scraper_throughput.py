@@ -0,0 +1,107 @@
+"""
+Scraper throughput benchmark against local stand-in shop servers.
+
+Starts ``--domains`` stub servers (each on its own port, so each is a
+separate domain to the throttle) and crawls ``--pages`` product pages
+spread across them, twice: a cold pass, and a revalidation pass in which
+every unchanged page should come back as a 304. Reports pages/s per pass,
+retries, bytes transferred and the peak number of concurrent requests
+each server saw, which must not exceed the per-domain limit.
+
+Usage:
+    python -m benchmarks.scraper_throughput --domains 8 --pages 2000 \\
+        --per-domain 4 --delay 0 --failure-rate 0.02
+"""
+
+import argparse
+import asyncio
+import time
+from contextlib import AsyncExitStack
+
+from app.services.scraper import DomainThrottle, ScraperService
+from benchmarks.stub_server import StubShopServer
+
+
+async def run(
+    domains: int,
+    pages: int,
+    per_domain: int,
+    delay: float,
+    latency: float,
+    failure_rate: float,
+) -> dict:
+    async with AsyncExitStack() as stack:
+        servers = [
+            await stack.enter_async_context(
+                StubShopServer(
+                    latency=latency, failure_rate=failure_rate, seed=i
+                )
+            )
+            for i in range(domains)
+        ]
+        urls = [
+            f"{servers[i % domains].base_url}/products/{i}"
+            for i in range(pages)
+        ]
+        scraper = ScraperService(
+            throttle=DomainThrottle(concurrency=per_domain, delay=delay),
+            max_connections=domains * per_domain,
+            max_keepalive=domains * per_domain,
+            timeout=10.0,
+            user_agent="benchmark",
+            max_retries=3,
+            backoff_base=0.05,
+            backoff_max=1.0,
+            validator_cache_size=pages,
+            validator_ttl=3600,
+        )
+        report: dict = {}
+        try:
+            for name in ("cold", "revalidate"):
+                started = time.perf_counter()
+                results = await scraper.fetch_many(urls)
+                elapsed = time.perf_counter() - started
+                report[f"{name}_pages_per_s"] = round(pages / elapsed, 1)
+                report[f"{name}_ok"] = sum(r.ok for r in results)
+                report[f"{name}_not_modified"] = sum(
+                    r.not_modified for r in results
+                )
+                report[f"{name}_bytes"] = sum(
+                    len(r.content or b"") for r in results
+                )
+        finally:
+            await scraper.aclose()
+
+    report["retries"] = scraper.retries
+    report["failures"] = scraper.failures
+    report["server_peak_concurrency"] = max(s.peak for s in servers)
+    report["per_domain_limit"] = per_domain
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--domains", type=int, default=8)
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--per-domain", type=int, default=4)
+    parser.add_argument("--delay", type=float, default=0.0)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        run(
+            args.domains,
+            args.pages,
+            args.per_domain,
+            args.delay,
+            args.latency,
+            args.failure_rate,
+        )
+    )
+    for key, value in report.items():
+        print(f"{key:>26}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Cold start: import time and time to the first 200 on ``/health``.
+
+Imports ``app.main`` in ``--runs`` fresh interpreters and reports the
+median time, plus how long loading the bcrypt backend takes on its own
+(what the startup warmup takes off the first login).
+
+Then, ``--runs`` times, starts ``uvicorn app.main:app`` on ``--port``
+with ``DB_POOL_WARMUP_CONNECTIONS`` set to ``--warmup-connections``, polls
+``/health`` until it answers 200, and times two bursts of ``--burst``
+concurrent ``GET /products`` requests: the first database requests, and
+the same again once the process is warm. Reports the medians.
+
+Runs against the database configured in ``.env``; writes nothing.
+
+Usage:
+    python -m benchmarks.startup --runs 5 --warmup-connections 4 --burst 4
+"""
+
+import argparse
+import http.client
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+IMPORT_APP = """
+import time
+started = time.perf_counter()
+import app.main
+print(time.perf_counter() - started)
+"""
+LOAD_BCRYPT = """
+import time
+from app.utils.hashing import pwd_context
+started = time.perf_counter()
+pwd_context.handler().get_backend()
+print(time.perf_counter() - started)
+"""
+
+
+def _python(code: str) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def _get(port: int, path: str) -> int:
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    try:
+        connection.request("GET", path)
+        response = connection.getresponse()
+        response.read()
+        return response.status
+    finally:
+        connection.close()
+
+
+def _burst(port: int, path: str, requests: int) -> float:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=requests) as executor:
+        statuses = list(
+            executor.map(lambda _: _get(port, path), range(requests))
+        )
+    if any(status != 200 for status in statuses):
+        raise RuntimeError(f"GET {path} returned {statuses}")
+    return (time.perf_counter() - started) * 1000
+
+
+def _start(
+    port: int, warmup_connections: int, burst: int, timeout: float
+) -> dict:
+    env = dict(os.environ, DB_POOL_WARMUP_CONNECTIONS=str(warmup_connections))
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        env=env,
+    )
+    try:
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with {server.returncode}")
+            if time.perf_counter() - started > timeout:
+                raise RuntimeError("uvicorn did not answer in time")
+            try:
+                if _get(port, "/health") == 200:
+                    break
+            except OSError:
+                time.sleep(0.005)
+        first_200 = (time.perf_counter() - started) * 1000
+        return {
+            "first_200_ms": first_200,
+            "first_burst_ms": _burst(port, "/products?limit=20", burst),
+            "second_burst_ms": _burst(port, "/products?limit=20", burst),
+        }
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def run(runs: int, port: int, warmup_connections: int, burst: int) -> dict:
+    report: dict = {}
+    report["import_ms"] = round(
+        statistics.median(_python(IMPORT_APP) for _ in range(runs)) * 1000, 1
+    )
+    report["bcrypt_backend_ms"] = round(
+        statistics.median(_python(LOAD_BCRYPT) for _ in range(runs)) * 1000,
+        1,
+    )
+    results = [
+        _start(port, warmup_connections, burst, timeout=60)
+        for _ in range(runs)
+    ]
+    for key in results[0]:
+        report[key] = round(
+            statistics.median(result[key] for result in results), 1
+        )
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--warmup-connections", type=int, default=4)
+    parser.add_argument("--burst", type=int, default=4)
+    args = parser.parse_args()
+
+    report = run(args.runs, args.port, args.warmup_connections, args.burst)
+    for key, value in report.items():
+        print(f"{key:>22}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Local stand-in for a product website, used to benchmark the scraper
+without touching the network.
+
+Serves ``GET /products/<n>`` over HTTP/1.1 keep-alive with a fixed
+``latency``. Every page carries a stable ETag and Last-Modified, and a
+matching ``If-None-Match`` gets an empty 304. A ``failure_rate`` fraction
+of requests fails with 503 and ``Retry-After: 0``. The server tracks how
+many requests it is serving at once so politeness limits can be checked.
+"""
+
+import asyncio
+import hashlib
+import random
+from email.utils import formatdate
+
+LAST_MODIFIED = formatdate(0, usegmt=True)
+
+
+class StubShopServer:
+    def __init__(
+        self,
+        latency: float = 0.02,
+        failure_rate: float = 0.0,
+        page_size: int = 20_000,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.page_size = page_size
+        self._random = random.Random(seed)
+        self._server: asyncio.Server | None = None
+        self.port = 0
+        self.active = 0
+        self.peak = 0
+        self.served = 0
+        self.not_modified = 0
+        self.failed = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    async def __aenter__(self) -> "StubShopServer":
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def page(self, path: str) -> tuple[bytes, str]:
+        price = int(hashlib.md5(path.encode()).hexdigest()[:6], 16) / 100
+        body = (
+            f"<html><head><title>{path}</title></head><body>"
+            f'<span class="price">{price:.2f}</span>'
+        ).encode()
+        body += b" " * max(0, self.page_size - len(body)) + b"</body></html>"
+        return body, '"' + hashlib.sha1(body).hexdigest() + '"'
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                path = request_line.split()[1].decode()
+
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+                try:
+                    await asyncio.sleep(self.latency)
+                finally:
+                    self.active -= 1
+                writer.write(self._respond(path, headers))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def _respond(self, path: str, headers: dict[str, str]) -> bytes:
+        if self._random.random() < self.failure_rate:
+            self.failed += 1
+            return self._message(503, b"", {"Retry-After": "0"})
+        if not path.startswith("/products/"):
+            return self._message(404, b"not found", {})
+        body, etag = self.page(path)
+        validators = {"ETag": etag, "Last-Modified": LAST_MODIFIED}
+        if headers.get("if-none-match") == etag:
+            self.not_modified += 1
+            return self._message(304, b"", validators)
+        self.served += 1
+        return self._message(200, body, validators)
+
+    @staticmethod
+    def _message(status: int, body: bytes, headers: dict[str, str]) -> bytes:
+        reason = {200: "OK", 304: "Not Modified", 404: "Not Found"}.get(
+            status, "Service Unavailable"
+        )
+        lines = [f"HTTP/1.1 {status} {reason}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        if status != 304:
+            lines.append(f"Content-Length: {len(body)}")
+            lines.append("Content-Type: text/html")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode() + body
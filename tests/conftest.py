@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+# Settings are read when app modules are imported, and these have no
+# defaults. Unit tests never connect, so any values do; a real
+# environment (or .env) still wins.
+for name, value in {
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_USER": "test",
+    "DB_PASSWORD": "test",
+    "DB_NAME": "test",
+    "DB_POOL_SIZE": "5",
+    "DB_MAX_OVERFLOW": "10",
+    "DB_POOL_TIMEOUT": "30",
+    "DB_POOL_RECYCLE": "1800",
+    "DB_POOL_PRE_PING": "true",
+    "DB_DEBUG": "false",
+    "JWT_SECRET_KEY": "test-secret",
+    "JWT_ALGORITHM": "HS256",
+    "JWT_ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "JWT_REFRESH_TOKEN_EXPIRE_DAYS": "7",
+    "APP_NAME": "product-tracker-tests",
+    "ENVIRONMENT": "test",
+    "DEBUG": "false",
+    "HOST": "127.0.0.1",
+    "PORT": "8000",
+}.items():
+    os.environ.setdefault(name, value)
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
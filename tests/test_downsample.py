@@ -0,0 +1,62 @@
+import math
+
+import pytest
+
+from app.utils.downsample import lttb
+
+
+def _xy(point: tuple[float, float]) -> tuple[float, float]:
+    return point
+
+
+def _series(count: int) -> list[tuple[float, float]]:
+    return [(float(i), math.sin(i / 10)) for i in range(count)]
+
+
+@pytest.mark.parametrize("threshold", [0, 1, 2, 10, 11])
+def test_short_series_and_tiny_thresholds_are_returned_whole(threshold):
+    points = _series(10)
+
+    sampled = lttb(points, threshold, _xy)
+
+    assert sampled == points
+    assert sampled is not points
+
+
+@pytest.mark.parametrize("count, threshold", [(11, 3), (100, 10), (1001, 77)])
+def test_keeps_exactly_threshold_points(count, threshold):
+    assert len(lttb(_series(count), threshold, _xy)) == threshold
+
+
+def test_keeps_the_endpoints_and_the_order():
+    points = _series(500)
+
+    sampled = lttb(points, 25, _xy)
+
+    assert sampled[0] is points[0]
+    assert sampled[-1] is points[-1]
+    positions = [points.index(point) for point in sampled]
+    assert positions == sorted(set(positions))
+
+
+def test_keeps_spikes():
+    points = [(float(i), 0.0) for i in range(1000)]
+    points[123] = (123.0, 50.0)
+    points[789] = (789.0, -50.0)
+
+    sampled = lttb(points, 20, _xy)
+
+    assert (123.0, 50.0) in sampled
+    assert (789.0, -50.0) in sampled
+
+
+def test_returns_the_original_objects():
+    class Point:
+        def __init__(self, x: float, y: float):
+            self.x, self.y = x, y
+
+    points = [Point(i, i % 7) for i in range(100)]
+
+    sampled = lttb(points, 10, lambda p: (p.x, p.y))
+
+    assert all(any(s is p for p in points) for s in sampled)
@@ -0,0 +1,276 @@
+import random
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from app.models.alert.models import (
+    NOTIFICATION_FAILED,
+    NOTIFICATION_PENDING,
+    NOTIFICATION_SENT,
+)
+from app.repositories.alert import ClaimedNotification
+from app.services.notification import dispatcher as dispatcher_module
+from app.services.notification.dispatcher import NotificationDispatcher
+from app.services.notification.senders import (
+    DeliveryError,
+    Digest,
+    WebhookSender,
+)
+
+
+def _claimed(
+    notification_id: int,
+    user_id: int = 1,
+    channel: str = "email",
+    recipient: str = "a@example.com",
+    attempts: int = 1,
+) -> ClaimedNotification:
+    return ClaimedNotification(
+        id=notification_id,
+        user_id=user_id,
+        channel=channel,
+        recipient=recipient,
+        kind="price_drop",
+        payload={},
+        attempts=attempts,
+    )
+
+
+class _Sender:
+    def __init__(self):
+        self.sent: list[Digest] = []
+
+    async def send(self, digest: Digest) -> None:
+        self.sent.append(digest)
+
+    async def aclose(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {}
+
+
+class _Repository:
+    claimed: list[ClaimedNotification] = []
+    completed: list = []
+
+    def __init__(self, session):
+        pass
+
+    async def claim(self, *args):
+        return type(self).claimed
+
+    async def complete(self, results):
+        type(self).completed.extend(results)
+
+
+@asynccontextmanager
+async def _session():
+    yield None
+
+
+@pytest.fixture
+def repository(monkeypatch):
+    monkeypatch.setattr(_Repository, "claimed", [])
+    monkeypatch.setattr(_Repository, "completed", [])
+    monkeypatch.setattr(
+        dispatcher_module, "SqlAlchemyNotificationRepository", _Repository
+    )
+    return _Repository
+
+
+def _dispatcher(
+    sender=None, cls=NotificationDispatcher, **overrides
+) -> NotificationDispatcher:
+    options = dict(
+        batch_size=100,
+        poll_interval=0.1,
+        lease_seconds=60,
+        max_attempts=3,
+        backoff_base=10.0,
+        backoff_max=300.0,
+        digest_window=0,
+        digest_limit=50,
+    )
+    options.update(overrides)
+    return cls(
+        session_factory=_session,
+        senders={"email": sender or _Sender(), "webhook": _Sender()},
+        **options,
+    )
+
+
+def test_digests_group_by_recipient_in_claim_order():
+    claimed = [
+        _claimed(1, user_id=1),
+        _claimed(2, user_id=2, recipient="b@example.com"),
+        _claimed(3, user_id=1),
+        _claimed(4, user_id=1, channel="webhook", recipient="https://h/"),
+    ]
+
+    digests = NotificationDispatcher.digests(claimed)
+
+    assert [(d.user_id, d.channel, d.ids) for d in digests] == [
+        (1, "email", [1, 3]),
+        (2, "email", [2]),
+        (1, "webhook", [4]),
+    ]
+
+
+@pytest.mark.parametrize(
+    "attempts, cap", [(1, 10), (2, 20), (4, 80), (9, 300)]
+)
+def test_backoff_is_full_jitter_up_to_the_cap(attempts, cap):
+    random.seed(attempts)
+    delays = [_dispatcher()._backoff(attempts) for _ in range(500)]
+
+    assert all(0 <= delay <= cap for delay in delays)
+    assert max(delays) > cap * 0.9
+
+
+def test_retryable_failure_is_rescheduled():
+    digest = Digest(1, "email", "a@example.com", [_claimed(1, attempts=1)])
+    before = datetime.now(timezone.utc)
+
+    [result] = _dispatcher()._failed(digest, DeliveryError("busy"))
+
+    assert result.status == NOTIFICATION_PENDING
+    assert before <= result.available_at <= before + timedelta(seconds=11)
+    assert result.error == "busy"
+
+
+def test_retry_after_is_honoured():
+    digest = Digest(1, "email", "a@example.com", [_claimed(1)])
+    before = datetime.now(timezone.utc)
+
+    [result] = _dispatcher()._failed(
+        digest, DeliveryError("busy", retry_after=120)
+    )
+
+    assert result.available_at >= before + timedelta(seconds=120)
+
+
+@pytest.mark.parametrize("retry_after", [1e12, float("inf")])
+def test_retry_after_is_capped_at_backoff_max(retry_after):
+    digest = Digest(1, "email", "a@example.com", [_claimed(1)])
+    before = datetime.now(timezone.utc)
+
+    [result] = _dispatcher()._failed(
+        digest, DeliveryError("busy", retry_after=retry_after)
+    )
+
+    assert result.available_at <= before + timedelta(seconds=301)
+
+
+def test_permanent_or_exhausted_failures_give_up():
+    dispatcher = _dispatcher()
+    permanent = Digest(1, "email", "a@example.com", [_claimed(1)])
+    exhausted = Digest(1, "email", "a@example.com", [_claimed(2, attempts=3)])
+
+    [rejected] = dispatcher._failed(permanent, DeliveryError("no", False))
+    [given_up] = dispatcher._failed(exhausted, DeliveryError("busy"))
+
+    assert rejected.status == given_up.status == NOTIFICATION_FAILED
+    assert rejected.available_at is None
+    assert dispatcher.failed == 2
+
+
+async def test_dispatch_once_sends_one_message_per_digest(repository):
+    repository.claimed = [
+        _claimed(1),
+        _claimed(2),
+        _claimed(3, user_id=2, recipient="b@example.com"),
+    ]
+    sender = _Sender()
+    dispatcher = _dispatcher(sender)
+
+    assert await dispatcher.dispatch_once() == 3
+
+    assert [digest.ids for digest in sender.sent] == [[1, 2], [3]]
+    assert {r.status for r in repository.completed} == {NOTIFICATION_SENT}
+    assert dispatcher.stats()["messages"] == 2
+
+
+async def test_one_failing_digest_does_not_lose_the_batch(repository):
+    repository.claimed = [
+        _claimed(1),
+        _claimed(2, user_id=2, recipient="b@example.com"),
+    ]
+
+    class Broken(NotificationDispatcher):
+        async def _deliver(self, digest):
+            if digest.recipient == "b@example.com":
+                raise OverflowError("date value out of range")
+            return await super()._deliver(digest)
+
+    await _dispatcher(cls=Broken).dispatch_once()
+
+    statuses = {r.notification_id: r.status for r in repository.completed}
+    assert statuses == {1: NOTIFICATION_SENT, 2: NOTIFICATION_PENDING}
+
+
+async def test_missing_sender_fails_permanently(repository):
+    repository.claimed = [_claimed(1, channel="sms", recipient="+1555")]
+
+    await _dispatcher().dispatch_once()
+
+    [result] = repository.completed
+    assert result.status == NOTIFICATION_FAILED
+
+
+def _webhook(status: int, headers: dict) -> WebhookSender:
+    return WebhookSender(
+        concurrency=2,
+        rate_per_second=0,
+        timeout=1,
+        transport=httpx.MockTransport(
+            lambda request: httpx.Response(status, headers=headers)
+        ),
+        max_retry_after=60,
+    )
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("30", 30.0),
+        ("1e12", 60.0),
+        ("-5", 0.0),
+        ("inf", None),
+        ("nan", None),
+        ("Wed, 21 Oct 2026 07:28:00 GMT", None),
+    ],
+)
+async def test_webhook_retry_after_is_validated(header, expected):
+    sender = _webhook(429, {"retry-after": header})
+
+    with pytest.raises(DeliveryError) as error:
+        await sender.send(Digest(1, "webhook", "https://hooks.example/"))
+
+    assert error.value.retryable
+    assert error.value.retry_after == expected
+
+
+async def test_webhook_client_errors_are_permanent():
+    sender = _webhook(404, {})
+
+    with pytest.raises(DeliveryError) as error:
+        await sender.send(Digest(1, "webhook", "https://hooks.example/"))
+
+    assert not error.value.retryable
+
+
+@pytest.mark.parametrize(
+    "url", ["http://hooks.example/", "https://127.0.0.1/", "https://10.1.2.3/"]
+)
+async def test_webhook_refuses_unsafe_destinations(url):
+    sender = WebhookSender(concurrency=1, rate_per_second=0, timeout=1)
+
+    with pytest.raises(DeliveryError) as error:
+        await sender.send(Digest(1, "webhook", url))
+
+    assert not error.value.retryable
+    assert sender.refused == 1
+    await sender.aclose()
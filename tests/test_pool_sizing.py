@@ -0,0 +1,79 @@
+import pytest
+
+from app.db.pool import PoolSizeController, PoolWindow
+
+
+@pytest.fixture
+def controller() -> PoolSizeController:
+    return PoolSizeController(min_size=2, max_size=20, target_wait=0.01)
+
+
+def _window(
+    checkouts: int = 100,
+    wait_seconds: float = 0.0,
+    timeouts: int = 0,
+    peak_checked_out: int = 0,
+) -> PoolWindow:
+    return PoolWindow(checkouts, wait_seconds, timeouts, peak_checked_out)
+
+
+def test_steady_pool_keeps_its_size(controller):
+    assert controller.next_size(8, _window(peak_checked_out=7)) == 8
+
+
+def test_timeouts_grow_the_pool_by_half(controller):
+    assert (
+        controller.next_size(8, _window(timeouts=1, peak_checked_out=8)) == 12
+    )
+
+
+def test_slow_checkouts_grow_the_pool(controller):
+    window = _window(checkouts=100, wait_seconds=2.0, peak_checked_out=8)
+
+    assert controller.next_size(8, window) == 12
+
+
+def test_overflow_grows_straight_to_the_peak(controller):
+    assert controller.next_size(4, _window(peak_checked_out=15)) == 15
+
+
+def test_small_pools_grow_by_at_least_one():
+    controller = PoolSizeController(min_size=1, max_size=10, target_wait=0.01)
+
+    assert (
+        controller.next_size(1, _window(timeouts=3, peak_checked_out=1)) == 2
+    )
+
+
+def test_growth_stops_at_max_size(controller):
+    assert controller.next_size(18, _window(timeouts=1)) == 20
+
+
+def test_idle_pool_shrinks_by_one(controller):
+    assert controller.next_size(10, _window(peak_checked_out=3)) == 9
+
+
+def test_shrinking_keeps_one_spare_above_the_peak(controller):
+    assert controller.next_size(10, _window(peak_checked_out=8)) == 9
+    assert controller.next_size(9, _window(peak_checked_out=8)) == 9
+
+
+def test_no_shrinking_while_waits_are_near_target(controller):
+    window = _window(checkouts=100, wait_seconds=0.8, peak_checked_out=3)
+
+    assert controller.next_size(10, window) == 10
+
+
+def test_never_below_min_size(controller):
+    assert controller.next_size(2, _window(checkouts=0)) == 2
+    assert controller.next_size(1, _window(checkouts=0)) == 2
+
+
+def test_max_size_below_min_size_is_raised():
+    controller = PoolSizeController(min_size=5, max_size=3, target_wait=0.01)
+
+    assert controller.next_size(5, _window(timeouts=1)) == 5
+
+
+def test_empty_window_does_not_divide_by_zero(controller):
+    assert controller.next_size(6, _window(checkouts=0)) == 5
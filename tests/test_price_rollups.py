@@ -0,0 +1,109 @@
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+from app.repositories.product.repositories import _Bucket
+from app.services.product.charts import PriceChartService
+
+T0 = datetime(2026, 3, 2, 12, tzinfo=timezone.utc)
+
+
+def test_bucket_of_one_price():
+    bucket = _Bucket.of(Decimal("9.99"), T0)
+
+    assert bucket == _Bucket(
+        Decimal("9.99"),
+        Decimal("9.99"),
+        Decimal("9.99"),
+        1,
+        Decimal("9.99"),
+        T0,
+    )
+
+
+def test_merge_combines_extremes_sums_and_counts():
+    bucket = _Bucket.of(Decimal("10.00"), T0)
+    bucket.merge(_Bucket.of(Decimal("7.50"), T0 + timedelta(hours=1)))
+    bucket.merge(_Bucket.of(Decimal("12.25"), T0 + timedelta(hours=2)))
+
+    assert bucket.min_price == Decimal("7.50")
+    assert bucket.max_price == Decimal("12.25")
+    assert bucket.price_sum == Decimal("29.75")
+    assert bucket.price_count == 3
+
+
+def test_merge_keeps_the_latest_price_whatever_the_order():
+    late = _Bucket.of(Decimal("8.00"), T0 + timedelta(hours=5))
+    early = _Bucket.of(Decimal("11.00"), T0)
+
+    forward = replace(early)
+    forward.merge(late)
+    backward = replace(late)
+    backward.merge(early)
+
+    assert forward.last_price == backward.last_price == Decimal("8.00")
+    assert forward.last_observed_at == backward.last_observed_at
+    assert forward == backward
+
+
+def test_merge_is_associative():
+    parts = [
+        _Bucket.of(Decimal(price), T0 + timedelta(minutes=i))
+        for i, price in enumerate(["5.00", "3.00", "4.00", "6.00"])
+    ]
+
+    left = replace(parts[0])
+    for part in parts[1:]:
+        left.merge(part)
+    pair, rest = replace(parts[0]), replace(parts[2])
+    pair.merge(parts[1])
+    rest.merge(parts[3])
+    pair.merge(rest)
+
+    assert left == pair
+
+
+class _Rollups:
+    def __init__(self, rollups: list[SimpleNamespace]):
+        self.rollups = rollups
+
+    async def get_price_rollups(self, *args):
+        return self.rollups
+
+
+def _rollup(day, prices: list[str], last: str) -> SimpleNamespace:
+    values = [Decimal(price) for price in prices]
+    return SimpleNamespace(
+        bucket=day,
+        min_price=min(values),
+        max_price=max(values),
+        price_sum=sum(values),
+        price_count=len(values),
+        last_price=Decimal(last),
+    )
+
+
+async def test_chart_carries_the_price_through_days_without_changes():
+    today = datetime.now(timezone.utc).date()
+    first = today - timedelta(days=9)
+    # Ten changes on the first day, then one change to 100 that holds.
+    service = PriceChartService(
+        _Rollups(
+            [
+                _rollup(first, ["50.00"] * 9 + ["100.00"], last="100.00"),
+                _rollup(first + timedelta(days=1), ["100.00"], "100.00"),
+            ]
+        ),
+        raw_max_days=7,
+        daily_max_days=180,
+        max_points=1000,
+    )
+
+    chart = await service.get_chart(1, days=30, currency="USD", points=100)
+
+    assert len(chart.points) == 10
+    assert chart.points[-1].at.date() == today
+    assert chart.last_price == Decimal("100.00")
+    # One day at 55 and nine at 100, not eleven observations.
+    assert chart.avg_price == Decimal("95.50")
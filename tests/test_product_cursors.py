@@ -0,0 +1,124 @@
+import base64
+import json
+from decimal import Decimal
+
+import pytest
+
+from app.core.exceptions import InvalidCursorException
+from app.repositories.product import ProductListing
+from app.services.product.catalog import (
+    ProductCatalogService,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+def _listing(product_id: int, price: str = "19.99") -> ProductListing:
+    return ProductListing(
+        id=product_id,
+        name=f"Product {product_id}",
+        brand=None,
+        image_url=None,
+        lowest_price=Decimal(price),
+        currency="USD",
+        in_stock=True,
+        reference_price=Decimal("25.00"),
+        drop_pct=Decimal("20.04"),
+    )
+
+
+def _raw(payload: object) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+@pytest.mark.parametrize(
+    "sort, value",
+    [
+        ("newest", 42),
+        ("price", Decimal("19.99")),
+        ("-price", Decimal("19.99")),
+        ("drop", Decimal("20.04")),
+    ],
+)
+def test_cursor_round_trips(sort, value):
+    cursor = encode_cursor(sort, _listing(42))
+
+    assert decode_cursor(cursor, sort) == (value, 42)
+
+
+def test_cursor_is_url_safe_and_unpadded():
+    cursor = encode_cursor("price", _listing(10**12, "1234567.89"))
+
+    assert "=" not in cursor
+    assert set(cursor) <= set(
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+    )
+
+
+def test_decimal_values_are_not_rounded_through_floats():
+    cursor = encode_cursor("price", _listing(1, "0.10"))
+
+    value, _ = decode_cursor(cursor, "price")
+
+    assert value == Decimal("0.10")
+    assert isinstance(value, Decimal)
+
+
+def test_cursor_is_only_valid_for_its_order():
+    cursor = encode_cursor("price", _listing(1))
+
+    with pytest.raises(InvalidCursorException):
+        decode_cursor(cursor, "-price")
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "",
+        "not base64!",
+        _raw("price"),
+        _raw(["price", "19.99"]),
+        _raw(["price", "19.99", "1"]),
+        _raw(["price", "19.99", 1.5]),
+        _raw(["price", "NaN", 1]),
+        _raw(["price", "Infinity", 1]),
+        _raw(["price", "cheap", 1]),
+        _raw(["price", None, 1]),
+        base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+    ],
+)
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(InvalidCursorException):
+        decode_cursor(cursor, "price")
+
+
+class _Repository:
+    def __init__(self, products: list[ProductListing]):
+        self.products = products
+        self.calls: list[tuple] = []
+
+    async def list_products(self, filters, sort, after, limit):
+        self.calls.append((after, limit))
+        start = 0
+        if after is not None:
+            start = next(
+                i + 1 for i, p in enumerate(self.products) if p.id == after[1]
+            )
+        return self.products[start : start + limit]
+
+
+async def test_pages_chain_through_cursors():
+    repository = _Repository([_listing(i) for i in range(1, 6)])
+    catalog = ProductCatalogService(repository)
+
+    ids, cursor = [], None
+    while True:
+        page = await catalog.list_products(None, "newest", cursor, limit=2)
+        ids.extend(product.id for product in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert ids == [1, 2, 3, 4, 5]
+    # One extra row per page tells whether another follows.
+    assert [limit for _, limit in repository.calls] == [3, 3, 3]
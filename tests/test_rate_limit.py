@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from app.services.auth.rate_limit import (
+    InMemoryRateLimitBackend,
+    LoginRateLimiter,
+)
+
+
+def _limiter(max_per_email: int = 3, max_per_ip: int = 10) -> LoginRateLimiter:
+    return LoginRateLimiter(
+        backend=InMemoryRateLimitBackend(max_keys=100),
+        window_seconds=60,
+        max_per_email=max_per_email,
+        max_per_ip=max_per_ip,
+    )
+
+
+async def test_concurrent_attempts_cannot_overrun_the_limit():
+    limiter = _limiter(max_per_email=3)
+
+    reservations = await asyncio.gather(
+        *(limiter.reserve("a@example.com", "10.0.0.1") for _ in range(10))
+    )
+
+    allowed = [r for r in reservations if not r.retry_after]
+    assert len(allowed) == 3
+    assert limiter.rejected == 7
+
+
+async def test_rejected_attempt_says_how_long_to_wait():
+    limiter = _limiter(max_per_email=1)
+    await limiter.reserve("a@example.com", "10.0.0.1")
+
+    rejected = await limiter.reserve("a@example.com", "10.0.0.1")
+
+    assert 0 < rejected.retry_after <= 61
+    assert rejected.keys == []
+
+
+async def test_rejected_attempt_is_not_counted_against_other_limits():
+    limiter = _limiter(max_per_email=1, max_per_ip=2)
+    await limiter.reserve("a@example.com", "10.0.0.1")
+    # Over the email limit: must not use up the IP's second attempt.
+    assert (await limiter.reserve("a@example.com", "10.0.0.1")).retry_after
+
+    other = await limiter.reserve("b@example.com", "10.0.0.1")
+
+    assert other.retry_after == 0
+
+
+async def test_release_gives_the_attempt_back():
+    limiter = _limiter(max_per_email=1)
+    reservation = await limiter.reserve("a@example.com", "10.0.0.1")
+
+    await limiter.release(reservation)
+
+    assert (
+        await limiter.reserve("a@example.com", "10.0.0.1")
+    ).retry_after == 0
+
+
+async def test_success_clears_the_email_window():
+    limiter = _limiter(max_per_email=2)
+    await limiter.reserve("a@example.com", "10.0.0.1")
+    reservation = await limiter.reserve("A@example.com", "10.0.0.1")
+
+    await limiter.record_success("a@example.com", reservation)
+
+    for _ in range(2):
+        assert (
+            await limiter.reserve("a@example.com", "10.0.0.2")
+        ).retry_after == 0
+
+
+@pytest.mark.parametrize("max_per_email, max_per_ip", [(0, 0), (0, 5)])
+async def test_disabled_limits_are_not_checked(max_per_email, max_per_ip):
+    limiter = _limiter(max_per_email=max_per_email, max_per_ip=max_per_ip)
+
+    reservations = [
+        await limiter.reserve(f"user{i}@example.com", "10.0.0.1")
+        for i in range(5)
+    ]
+
+    assert not any(r.retry_after for r in reservations)
+
+
+async def test_old_events_leave_the_window():
+    backend = InMemoryRateLimitBackend(max_keys=100)
+
+    assert await backend.reserve("k", "m1", 1000.0, 60, 1) is None
+    assert await backend.reserve("k", "m2", 1030.0, 60, 1) == 1000.0
+    assert await backend.reserve("k", "m3", 1061.0, 60, 1) is None
+
+
+async def test_tracked_keys_are_bounded():
+    backend = InMemoryRateLimitBackend(max_keys=2)
+    for key in ("a", "b", "c"):
+        await backend.add(key, 1000.0, 60)
+
+    # "a" was dropped, so it has room again.
+    assert await backend.reserve("a", "m", 1001.0, 60, 1) is None
+    assert await backend.reserve("c", "m", 1001.0, 60, 1) == 1000.0
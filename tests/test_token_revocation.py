@@ -0,0 +1,97 @@
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.utils.cache import ExpiringMap, TTLCache
+from app.utils.security import Security
+
+
+@pytest.fixture(autouse=True)
+def clean_caches():
+    yield
+    Security.token_cache.clear()
+    Security.revoked_subjects.clear()
+
+
+def _rejected(token: str) -> bool:
+    try:
+        Security.verify_token(token)
+    except HTTPException as e:
+        assert e.status_code == 401
+        return True
+    return False
+
+
+def test_revoked_token_is_rejected_from_the_cache():
+    token = Security.create_access_token({"sub": "a@example.com"})
+    assert Security.verify_token(token)["sub"] == "a@example.com"
+
+    Security.invalidate_subject("a@example.com")
+
+    assert _rejected(token)
+
+
+def test_revoked_token_is_rejected_when_decoded():
+    token = Security.create_access_token({"sub": "a@example.com"})
+    Security.invalidate_subject("a@example.com")
+    # Not cached: the decoded path must check too.
+    Security.token_cache.clear()
+
+    assert _rejected(token)
+
+
+def test_token_from_the_revoking_second_is_rejected():
+    token = Security.create_access_token({"sub": "a@example.com"})
+    Security.revoked_subjects.set(
+        "a@example.com", int(time.time()), expires_at=time.time() + 60
+    )
+
+    assert _rejected(token)
+
+
+def test_token_issued_after_revocation_is_accepted():
+    Security.revoked_subjects.set(
+        "a@example.com", int(time.time()) - 10, expires_at=time.time() + 60
+    )
+    token = Security.create_access_token({"sub": "a@example.com"})
+
+    assert Security.verify_token(token)["sub"] == "a@example.com"
+
+
+def test_other_subjects_are_not_affected():
+    token = Security.create_access_token({"sub": "b@example.com"})
+    Security.invalidate_subject("a@example.com")
+
+    assert Security.verify_token(token)["sub"] == "b@example.com"
+
+
+def test_revocation_works_with_the_token_cache_disabled(monkeypatch):
+    monkeypatch.setattr(Security, "token_cache", TTLCache(max_size=0))
+    token = Security.create_access_token({"sub": "a@example.com"})
+    Security.invalidate_subject("a@example.com")
+
+    assert _rejected(token)
+
+
+def test_expiring_map_never_evicts_live_entries():
+    revoked: ExpiringMap[str, int] = ExpiringMap(clock=lambda: 100.0)
+    for i in range(10000):
+        revoked.set(f"user{i}", i, expires_at=200.0)
+
+    assert len(revoked) == 10000
+    assert revoked.get("user0") == 0
+
+
+def test_expiring_map_drops_expired_entries():
+    now = [100.0]
+    revoked: ExpiringMap[str, int] = ExpiringMap(clock=lambda: now[0])
+    revoked.set("old", 1, expires_at=150.0)
+    revoked.set("new", 2, expires_at=300.0)
+
+    now[0] = 200.0
+    assert revoked.get("old") is None
+    revoked.set("newer", 3, expires_at=400.0)
+
+    assert len(revoked) == 2
+    assert revoked.get("new") == 2